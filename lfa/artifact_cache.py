@@ -0,0 +1,368 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import tempfile
+from array import array
+
+
+# File layout: a header with the magic, format version, artifact kind and
+# section count, then one (offset, length) pair per section. Sections are
+# 8 byte aligned raw arrays, so a mapped file is used in place: integer
+# sections through memoryview.cast, string tables as an int32 offsets
+# array followed by the utf-8 bytes of every string.
+MAGIC = b'LFAC'
+VERSION = 3
+HEADER = struct.Struct('<4sIII')
+SECTION = struct.Struct('<QQ')
+DFA, CNF, SCANNER = 1, 2, 3
+SUFFIX = '.lfa'
+
+
+def default_directory():
+    return os.environ.get('LFA_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'lfa')
+
+
+def content_key(kind, definition):
+    # The format version and byte order are part of the key, so files
+    # written by another version or machine are never read, only evicted.
+    text = json.dumps([VERSION, sys.byteorder, kind, definition], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def automaton_definition(automaton):
+    from .finite_automata.automaton import _targets
+    transitions = sorted((str(state), str(symbol), sorted(map(str, _targets(next_states))))
+                         for state, symbols in automaton.transition_function.items()
+                         for symbol, next_states in symbols.items())
+    return [sorted(map(str, automaton.states)), sorted(map(str, automaton.alphabet)), transitions,
+            str(automaton.start), sorted(map(str, automaton.accept))]
+
+
+def grammar_definition(grammar):
+    rules = getattr(grammar, 'rules', None)
+    if rules is None:
+        rules = grammar.productions
+    # Kept in the given order: convert_to_cnf names fresh non-terminals and
+    # orders rules by it, so reordered grammars convert differently.
+    return [list(grammar.non_terminals), list(grammar.terminals),
+            [[lhs, list(values)] for lhs, values in rules.items()], grammar.start_symbol]
+
+
+def _strings(strings):
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = array('i', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return [offsets.tobytes(), b''.join(encoded)]
+
+
+def pack(kind, sections):
+    header = HEADER.size + SECTION.size * len(sections)
+    position = header
+    table = []
+    for data in sections:
+        position += -position % 8
+        table.append((position, len(data)))
+        position += len(data)
+    parts = [HEADER.pack(MAGIC, VERSION, kind, len(sections))]
+    parts.extend(SECTION.pack(offset, length) for offset, length in table)
+    position = header
+    for (offset, length), data in zip(table, sections):
+        parts.append(b'\0' * (offset - position))
+        parts.append(data)
+        position = offset + length
+    return b''.join(parts)
+
+
+def unpack(buffer, kind):
+    # Everything is checked before the first memoryview is taken, so an
+    # invalid mapped file can still be closed.
+    if len(buffer) < HEADER.size:
+        raise ValueError('truncated artifact')
+    magic, version, found, count = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION or found != kind:
+        raise ValueError('not an artifact of this kind and version')
+    if len(buffer) < HEADER.size + SECTION.size * count:
+        raise ValueError('truncated artifact')
+    spans = [SECTION.unpack_from(buffer, HEADER.size + SECTION.size * number) for number in range(count)]
+    if any(offset + length > len(buffer) for offset, length in spans):
+        raise ValueError('truncated artifact')
+    view = memoryview(buffer)
+    return [view[offset:offset + length] for offset, length in spans]
+
+
+class MappedStrings:
+    # Strings are decoded on access, loading a table does not touch them.
+    def __init__(self, offsets, data):
+        self.offsets = offsets.cast('i')
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('string index out of range')
+        return str(self.data[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+
+def dfa_sections(table):
+    # State 0 is the dead state of DFATable, its name is stored as ''.
+    header = array('i', [table.width, table.start])
+    names = [''] + [str(state) for state in table.states[1:]]
+    return [header.tobytes(), table.table.tobytes(), bytes(table.accepting), *_strings(table.alphabet), *_strings(names)]
+
+
+_MappedDFATable = None
+
+
+def _mapped_table():
+    # Defined on first use so that importing this module does not pull in
+    # the automaton modules.
+    global _MappedDFATable
+    if _MappedDFATable is not None:
+        return _MappedDFATable
+    from .finite_automata.dfa_table import DFATable
+
+    class MappedDFATable(DFATable):
+        def __init__(self, sections):
+            header, table, accepting, alphabet_offsets, alphabet, state_offsets, states = sections
+            self.width, self.start = header.cast('i')
+            self.table = table.cast('i')
+            self.accepting = accepting
+            self.alphabet = list(MappedStrings(alphabet_offsets, alphabet))
+            self.symbol_ids = {symbol: index for index, symbol in enumerate(self.alphabet)}
+            self.pad = len(self.alphabet)
+            self.unknown = self.pad + 1
+            self.states = MappedStrings(state_offsets, states)
+            self._symbol_lookup = None
+            self._numpy_table = None
+
+        def to_automaton(self):
+            from .finite_automata.automaton import FiniteAutomaton
+            names = list(self.states)
+            transition_function = {}
+            for state in range(1, len(names)):
+                row = state * self.width
+                transition_function[names[state]] = {symbol: names[self.table[row + index]]
+                                                     for index, symbol in enumerate(self.alphabet)
+                                                     if self.table[row + index]}
+            accept = [names[state] for state in range(1, len(names)) if self.accepting[state]]
+            start = names[self.start] if self.start else None
+            return FiniteAutomaton(names[1:], list(self.alphabet), transition_function, start, accept)
+
+    _MappedDFATable = MappedDFATable
+    return MappedDFATable
+
+
+def cnf_sections(grammar):
+    index = grammar.index
+    non_terminals = array('i', [index.ids[name] for name in grammar.non_terminals if name in index.ids])
+    # Rules are a flat int32 array of (lhs, length, symbols...) records.
+    rules = array('i')
+    for lhs, productions in index.rules.items():
+        for rhs in productions:
+            rules.append(lhs)
+            rules.append(len(rhs))
+            rules.extend(rhs)
+    header = array('i', [index.ids.get(grammar.start_symbol, -1)])
+    return [header.tobytes(), rules.tobytes(), non_terminals.tobytes(), *_strings(grammar.terminals),
+            *_strings(index.names)]
+
+
+def load_cnf(sections):
+    from .chomsky_normal_form.cfg_to_cnf import Grammar, ProductionIndex
+    header, rules, non_terminals, terminal_offsets, terminals, name_offsets, names = sections
+    names = list(MappedStrings(name_offsets, names))
+    start = header.cast('i')[0]
+    grammar = Grammar([names[symbol] for symbol in non_terminals.cast('i')],
+                      list(MappedStrings(terminal_offsets, terminals)), {}, names[start] if start >= 0 else None)
+    # Symbol ids in the rules refer to the saved name order.
+    index = grammar.index = ProductionIndex()
+    for name in names:
+        index.intern(name)
+    # Filled in bulk rather than through index.add, the saved rules are
+    # already free of duplicates.
+    records = rules.cast('i').tolist()
+    rules, uses = index.rules, index.uses
+    position = 0
+    while position < len(records):
+        lhs, length = records[position], records[position + 1]
+        rhs = tuple(records[position + 2:position + 2 + length])
+        rules.setdefault(lhs, {})[rhs] = None
+        for symbol in set(rhs):
+            if symbol in uses:
+                uses[symbol].add((lhs, rhs))
+            else:
+                uses[symbol] = {(lhs, rhs)}
+        position += 2 + length
+    return grammar
+
+
+def scanner_sections(scanner):
+    return [*_strings(scanner.names), array('i', scanner.classes).tobytes(), scanner.table.tobytes(),
+            scanner.tokens.tobytes(), scanner.unbounded.tobytes(), *_strings(sorted(scanner.skip))]
+
+
+def load_scanner(sections):
+    from .lexer.scanner import Scanner
+    name_offsets, names, classes, table, tokens, unbounded, skip_offsets, skip = sections
+    return Scanner(MappedStrings(name_offsets, names), classes.cast('i'), table.cast('i'), tokens.cast('i'),
+                   unbounded.cast('i'), MappedStrings(skip_offsets, skip))
+
+
+class ArtifactCache:
+    def __init__(self, directory=None, max_bytes=64 << 20):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self.mapped = {}
+        self.hits = self.misses = self.evictions = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def _map(self, key, kind):
+        mapped = self.mapped.get(key)
+        if mapped is not None:
+            return mapped
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            sections = unpack(buffer, kind)
+        except ValueError:
+            buffer.close()
+            self._remove(path)
+            return None
+        # Loading counts as a use for eviction, which drops the least
+        # recently used files first.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.mapped[key] = sections
+        return sections
+
+    def _store(self, key, data):
+        # Written to a temporary file and renamed over the final name, so
+        # concurrent readers see either no file or a complete one.
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, self.path(key))
+        except OSError:
+            self._remove(temporary)
+            return
+        self.evict(keep=key)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _lookup(self, kind, key, build, sections, load):
+        mapped = self._map(key, kind)
+        if mapped is None:
+            self.misses += 1
+            data = pack(kind, sections(build()))
+            self._store(key, data)
+            mapped = self._map(key, kind)
+            if mapped is None:
+                # The directory is not writable or the file was evicted
+                # right away; serve the artifact from memory instead.
+                mapped = unpack(data, kind)
+        else:
+            self.hits += 1
+        return load(mapped)
+
+    def dfa_table(self, automaton, minimize=True):
+        # The determinized (and by default minimized) automaton as a
+        # DFATable whose transition table lives in the mapped file.
+        def build():
+            dfa = automaton if automaton.is_deterministic() else automaton.to_dfa(compact_names=True)
+            if minimize:
+                dfa = dfa.minimize(compact_names=True)
+            return dfa.compile()
+        key = content_key('dfa' if not minimize else 'minimal_dfa', automaton_definition(automaton))
+        return self._lookup(DFA, key, build, dfa_sections, _mapped_table())
+
+    def grammar_table(self, grammar, minimize=True):
+        # A regular grammar's language as a mapped DFATable.
+        key = content_key('grammar_dfa' if not minimize else 'grammar_minimal_dfa', grammar_definition(grammar))
+
+        def build():
+            dfa = grammar.language_automaton().to_dfa(compact_names=True)
+            return (dfa.minimize(compact_names=True) if minimize else dfa).compile()
+        return self._lookup(DFA, key, build, dfa_sections, _mapped_table())
+
+    def cnf(self, grammar):
+        # A converted copy; the grammar passed in is left untouched.
+        def build():
+            from .chomsky_normal_form.cfg_to_cnf import Grammar
+            converted = Grammar(list(grammar.non_terminals), list(grammar.terminals), grammar.productions,
+                                grammar.start_symbol)
+            converted.convert_to_cnf()
+            return converted
+        key = content_key('cnf', grammar_definition(grammar))
+        return self._lookup(CNF, key, build, cnf_sections, load_cnf)
+
+    def scanner(self, rules, skip=()):
+        # A lexer.scanner.Scanner generated from (name, pattern) rules.
+        def build():
+            from .lexer.scanner import Scanner
+            return Scanner.generate(rules, skip)
+        key = content_key('scanner', [[list(rule) for rule in rules], sorted(skip)])
+        return self._lookup(SCANNER, key, build, scanner_sections, load_scanner)
+
+    def entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(SUFFIX):
+                try:
+                    status = entry.stat()
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, entry.path))
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        # Removing a file other processes have mapped is safe on POSIX,
+        # their mappings stay valid until closed; elsewhere it fails and
+        # the file is kept.
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == self.path(keep):
+                continue
+            if self._remove(path):
+                total -= size
+                self.evictions += 1
+        return total
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._remove(path)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'files': len(self.entries()), 'bytes': self.size(), 'max_bytes': self.max_bytes}
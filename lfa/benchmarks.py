@@ -0,0 +1,306 @@
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+
+# Usage: python -m lfa.benchmarks [cases] [-q] [-o results.json]
+# [-b baseline.json] [-t tolerance]. Cases that need a missing optional
+# dependency are reported as skipped; any other import error fails the run.
+OPTIONAL_DEPENDENCIES = ('numpy', 'graphviz', 'prettytable')
+
+
+# Workload generators. Sizes are the unit each case scales over: kilobytes
+# of source, NFA states, grammar rules or regex items.
+
+CPP_FUNCTION = """
+int compute_{n}(int a, int b) {{
+    // accumulate the products of a and b
+    int total = 0;
+    for (int i = 0; i < a; i = i + 1) {{
+        total = total + i * b - {n} / 2;
+        if (total > {limit}) {{ total = total - {limit}; }}
+    }}
+    /* keep the result
+       in range */
+    while (total < 0) {{ total = total + {n}; }}
+    return total;
+}}
+"""
+
+
+def cpp_source(kilobytes, seed=0):
+    # Only constructs both C++ lexers accept: no preprocessor lines, string
+    # literals or floating point exponents.
+    rng = random.Random(seed)
+    size = kilobytes * 1024
+    parts = []
+    length = 0
+    n = 0
+    while length < size:
+        part = CPP_FUNCTION.format(n=n, limit=rng.randint(100, 100000))
+        parts.append(part)
+        length += len(part)
+        n += 1
+    return ''.join(parts)
+
+
+def random_nfa(states, seed=0, density=1.5):
+    from .finite_automata.minimization import random_nfa
+    return random_nfa(states, density=density, seed=seed)
+
+
+def random_words(alphabet, count, length, seed=0):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(alphabet) for _ in range(length)) for _ in range(count)]
+
+
+def random_cfg(rules, seed=0, terminals='abcd'):
+    from .chomsky_normal_form.cfg_to_cnf import Grammar, fresh_names
+    rng = random.Random(seed)
+    names = fresh_names()
+    non_terminals = [next(names) for _ in range(max(1, rules // 10))]
+    productions = {non_terminal: ['a'] for non_terminal in non_terminals}
+    for _ in range(rules):
+        position = rng.randrange(len(non_terminals))
+        lhs = non_terminals[position]
+        later = non_terminals[position + 1:position + 20] or [lhs]
+        kind = rng.random()
+        if kind < 0.01:
+            production = 'ε'
+        elif kind < 0.03:
+            production = rng.choice(later)
+        else:
+            symbols = [rng.choice(later + [lhs]) for _ in range(rng.randint(1, 4))]
+            symbols.insert(rng.randrange(len(symbols) + 1), rng.choice(terminals))
+            production = ''.join(symbols)
+        if production not in productions[lhs]:
+            productions[lhs].append(production)
+    return Grammar(non_terminals, list(terminals), productions, non_terminals[0])
+
+
+def random_regex(items, seed=0, alphabet='abcdef'):
+    rng = random.Random(seed)
+    parts = []
+    for _ in range(items):
+        if rng.random() < 0.5:
+            part = rng.choice(alphabet)
+        else:
+            part = '(' + '|'.join(rng.sample(alphabet, 2)) + ')'
+        parts.append(part + rng.choice(['', '', '?', '*', '+', '>2<']))
+    return ''.join(parts)
+
+
+# Cases: each setup builds the untimed input for one size and returns the
+# callable to measure.
+
+def _tokenize(kilobytes):
+    from .lexer.cpp_lexer import tokenize
+    code = cpp_source(kilobytes)
+    return lambda: tokenize(code)
+
+
+def _tokenize_dfa(kilobytes):
+    from .lexer.cpp_lexer import dfa_scanner, tokenize
+    code = cpp_source(kilobytes)
+    dfa_scanner()
+    return lambda: tokenize(code, 'dfa')
+
+
+def _lexer(kilobytes):
+    from .parser.cpp_parser import lexer
+    code = cpp_source(kilobytes)
+    return lambda: lexer(code)
+
+
+def _parse(kilobytes):
+    from .parser.cpp_parser import lexer, parse
+    tokens = lexer(cpp_source(kilobytes))
+    return lambda: parse(tokens)
+
+
+def _to_dfa(states):
+    nfa = random_nfa(states, seed=states)
+    return lambda: nfa.to_dfa(compact_names=True)
+
+
+def _string_belong_to_language(states):
+    nfa = random_nfa(states, seed=states)
+    words = random_words(nfa.alphabet, 1000, 32, seed=states)
+    return lambda: [nfa.string_belong_to_language(word) for word in words]
+
+
+def _match_many(states):
+    nfa = random_nfa(states, seed=states)
+    words = random_words(nfa.alphabet, 1000, 32, seed=states)
+    return lambda: nfa.match_many(words)
+
+
+def _convert_to_cnf(rules):
+    def run():
+        grammar = random_cfg(rules, seed=rules)
+        grammar.convert_to_cnf()
+        return grammar
+    return run
+
+
+def _generate_sequences(items):
+    from .regular_expressions.regex import generate_sequences_from_regex
+    pattern = random_regex(items, seed=items)
+    return lambda: generate_sequences_from_regex(pattern, limit=2)
+
+
+CLI_INPUTS = {
+    'lex': lambda directory: ['lex', '--count', _write(directory, 'main.cpp', cpp_source(1))],
+    'parse': lambda directory: ['parse', _write(directory, 'main.cpp', cpp_source(1))],
+    'dfa': lambda directory: ['dfa', '--minimize', '-m', 'ab', 'ba', '--', _write(directory, 'nfa.json', json.dumps({
+        'states': ['p', 'q', 'r'], 'alphabet': ['a', 'b'], 'start': 'p', 'accept': ['r'],
+        'transitions': {'p': {'a': ['p', 'q'], 'b': 'p'}, 'q': {'b': 'r'}, 'r': {}}}))],
+    'cnf': lambda directory: ['cnf', '-m', 'ab', 'aabb', '--', _write(directory, 'grammar.json', json.dumps({
+        'non_terminals': ['S', 'A'], 'terminals': ['a', 'b'], 'start': 'S',
+        'productions': {'S': ['aSb', 'A'], 'A': ['ab', 'ε']}}))],
+    'regex': lambda directory: ['regex', '(a|b)c*d+', '-n', '20'],
+}
+
+
+def _write(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(text)
+    return path
+
+
+def _cli_startup(command):
+    # A whole short-lived `python -m lfa` process on a tiny input, which
+    # is dominated by interpreter start and imports.
+    directory = tempfile.TemporaryDirectory(prefix='lfa-bench-')
+    arguments = [sys.executable, '-m', 'lfa'] + CLI_INPUTS[command](directory.name)
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), os.environ.get('PYTHONPATH')])))
+
+    def run(inputs=directory):
+        # inputs keeps the temporary directory alive as long as the case.
+        return subprocess.run(arguments, env=environment, check=True, stdout=subprocess.DEVNULL).returncode
+    return run
+
+
+CASES = {
+    'cpp_lexer.tokenize': (_tokenize, 'KB', (64, 256, 1024)),
+    'cpp_lexer.tokenize dfa': (_tokenize_dfa, 'KB', (64, 256, 1024)),
+    'cpp_parser.lexer': (_lexer, 'KB', (64, 256, 1024)),
+    'cpp_parser.parse': (_parse, 'KB', (64, 256, 1024)),
+    'FiniteAutomaton.to_dfa': (_to_dfa, 'states', (25, 50, 100)),
+    'FiniteAutomaton.string_belong_to_language': (_string_belong_to_language, 'states', (25, 50, 100)),
+    'FiniteAutomaton.match_many': (_match_many, 'states', (25, 50, 100)),
+    'Grammar.convert_to_cnf': (_convert_to_cnf, 'rules', (1000, 5000, 20000)),
+    'generate_sequences_from_regex': (_generate_sequences, 'items', (6, 10, 14)),
+    'cli startup': (_cli_startup, 'command', tuple(CLI_INPUTS)),
+}
+QUICK_SIZES = 1
+
+
+def measure(function, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    # Memory is measured on a separate run, tracemalloc slows code down.
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    items = len(result) if hasattr(result, '__len__') else None
+    return {'seconds': best, 'peak_bytes': peak, 'items': items}
+
+
+def run(names=None, quick=False, repeat=3, report=print):
+    results = {}
+    for name, (setup, unit, sizes) in CASES.items():
+        if names and name not in names:
+            continue
+        points = []
+        for size in sizes[:QUICK_SIZES] if quick else sizes:
+            point = {'size': size, 'unit': unit}
+            try:
+                point.update(measure(setup(size), repeat))
+            except ModuleNotFoundError as error:
+                if (error.name or '').partition('.')[0] not in OPTIONAL_DEPENDENCIES:
+                    raise
+                point['error'] = f'{type(error).__name__}: {error}'
+            points.append(point)
+            if report:
+                if 'error' in point:
+                    report(f'{name:<44} {size:>7} {unit:<6}  skipped ({point["error"]})')
+                else:
+                    report(f'{name:<44} {size:>7} {unit:<6} {point["seconds"]:9.4f} s '
+                           f'{point["peak_bytes"] / 2 ** 20:9.2f} MiB')
+        results[name] = points
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': repeat,
+        'cases': results,
+    }
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.005, min_bytes=1 << 16):
+    # A point regresses when it is more than tolerance slower or uses more
+    # than tolerance extra peak memory than the same case and size in the
+    # baseline; min_seconds and min_bytes keep noise on tiny points out.
+    regressions = []
+    for name, points in results['cases'].items():
+        previous = {point['size']: point for point in baseline.get('cases', {}).get(name, []) if 'error' not in point}
+        for point in points:
+            old = previous.get(point['size'])
+            if old is None or 'error' in point:
+                continue
+            for metric, floor in (('seconds', min_seconds), ('peak_bytes', min_bytes)):
+                if point[metric] > old[metric] * (1 + tolerance) and point[metric] - old[metric] > floor:
+                    regressions.append({'case': name, 'size': point['size'], 'metric': metric,
+                                        'baseline': old[metric], 'current': point[metric],
+                                        'ratio': point[metric] / old[metric] if old[metric] else float('inf')})
+    return regressions
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Time and memory scaling benchmarks for the lfa modules.')
+    arguments.add_argument('cases', nargs='*', help=f'cases to run (default: all of {", ".join(CASES)})')
+    arguments.add_argument('-o', '--output', help='write the results to this JSON file')
+    arguments.add_argument('-b', '--baseline', help='JSON results to compare against')
+    arguments.add_argument('-t', '--tolerance', type=float, default=0.25, help='allowed slowdown ratio (default 0.25)')
+    arguments.add_argument('-r', '--repeat', type=int, default=3, help='timed runs per point, the best is kept')
+    arguments.add_argument('-q', '--quick', action='store_true', help='only the smallest size of each case')
+    options = arguments.parse_args(argv)
+
+    unknown = [name for name in options.cases if name not in CASES]
+    if unknown:
+        arguments.error(f'unknown cases: {", ".join(unknown)}')
+    results = run(options.cases, options.quick, options.repeat)
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    if options.baseline:
+        with open(options.baseline, encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), options.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']} size {regression['size']} {regression['metric']}: "
+                  f"{regression['baseline']:.4g} -> {regression['current']:.4g} ({regression['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print('no regressions')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,413 @@
+import itertools
+from collections import deque
+from collections.abc import MutableMapping, MutableSequence
+
+from .. import instrumentation
+
+
+EPSILON = 'ε'
+
+
+def fresh_names():
+    # A..Z first, as the original converter used, then <0>, <1>, ...
+    yield from (chr(code) for code in range(65, 91))
+    for number in itertools.count():
+        yield f'<{number}>'
+
+
+class ProductionIndex:
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        # rules[lhs] is an insertion ordered set of right hand sides (tuples
+        # of symbol ids); uses[symbol] holds every (lhs, rhs) it occurs in.
+        self.rules = {}
+        self.uses = {}
+        # versions[lhs] counts edits to its rules, lists[lhs] caches them as
+        # a list for the live views as (version, rules).
+        self.versions = {}
+        self.lists = {}
+
+    def intern(self, name):
+        symbol = self.ids.get(name)
+        if symbol is None:
+            symbol = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return symbol
+
+    def parse(self, production):
+        # Strings are read one character per symbol, lists and tuples
+        # symbol by symbol.
+        if production == EPSILON:
+            return ()
+        return tuple(self.intern(name) for name in production)
+
+    def render(self, rhs):
+        if not rhs:
+            return EPSILON
+        names = [self.names[symbol] for symbol in rhs]
+        # A string only reads back the same when every name is one character.
+        return ''.join(names) if all(len(name) == 1 for name in names) else tuple(names)
+
+    def ordered(self, lhs):
+        version = self.versions.get(lhs, 0)
+        cached = self.lists.get(lhs)
+        if cached is None or cached[0] != version:
+            cached = self.lists[lhs] = (version, list(self.rules.get(lhs, ())))
+        return cached[1]
+
+    def _changed(self, lhs):
+        self.versions[lhs] = self.versions.get(lhs, 0) + 1
+
+    def add(self, lhs, rhs):
+        rules = self.rules.setdefault(lhs, {})
+        if rhs in rules:
+            return False
+        rules[rhs] = None
+        self._changed(lhs)
+        for symbol in set(rhs):
+            self.uses.setdefault(symbol, set()).add((lhs, rhs))
+        return True
+
+    def remove(self, lhs, rhs):
+        del self.rules[lhs][rhs]
+        self._changed(lhs)
+        for symbol in set(rhs):
+            self.uses[symbol].discard((lhs, rhs))
+
+    def drop(self, lhs):
+        self._changed(lhs)
+        for rhs in list(self.rules.pop(lhs, ())):
+            for symbol in set(rhs):
+                self.uses[symbol].discard((lhs, rhs))
+
+    def assign(self, lhs, productions):
+        self.drop(lhs)
+        self.rules[lhs] = {}
+        for rhs in productions:
+            self.add(lhs, rhs)
+
+
+class ProductionList(MutableSequence):
+    # Live view of one non-terminal's right hand sides, rendered as strings
+    # or, with names longer than one character, as tuples. Edits go straight
+    # to the index, which keeps each right hand side once.
+    def __init__(self, grammar, lhs):
+        self.grammar = grammar
+        self.lhs = lhs
+
+    def _rules(self):
+        # Shared and cached until the next edit of lhs: copy before changing.
+        return self.grammar.index.ordered(self.lhs)
+
+    def _store(self, rules):
+        index = self.grammar.index
+        for rhs in list(self._rules()):
+            index.remove(self.lhs, rhs)
+        index.rules.setdefault(self.lhs, {})
+        for rhs in rules:
+            index.add(self.lhs, rhs)
+
+    def __len__(self):
+        return len(self.grammar.index.rules.get(self.lhs, ()))
+
+    def __iter__(self):
+        render = self.grammar.index.render
+        return (render(rhs) for rhs in self._rules())
+
+    def __getitem__(self, position):
+        rules = self._rules()
+        if isinstance(position, slice):
+            return [self.grammar.index.render(rhs) for rhs in rules[position]]
+        return self.grammar.index.render(rules[position])
+
+    def __setitem__(self, position, value):
+        rules = list(self._rules())
+        parse = self.grammar.index.parse
+        rules[position] = [parse(production) for production in value] if isinstance(position, slice) else parse(value)
+        self._store(rules)
+
+    def __delitem__(self, position):
+        rules = list(self._rules())
+        del rules[position]
+        self._store(rules)
+
+    def insert(self, position, value):
+        rules = list(self._rules())
+        rules.insert(position, self.grammar.index.parse(value))
+        self._store(rules)
+
+    def append(self, value):
+        self.grammar.index.add(self.lhs, self.grammar.index.parse(value))
+
+    def __eq__(self, other):
+        if isinstance(other, (list, ProductionList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class ProductionMap(MutableMapping):
+    # Grammar.productions: the dict of lists view over the index.
+    def __init__(self, grammar):
+        self.grammar = grammar
+
+    def _lhs(self, name):
+        lhs = self.grammar.index.ids.get(name)
+        if lhs is None or lhs not in self.grammar.index.rules:
+            raise KeyError(name)
+        return lhs
+
+    def __getitem__(self, name):
+        return ProductionList(self.grammar, self._lhs(name))
+
+    def __setitem__(self, name, values):
+        index = self.grammar.index
+        rules = [index.parse(production) for production in values]
+        ProductionList(self.grammar, index.intern(name))._store(rules)
+
+    def __delitem__(self, name):
+        self.grammar.index.drop(self._lhs(name))
+
+    def __iter__(self):
+        names = self.grammar.index.names
+        return (names[lhs] for lhs in self.grammar.index.rules)
+
+    def __len__(self):
+        return len(self.grammar.index.rules)
+
+    def __repr__(self):
+        return repr({name: list(values) for name, values in self.items()})
+
+
+class Grammar:
+    def __init__(self, non_terminals, terminals, productions, start_symbol):
+        self.non_terminals = non_terminals
+        self.terminals = terminals
+        self.productions = productions
+        self.start_symbol = start_symbol
+
+    @property
+    def productions(self):
+        return ProductionMap(self)
+
+    @productions.setter
+    def productions(self, productions):
+        # Copied first, productions may be a view of this very grammar.
+        productions = {key: list(values) for key, values in productions.items()}
+        self.index = ProductionIndex()
+        self._fresh = fresh_names()
+        for name in list(self.non_terminals) + list(self.terminals):
+            self.index.intern(name)
+        for key, values in productions.items():
+            lhs = self.index.intern(key)
+            self.index.rules.setdefault(lhs, {})
+            for production in values:
+                self.index.add(lhs, self.index.parse(production))
+
+    def _non_terminal_ids(self):
+        return {self.index.ids[name] for name in self.non_terminals if name in self.index.ids}
+
+    def new_non_terminal(self, preferred=None):
+        name = preferred
+        while name is None or name in self.index.ids or name == EPSILON:
+            name = next(self._fresh)
+        self.non_terminals.append(name)
+        return self.index.intern(name)
+
+    def remove_start_symbol_from_rhs(self):
+        start = self.index.ids.get(self.start_symbol)
+        if self.index.uses.get(start):
+            new_start = self.new_non_terminal('X')
+            self.index.assign(new_start, [(start,)])
+            self.start_symbol = self.index.names[new_start]
+
+    def create_new_productions(self, production, symbol):
+        return [production[:i] + production[i+1:] for i in range(len(production)) if production[i] == symbol]
+
+    def size(self):
+        return sum(map(len, self.index.rules.values()))
+
+    def nullable_symbols(self):
+        # Worklist fixpoint: every rule counts its symbol occurrences that
+        # are not yet known to be nullable and fires when that reaches zero.
+        started = instrumentation.start()
+        index = self.index
+        pending = {}
+        nullable = set()
+        queue = deque()
+        for lhs, rules in index.rules.items():
+            for rhs in rules:
+                pending[lhs, rhs] = len(rhs)
+                if not rhs and lhs not in nullable:
+                    nullable.add(lhs)
+                    queue.append(lhs)
+        while queue:
+            symbol = queue.popleft()
+            for lhs, rhs in index.uses.get(symbol, ()):
+                pending[lhs, rhs] -= rhs.count(symbol)
+                if not pending[lhs, rhs] and lhs not in nullable:
+                    nullable.add(lhs)
+                    queue.append(lhs)
+        if started is not None:
+            instrumentation.record('cfg_to_cnf.Grammar.nullable_symbols', started, nullable=len(nullable))
+        return nullable
+
+    def eliminate_null_productions(self):
+        started = instrumentation.start()
+        before = self.size() if started is not None else 0
+        index = self.index
+        nullable = self.nullable_symbols()
+        for lhs, rules in list(index.rules.items()):
+            for rhs in list(rules):
+                positions = [position for position, symbol in enumerate(rhs) if symbol in nullable]
+                for dropped in itertools.product((False, True), repeat=len(positions)):
+                    skip = {position for position, drop in zip(positions, dropped) if drop}
+                    variant = tuple(symbol for position, symbol in enumerate(rhs) if position not in skip)
+                    if variant:
+                        index.add(lhs, variant)
+            if () in rules:
+                index.remove(lhs, ())
+        if started is not None:
+            instrumentation.record('cfg_to_cnf.Grammar.eliminate_null_productions', started,
+                                   productions_before=before, productions=self.size())
+
+    def eliminate_unit_productions(self):
+        started = instrumentation.start()
+        index = self.index
+        non_terminals = self._non_terminal_ids()
+        units = {lhs: [rhs[0] for rhs in rules if len(rhs) == 1 and rhs[0] in non_terminals]
+                 for lhs, rules in index.rules.items()}
+        replacements = {}
+        visited = 0
+        for lhs in index.rules:
+            if not units[lhs]:
+                continue
+            seen = {lhs}
+            queue = deque([lhs])
+            rules = []
+            while queue:
+                current = queue.popleft()
+                for rhs in index.rules.get(current, ()):
+                    if len(rhs) == 1 and rhs[0] in non_terminals:
+                        if rhs[0] not in seen:
+                            seen.add(rhs[0])
+                            queue.append(rhs[0])
+                    else:
+                        rules.append(rhs)
+            replacements[lhs] = rules
+            visited += len(seen)
+        for lhs, rules in replacements.items():
+            for unit in units[lhs]:
+                index.remove(lhs, (unit,))
+            for rhs in rules:
+                index.add(lhs, rhs)
+        if started is not None:
+            instrumentation.record('cfg_to_cnf.Grammar.eliminate_unit_productions', started,
+                                   iterations=visited, productions=self.size())
+
+    def reachable_symbols(self):
+        index = self.index
+        start = index.ids.get(self.start_symbol)
+        reachable = {start}
+        queue = deque([start])
+        while queue:
+            for rhs in index.rules.get(queue.popleft(), ()):
+                for symbol in rhs:
+                    if symbol not in reachable:
+                        reachable.add(symbol)
+                        queue.append(symbol)
+        return reachable
+
+    def eliminate_inaccessible_symbols(self):
+        started = instrumentation.start()
+        index = self.index
+        reachable = self.reachable_symbols()
+        removed = [lhs for lhs in index.rules if lhs not in reachable]
+        for lhs in removed:
+            index.drop(lhs)
+        self.non_terminals = [nt for nt in self.non_terminals if index.ids[nt] in reachable]
+        if started is not None:
+            instrumentation.record('cfg_to_cnf.Grammar.eliminate_inaccessible_symbols', started,
+                                   reachable=len(reachable), removed=len(removed))
+
+    def substitute_terminals_in_non_single_productions(self):
+        started = instrumentation.start()
+        index = self.index
+        non_terminals = self._non_terminal_ids()
+        terminal_to_nonterminal = {}
+
+        def substitute(symbol):
+            if symbol in non_terminals:
+                return symbol
+            if symbol not in terminal_to_nonterminal:
+                new_non_terminal = self.new_non_terminal()
+                terminal_to_nonterminal[symbol] = new_non_terminal
+                index.assign(new_non_terminal, [(symbol,)])
+            return terminal_to_nonterminal[symbol]
+
+        for lhs, rules in list(index.rules.items()):
+            if any(len(rhs) > 1 and not non_terminals.issuperset(rhs) for rhs in rules):
+                index.assign(lhs, [tuple(map(substitute, rhs)) if len(rhs) > 1 else rhs for rhs in list(rules)])
+        if started is not None:
+            instrumentation.record('cfg_to_cnf.Grammar.substitute_terminals_in_non_single_productions', started,
+                                   new_non_terminals=len(terminal_to_nonterminal))
+
+    def shorten_productions(self):
+        started = instrumentation.start()
+        index = self.index
+        binary_nonterminal_map = {}
+
+        def shorten(rhs):
+            while len(rhs) > 2:
+                last_two = rhs[-2:]
+                if last_two not in binary_nonterminal_map:
+                    new_non_terminal = self.new_non_terminal()
+                    binary_nonterminal_map[last_two] = new_non_terminal
+                    index.assign(new_non_terminal, [last_two])
+                rhs = rhs[:-2] + (binary_nonterminal_map[last_two],)
+            return rhs
+
+        for lhs, rules in list(index.rules.items()):
+            if any(len(rhs) > 2 for rhs in rules):
+                index.assign(lhs, [shorten(rhs) for rhs in list(rules)])
+        if started is not None:
+            instrumentation.record('cfg_to_cnf.Grammar.shorten_productions', started,
+                                   new_non_terminals=len(binary_nonterminal_map))
+
+    def convert_to_cnf(self):
+        started = instrumentation.start()
+        sizes = [self.size()] if started is not None else None
+        for step in (self.remove_start_symbol_from_rhs, self.eliminate_null_productions,
+                     self.eliminate_unit_productions, self.eliminate_inaccessible_symbols,
+                     self.substitute_terminals_in_non_single_productions, self.shorten_productions):
+            step()
+            if sizes is not None:
+                sizes.append(self.size())
+        if started is not None:
+            instrumentation.record('cfg_to_cnf.Grammar.convert_to_cnf', started, productions_before=sizes[0],
+                                   productions=sizes[-1], peak_productions=max(sizes),
+                                   non_terminals=len(self.non_terminals))
+
+
+#non_terminals = ['S', 'A', 'B', 'D']
+#terminals = ['a', 'b', 'd']
+#productions = {
+    #'S': ['dB', 'AB'],
+    #'A': ['d', 'dS', 'ε', 'aAaAb'],
+    #'B': ['a', 'aS', 'A'],
+    #'D': ['Aba']
+#}
+#start_symbol = 'S'
+
+#grammar = Grammar(non_terminals, terminals, productions, start_symbol)
+#grammar.convert_to_cnf()
+
+#print('Non-terminals:', grammar.non_terminals)
+#print('Terminals:', grammar.terminals)
+#print('Productions:')
+#for key, value in grammar.productions.items():
+    #print(f'{key} -> {value}')
+#print('Start Symbol: ', grammar.start_symbol, '\n')
@@ -0,0 +1,214 @@
+import random
+import time
+
+from .cfg_to_cnf import Grammar
+
+
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class CYKParser:
+    def __init__(self, grammar):
+        index = grammar.index
+        # Every declared non-terminal gets an id, with or without rules, so
+        # a symbol is a terminal exactly when it is not one of them.
+        declared = list(grammar.non_terminals) + [index.names[lhs] for lhs in index.rules]
+        self.names = list(dict.fromkeys(declared))
+        self.ids = {name: position for position, name in enumerate(self.names)}
+        # terminals[a] is the mask of non-terminals with a rule A -> a;
+        # by_left[B] lists (C, A) and by_parent[A] lists (B, C) for every
+        # rule A -> B C.
+        self.terminals = {}
+        self.by_left = [[] for _ in self.names]
+        self.by_parent = [[] for _ in self.names]
+        for name in self.names:
+            for rhs in index.rules.get(index.ids.get(name), ()):
+                symbols = [index.names[symbol] for symbol in rhs]
+                if len(symbols) == 1 and symbols[0] not in self.ids:
+                    self.terminals[symbols[0]] = self.terminals.get(symbols[0], 0) | 1 << self.ids[name]
+                elif len(symbols) == 2 and all(symbol in self.ids for symbol in symbols):
+                    left, right = self.ids[symbols[0]], self.ids[symbols[1]]
+                    self.by_left[left].append((right, self.ids[name]))
+                    self.by_parent[self.ids[name]].append((left, right))
+                else:
+                    raise ValueError(f"{name} -> {index.render(rhs)} is not in Chomsky Normal Form, call convert_to_cnf() first")
+        self.start = self.ids.get(grammar.start_symbol)
+
+    def chart(self, word):
+        # ends[i][A] is a bitset over positions j such that A derives
+        # word[i:j]. Rows are filled right to left, so every span starting
+        # after i is complete and a rule A -> B C extends a new B item at
+        # (i, k) to all of its ends at once: ends[i][A] |= ends[k][C].
+        length = len(word)
+        ends = [None] * (length + 1)
+        ends[length] = [0] * len(self.names)
+        by_left = self.by_left
+        for start in reversed(range(length)):
+            row = [0] * len(self.names)
+            mask = self.terminals.get(word[start], 0)
+            pending = []
+            for symbol in iter_bits(mask):
+                row[symbol] = 1 << start + 1
+                pending.append((symbol, start + 1))
+            while pending:
+                left, middle = pending.pop()
+                following = ends[middle]
+                for right, parent in by_left[left]:
+                    new = following[right] & ~row[parent]
+                    if new:
+                        row[parent] |= new
+                        pending.extend((parent, end) for end in iter_bits(new))
+            ends[start] = row
+        return ends
+
+    def cell(self, ends, start, end):
+        mask = 0
+        for symbol, positions in enumerate(ends[start]):
+            if positions >> end & 1:
+                mask |= 1 << symbol
+        return mask
+
+    def recognize(self, word):
+        if not word or self.start is None:
+            return False
+        return bool(self.chart(word)[0][self.start] >> len(word) & 1)
+
+    def _splits(self, ends, symbol, start, end):
+        between = ((1 << end) - 1) & ~((1 << start + 1) - 1)
+        for left, right in self.by_parent[symbol]:
+            for middle in iter_bits(ends[start][left] & between):
+                if ends[middle][right] >> end & 1:
+                    yield (left, start, middle), (right, middle, end)
+
+    def forest(self, word):
+        # Shared packed forest: every (non-terminal, start, end) item that
+        # takes part in some parse maps to its alternatives, either a
+        # terminal or a pair of child items.
+        if not word or self.start is None:
+            return None
+        ends = self.chart(word)
+        root = (self.start, 0, len(word))
+        if not ends[0][self.start] >> len(word) & 1:
+            return None
+        forest = {}
+        pending = [root]
+        while pending:
+            item = pending.pop()
+            if item in forest:
+                continue
+            symbol, start, end = item
+            if end == start + 1:
+                forest[item] = [word[start]] if self.terminals.get(word[start], 0) >> symbol & 1 else []
+            else:
+                forest[item] = []
+            for children in self._splits(ends, symbol, start, end):
+                forest[item].append(children)
+                pending.extend(child for child in children if child not in forest)
+        return {(self.names[symbol], start, end): [alternative if isinstance(alternative, str) else
+                                                   tuple((self.names[child[0]], child[1], child[2]) for child in alternative)
+                                                   for alternative in alternatives]
+                for (symbol, start, end), alternatives in forest.items()}
+
+    def parse(self, word):
+        # A single tree, following the first split of each item instead of
+        # building the whole forest; children are finished before parents.
+        if not word or self.start is None:
+            return None
+        ends = self.chart(word)
+        if not ends[0][self.start] >> len(word) & 1:
+            return None
+        root = (self.start, 0, len(word))
+        trees = {}
+        pending = [(root, None)]
+        while pending:
+            item, children = pending.pop()
+            symbol, start, end = item
+            if item in trees:
+                continue
+            if end == start + 1:
+                trees[item] = (self.names[symbol], word[start])
+            elif children is not None:
+                trees[item] = (self.names[symbol], trees[children[0]], trees[children[1]])
+            else:
+                children = next(self._splits(ends, symbol, start, end))
+                pending.append((item, children))
+                pending.extend((child, None) for child in children)
+        return trees[root]
+
+    def recognize_many(self, words, workers=None, chunk_size=64):
+        words = list(words)
+        if not workers or workers < 2:
+            return [self.recognize(word) for word in words]
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self,)) as executor:
+            return list(executor.map(_recognize, words, chunksize=chunk_size))
+
+
+_worker_parser = None
+
+
+def _init_worker(parser):
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _recognize(word):
+    return _worker_parser.recognize(word)
+
+
+def expression_grammar(ambiguous=False):
+    if ambiguous:
+        grammar = Grammar(['E'], ['a', '+', '*', '(', ')'], {'E': ['E+E', 'E*E', '(E)', 'a']}, 'E')
+    else:
+        grammar = Grammar(['E', 'T', 'F'], ['a', '+', '*', '(', ')'], {
+            'E': ['E+T', 'T'],
+            'T': ['T*F', 'F'],
+            'F': ['(E)', 'a'],
+        }, 'E')
+    grammar.convert_to_cnf()
+    return grammar
+
+
+def random_expression(length, rng):
+    # Built from an explicit stack of (length, suffix) pieces so that long
+    # inputs do not hit the recursion limit.
+    parts = []
+    pending = [length]
+    while pending:
+        piece = pending.pop()
+        if isinstance(piece, str):
+            parts.append(piece)
+        elif piece <= 2:
+            parts.append('a')
+        elif rng.random() < 0.2:
+            pending.extend((')', piece - 2, '('))
+        else:
+            split = rng.randint(1, piece - 2)
+            pending.extend((piece - split - 1, rng.choice('+*'), split))
+    return ''.join(parts)
+
+
+def benchmark_cyk(lengths=(100, 250, 500, 1000), sentences=3, seed=0):
+    rng = random.Random(seed)
+    workloads = [
+        ('expressions', CYKParser(expression_grammar()), lambda length: random_expression(length, rng)),
+        ('ambiguous', CYKParser(expression_grammar(ambiguous=True)), lambda length: 'a+' * (length // 2) + 'a'),
+    ]
+    results = []
+    for name, parser, make in workloads:
+        for length in lengths:
+            words = [make(length) for _ in range(sentences)]
+            start = time.perf_counter()
+            accepted = parser.recognize_many(words)
+            elapsed = (time.perf_counter() - start) / sentences
+            results.append((name, length, elapsed))
+            print(f'{name:<12} length {length:>5}  {elapsed:8.3f} s per sentence  accepted {sum(accepted)}/{sentences}')
+    return results
+
+
+if __name__ == '__main__':
+    benchmark_cyk()
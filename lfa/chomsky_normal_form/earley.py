@@ -0,0 +1,209 @@
+import time
+from collections import deque
+
+from .cfg_to_cnf import EPSILON
+
+
+START = object()
+
+
+class EarleyParser:
+    def __init__(self, productions, start_symbol, key=None, non_terminals=()):
+        # Productions come straight from cfg_to_cnf.Grammar: strings are
+        # read one character per symbol, lists and tuples symbol by symbol.
+        # Declared non_terminals without rules stay non-terminals, they
+        # derive nothing instead of matching their own name as a token.
+        self.key = key
+        self.non_terminals = set(productions) | set(non_terminals) | {start_symbol}
+        rules = [(START, (start_symbol,))]
+        for lhs, values in productions.items():
+            for production in values:
+                rhs = () if production == EPSILON else tuple(production)
+                rules.append((lhs, rhs))
+
+        # Rules using a symbol that derives no terminal string can never
+        # complete; dropping them keeps a non-empty Earley set equivalent to
+        # a valid prefix.
+        productive = self._productive(rules)
+        self.rules = rules[:1] + [(lhs, rhs) for lhs, rhs in rules[1:]
+                                  if all(symbol in productive or symbol not in self.non_terminals for symbol in rhs)]
+        self.empty = START not in productive
+        self.by_lhs = {}
+        for rule, (lhs, rhs) in enumerate(self.rules):
+            self.by_lhs.setdefault(lhs, []).append(rule)
+        self.nullable = self._nullable()
+        self.reset()
+
+    @classmethod
+    def from_grammar(cls, grammar, key=None):
+        return cls(grammar.productions, grammar.start_symbol, key, grammar.non_terminals)
+
+    def _productive(self, rules):
+        productive = set()
+        changed = True
+        while changed:
+            changed = False
+            for lhs, rhs in rules:
+                if lhs not in productive and all(symbol in productive or symbol not in self.non_terminals for symbol in rhs):
+                    productive.add(lhs)
+                    changed = True
+        return productive
+
+    def _nullable(self):
+        pending = {}
+        uses = {}
+        nullable = set()
+        queue = deque()
+        for rule, (lhs, rhs) in enumerate(self.rules):
+            pending[rule] = len(rhs)
+            for symbol in rhs:
+                uses.setdefault(symbol, []).append(rule)
+            if not rhs and lhs not in nullable:
+                nullable.add(lhs)
+                queue.append(lhs)
+        while queue:
+            for rule in uses.get(queue.popleft(), ()):
+                pending[rule] -= 1
+                lhs = self.rules[rule][0]
+                if not pending[rule] and lhs not in nullable:
+                    nullable.add(lhs)
+                    queue.append(lhs)
+        return nullable
+
+    def reset(self):
+        # Per position: items in order of arrival, the same items as a set,
+        # items by the symbol after their dot, and memoized Leo items.
+        self.items = []
+        self.seen = []
+        self.waiting = []
+        self.leo = []
+        self._new_set()
+        if not self.empty:
+            self._add(0, (0, 0, 0))
+            self._close(0)
+        return self.valid
+
+    def _new_set(self):
+        self.items.append([])
+        self.seen.append(set())
+        self.waiting.append({})
+        self.leo.append({})
+
+    def _add(self, position, item):
+        if item not in self.seen[position]:
+            self.seen[position].add(item)
+            self.items[position].append(item)
+
+    def _close(self, position):
+        items, waiting = self.items[position], self.waiting[position]
+        rules, by_lhs, nullable = self.rules, self.by_lhs, self.nullable
+        index = 0
+        while index < len(items):
+            rule, dot, origin = items[index]
+            index += 1
+            lhs, rhs = rules[rule]
+            if dot < len(rhs):
+                symbol = rhs[dot]
+                waiting.setdefault(symbol, []).append((rule, dot, origin))
+                if symbol in by_lhs:
+                    for predicted in by_lhs[symbol]:
+                        self._add(position, (predicted, 0, position))
+                    # Aycock and Horspool: a nullable symbol may be skipped
+                    # right away, so completions inside this set are not
+                    # needed for it.
+                    if symbol in nullable:
+                        self._add(position, (rule, dot + 1, origin))
+            elif origin == position:
+                for parent, parent_dot, parent_origin in list(waiting.get(lhs, ())):
+                    self._add(position, (parent, parent_dot + 1, parent_origin))
+            else:
+                top = self._leo_item(origin, lhs)
+                if top is not None:
+                    self._add(position, top)
+                else:
+                    for parent, parent_dot, parent_origin in self.waiting[origin].get(lhs, ()):
+                        self._add(position, (parent, parent_dot + 1, parent_origin))
+
+    def _leo_item(self, position, symbol):
+        # Leo: when exactly one item in a finished set waits for symbol and
+        # symbol is the last one of its rule, completing it only leads to
+        # completing its parent. The chain of such items is followed once to
+        # its topmost item and memoized, which keeps right recursion linear.
+        path = []
+        top = None
+        while True:
+            memo = self.leo[position]
+            if symbol in memo:
+                top = memo[symbol] or top
+                break
+            waiting = self.waiting[position].get(symbol, ())
+            if len(waiting) != 1:
+                memo[symbol] = None
+                break
+            rule, dot, origin = waiting[0]
+            if dot + 1 != len(self.rules[rule][1]):
+                memo[symbol] = None
+                break
+            path.append((position, symbol))
+            top = (rule, dot + 1, origin)
+            if origin == position:
+                break
+            position, symbol = origin, self.rules[rule][0]
+        for position, symbol in path:
+            self.leo[position][symbol] = top
+        return top
+
+    def feed(self, token):
+        terminal = self.key(token) if self.key else token
+        position = len(self.items) - 1
+        self._new_set()
+        if terminal not in self.non_terminals:
+            for rule, dot, origin in self.waiting[position].get(terminal, ()):
+                self._add(position + 1, (rule, dot + 1, origin))
+        self._close(position + 1)
+        return self.valid
+
+    def feed_many(self, tokens):
+        for token in tokens:
+            if not self.feed(token):
+                return False
+        return True
+
+    @property
+    def position(self):
+        return len(self.items) - 1
+
+    @property
+    def valid(self):
+        # Some sentence of the language starts with the tokens fed so far.
+        return bool(self.items[-1])
+
+    @property
+    def accepted(self):
+        return (0, 1, 0) in self.seen[-1]
+
+    def expected(self):
+        return {symbol for symbol in self.waiting[-1] if symbol not in self.non_terminals}
+
+    def recognize(self, tokens):
+        self.reset()
+        return self.feed_many(tokens) and self.accepted
+
+
+def benchmark_earley(lengths=(1000, 5000, 20000)):
+    right = EarleyParser({'S': ['aS', 'a']}, 'S')
+    left = EarleyParser({'S': ['Sa', 'a']}, 'S')
+    results = []
+    for length in lengths:
+        timings = []
+        for parser in (right, left):
+            start = time.perf_counter()
+            accepted = parser.recognize('a' * length)
+            timings.append(time.perf_counter() - start)
+        results.append((length, *timings))
+        print(f'length {length:>6}  right recursive {timings[0]:6.3f} s  left recursive {timings[1]:6.3f} s  accepted {accepted}')
+    return results
+
+
+if __name__ == '__main__':
+    benchmark_earley()
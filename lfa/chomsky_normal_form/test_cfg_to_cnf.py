@@ -0,0 +1,162 @@
+import itertools
+import random
+import unittest
+
+from .cfg_to_cnf import EPSILON, Grammar
+from .cyk import CYKParser
+
+
+def _reference_derives(productions, non_terminals, start, word):
+    # Fixed point over (symbol, i, j) facts, splitting every right hand side
+    # in every possible way: slow, but independent of the CNF conversion.
+    facts = set()
+
+    def matches(rhs, i, j):
+        if not rhs:
+            return i == j
+        for k in range(i, j + 1):
+            if rhs[0] in non_terminals:
+                derived = (rhs[0], i, k) in facts
+            else:
+                derived = word[i:k] == rhs[0]
+            if derived and matches(rhs[1:], k, j):
+                return True
+        return False
+
+    changed = True
+    while changed:
+        changed = False
+        for lhs, values in productions.items():
+            for production in values:
+                rhs = '' if production == EPSILON else production
+                for i in range(len(word) + 1):
+                    for j in range(i, len(word) + 1):
+                        if (lhs, i, j) not in facts and matches(rhs, i, j):
+                            facts.add((lhs, i, j))
+                            changed = True
+    return (start, 0, len(word)) in facts
+
+
+def _random_grammar(rng, non_terminals=('S', 'A', 'B'), terminals=('a', 'b')):
+    symbols = non_terminals + terminals
+    productions = {}
+    for lhs in non_terminals:
+        values = {''.join(rng.choice(symbols) for _ in range(rng.choice((0, 1, 1, 2, 2, 3)))) or EPSILON
+                  for _ in range(rng.randint(1, 3))}
+        productions[lhs] = sorted(values)
+    return Grammar(list(non_terminals), list(terminals), productions, non_terminals[0])
+
+
+def _words(terminals, length):
+    return [''.join(word) for size in range(length + 1) for word in itertools.product(terminals, repeat=size)]
+
+
+class TestGrammarMethods(unittest.TestCase):
+    def setUp(self):
+        self.grammar = Grammar(['S', 'A', 'B', 'D'], 
+            ['a', 'b', 'd'], 
+        {
+            'S': ['dB', 'AB'],
+            'A': ['d', 'dS', 'ε', 'aAaAb'],
+            'B': ['a', 'aS', 'A'],
+            'D': ['Aba']
+        }, 
+        'S')
+
+    def test_productions_edit_in_place(self):
+        productions = self.grammar.productions
+        productions['S'].append('aa')
+        productions['B'].remove('A')
+        productions['D'][0] = 'ε'
+        productions['E'] = ['a', 'S']
+        del productions['A']
+        self.assertEqual(self.grammar.productions, {
+            'S': ['dB', 'AB', 'aa'],
+            'B': ['a', 'aS'],
+            'D': ['ε'],
+            'E': ['a', 'S'],
+        })
+        self.assertIn(('S', 'aa'), [(lhs, prod) for lhs, values in self.grammar.productions.items() for prod in values])
+        self.assertIn(self.grammar.index.parse('aa'), self.grammar.index.rules[self.grammar.index.ids['S']])
+        self.grammar.productions = self.grammar.productions
+        self.assertEqual(self.grammar.productions['E'], ['a', 'S'])
+
+    def test_remove_start_symbol_from_rhs(self):
+        self.grammar.remove_start_symbol_from_rhs()
+        self.assertNotIn(self.grammar.start_symbol, [prod for values in self.grammar.productions.values() for prod in values])
+        self.assertIn('X', self.grammar.non_terminals)
+
+    def test_eliminate_null_productions(self):
+        self.grammar.eliminate_null_productions()
+        for values in self.grammar.productions.values():
+            self.assertNotIn('ε', values)
+
+    def test_eliminate_unit_productions(self):
+        self.grammar.eliminate_unit_productions()
+        for values in self.grammar.productions.values():
+            for prod in values:
+                self.assertFalse(len(prod) == 1 and prod.isupper())
+
+    def test_shorten_production(self):
+        self.grammar.substitute_terminals_in_non_single_productions()
+        self.grammar.shorten_productions()
+        for values in self.grammar.productions.values():
+            for prod in values:
+                self.assertTrue(len(prod) <= 2)
+
+    def test_nullable_symbols_are_transitive(self):
+        nullable = {self.grammar.index.names[symbol] for symbol in self.grammar.nullable_symbols()}
+        self.assertEqual(nullable, {'S', 'A', 'B'})
+
+    def test_convert_to_cnf_beyond_26_non_terminals(self):
+        terminals = [chr(code) for code in range(97, 123)]
+        grammar = Grammar(['S'], terminals, {'S': [''.join(terminals) * 2, 'S' + 'ab' * 20]}, 'S')
+        grammar.convert_to_cnf()
+        self.assertGreater(len(grammar.non_terminals), 26)
+        self.assertEqual(len(grammar.non_terminals), len(set(grammar.non_terminals)))
+        for values in grammar.productions.values():
+            for prod in values:
+                self.assertTrue(prod in terminals or (len(prod) == 2 and all(symbol in grammar.non_terminals for symbol in prod)))
+
+    def test_fresh_names_round_trip(self):
+        # Past Z the fresh names are <0>, <1>, ..., and rules using them are
+        # rendered as tuples, which read back symbol by symbol.
+        terminals = [chr(code) for code in range(97, 123)]
+        grammar = Grammar(['S'], terminals, {'S': [''.join(terminals) * 2, 'S' + 'ab' * 20]}, 'S')
+        grammar.convert_to_cnf()
+        self.assertIn('<0>', grammar.non_terminals)
+        productions = {lhs: list(values) for lhs, values in grammar.productions.items()}
+        self.assertTrue(any(isinstance(prod, tuple) for values in productions.values() for prod in values))
+        copy = Grammar(list(grammar.non_terminals), terminals, productions, grammar.start_symbol)
+        self.assertEqual(copy.productions, grammar.productions)
+        self.assertEqual(copy.size(), grammar.size())
+        parser = CYKParser(copy)
+        self.assertTrue(parser.recognize(''.join(terminals) * 2))
+        self.assertTrue(parser.recognize(''.join(terminals) * 2 + 'ab' * 40))
+        self.assertFalse(parser.recognize(''.join(terminals) * 2 + 'ab' * 19))
+
+    def test_views_cache_rules_until_edited(self):
+        productions = self.grammar.productions
+        rules = self.grammar.index.ordered(self.grammar.index.ids['A'])
+        self.assertEqual(productions['A'][3], 'aAaAb')
+        self.assertIs(self.grammar.index.ordered(self.grammar.index.ids['A']), rules)
+        productions['A'].append('bb')
+        self.assertEqual(productions['A'][-1], 'bb')
+        self.assertEqual(len(rules), 4)
+        self.assertEqual(len(self.grammar.index.ordered(self.grammar.index.ids['A'])), 5)
+
+    def test_convert_to_cnf_keeps_language(self):
+        rng = random.Random(18)
+        for _ in range(60):
+            grammar = _random_grammar(rng)
+            original = {lhs: list(values) for lhs, values in grammar.productions.items()}
+            originals = set(grammar.non_terminals)
+            grammar.convert_to_cnf()
+            converted = {lhs: list(values) for lhs, values in grammar.productions.items()}
+            for word in _words('ab', 5)[1:]:
+                self.assertEqual(_reference_derives(converted, set(grammar.non_terminals), grammar.start_symbol, word),
+                                 _reference_derives(original, originals, 'S', word), (original, word))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from .cfg_to_cnf import Grammar
+from .cyk import CYKParser, expression_grammar
+from .test_cfg_to_cnf import _random_grammar, _reference_derives, _words
+
+
+def _tree_word(tree):
+    # Leaves left to right, without recursion.
+    word = []
+    pending = [tree]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, str):
+            word.append(node)
+        else:
+            pending.extend(reversed(node[1:]))
+    return ''.join(word)
+
+
+class TestCYKParser(unittest.TestCase):
+    def test_random_grammars_match_reference(self):
+        rng = random.Random(19)
+        for _ in range(40):
+            grammar = _random_grammar(rng)
+            original = {lhs: list(values) for lhs, values in grammar.productions.items()}
+            grammar.convert_to_cnf()
+            parser = CYKParser(grammar)
+            for word in _words('ab', 6)[1:]:
+                expected = _reference_derives(original, {'S', 'A', 'B'}, 'S', word)
+                self.assertEqual(parser.recognize(word), expected, (original, word))
+                tree = parser.parse(word)
+                self.assertEqual(tree is not None, expected)
+                if tree is not None:
+                    self.assertEqual(_tree_word(tree), word)
+
+    def test_forest_items_are_consistent(self):
+        parser = CYKParser(expression_grammar(ambiguous=True))
+        forest = parser.forest('a+a*a')
+        self.assertIn((parser.names[parser.start], 0, 5), forest)
+        for (symbol, start, end), alternatives in forest.items():
+            self.assertTrue(alternatives)
+            for alternative in alternatives:
+                if isinstance(alternative, str):
+                    self.assertEqual(end, start + 1)
+                else:
+                    (left, left_start, middle), (right, right_start, right_end) = alternative
+                    self.assertEqual((left_start, middle, right_start, right_end), (start, middle, middle, end))
+                    self.assertIn((parser.ids[left], parser.ids[right]), parser.by_parent[parser.ids[symbol]])
+        # Two ways to bracket a+a*a.
+        root = forest[(parser.names[parser.start], 0, 5)]
+        self.assertEqual(len(root), 2)
+
+    def test_non_terminal_without_rules(self):
+        grammar = Grammar(['S', 'A', 'D'], ['a', 'b'], {'S': ['AD', 'a'], 'A': ['a']}, 'S')
+        grammar.convert_to_cnf()
+        parser = CYKParser(grammar)
+        self.assertTrue(parser.recognize('a'))
+        self.assertFalse(parser.recognize('aa'))
+        self.assertEqual(parser.parse('a'), ('S', 'a'))
+
+    def test_unit_rule_to_empty_non_terminal_is_not_cnf(self):
+        grammar = Grammar(['S', 'D'], ['a'], {'S': ['D', 'a']}, 'S')
+        with self.assertRaises(ValueError):
+            CYKParser(grammar)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from .cfg_to_cnf import Grammar
+from .earley import EarleyParser
+from .test_cfg_to_cnf import _random_grammar, _reference_derives, _words
+
+
+class TestEarleyParser(unittest.TestCase):
+    def test_random_grammars_match_reference(self):
+        rng = random.Random(51)
+        for _ in range(60):
+            productions = {lhs: list(values) for lhs, values in _random_grammar(rng).productions.items()}
+            parser = EarleyParser(productions, 'S')
+            words = _words('ab', 5)
+            accepted = {word for word in words if _reference_derives(productions, {'S', 'A', 'B'}, 'S', word)}
+            for word in words:
+                with self.subTest(productions=productions, word=word):
+                    self.assertEqual(parser.recognize(word), word in accepted)
+
+            # Prefixes of accepted words are valid; an invalid prefix has no
+            # accepted extension, and expected() lists exactly the terminals
+            # that keep a prefix valid.
+            for word in words:
+                parser.reset()
+                self.assertTrue(parser.feed_many(word) or not any(other.startswith(word) for other in accepted))
+                if parser.valid:
+                    expected = parser.expected()
+                    for terminal in 'ab':
+                        parser.recognize(word)
+                        self.assertEqual(parser.feed(terminal), terminal in expected, (productions, word, terminal))
+            for word in accepted:
+                parser.reset()
+                for position, terminal in enumerate(word):
+                    self.assertTrue(parser.feed(terminal))
+                    self.assertEqual(parser.position, position + 1)
+                self.assertTrue(parser.accepted)
+
+    def test_right_recursion_sets_stay_small(self):
+        # With Leo items a completed right-recursive chain adds one item per
+        # set instead of one per pending level.
+        parser = EarleyParser({'S': ['aS', 'a']}, 'S')
+        self.assertTrue(parser.recognize('a' * 500))
+        self.assertLessEqual(max(map(len, parser.items)), 6)
+        self.assertFalse(parser.recognize('a' * 500 + 'b'))
+
+    def test_tokens_through_key(self):
+        parser = EarleyParser({'E': [['E', '+', 'n'], ['n']]}, 'E', key=lambda token: token[0])
+        tokens = [('n', 1), ('+', None), ('n', 2)]
+        self.assertTrue(parser.recognize(tokens))
+        self.assertFalse(parser.recognize(tokens[:2]))
+        self.assertEqual(parser.expected(), {'n'})
+
+    def test_empty_language(self):
+        parser = EarleyParser({'S': ['aS']}, 'S')
+        self.assertFalse(parser.valid)
+        self.assertFalse(parser.recognize('a'))
+
+    def test_declared_non_terminal_without_rules(self):
+        # B derives nothing, so S -> aB can never complete; read as a
+        # terminal, B would match the token 'B'.
+        grammar = Grammar(['S', 'B'], ['a', 'b'], {'S': ['aB', 'b']}, 'S')
+        for parser in (EarleyParser.from_grammar(grammar), EarleyParser({'S': ['aB', 'b']}, 'S', non_terminals={'B'})):
+            self.assertFalse(parser.recognize('aB'))
+            self.assertTrue(parser.recognize('b'))
+            parser.reset()
+            self.assertEqual(parser.expected(), {'b'})
+        self.assertFalse(EarleyParser({}, 'S').recognize('S'))
+
+
+if __name__ == '__main__':
+    unittest.main()
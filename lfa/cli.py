@@ -0,0 +1,209 @@
+import sys
+import json
+import argparse
+
+
+# Every command imports what it needs when it runs, so starting the CLI
+# only pays for argparse and the modules of the command used.
+
+def _read(path):
+    if path in (None, '-'):
+        return sys.stdin.read()
+    with open(path, encoding='utf-8') as file:
+        return file.read()
+
+
+def _load_json(path):
+    try:
+        return json.loads(_read(path))
+    except json.JSONDecodeError as error:
+        raise SystemExit(f'lfa: {path}: invalid JSON: {error}')
+
+
+def _words(options):
+    words = list(options.match or [])
+    if options.words:
+        words.extend(line.rstrip('\n') for line in _read(options.words).splitlines())
+    return words
+
+
+def lex(options):
+    from .lexer.cpp_lexer import token_table, tokenize
+    if options.cache is not None:
+        from .artifact_cache import ArtifactCache
+        from .lexer.cpp_lexer import dfa_scanner
+        tokens = dfa_scanner(ArtifactCache(options.cache or None)).tokenize(_read(options.file))
+    else:
+        tokens = tokenize(_read(options.file), 'dfa' if options.dfa else 'regex')
+    if options.count:
+        print(len(tokens))
+    elif options.table:
+        print(token_table(tokens))
+    else:
+        for token_type, value in tokens:
+            print(f'{token_type}\t{value}')
+
+
+def parse(options):
+    from .parser.cpp_parser import lexer, parse, walk, write_ast_dot
+    tree = parse(lexer(_read(options.file)))
+    if options.dot:
+        write_ast_dot(tree, options.dot)
+        return
+    depth = -1
+    for node, entering in walk(tree):
+        depth += 1 if entering else -1
+        if entering:
+            print('  ' * depth + (f'{node.type}({node.value})' if node.value is not None else node.type))
+
+
+def automaton_from_json(data):
+    # Either an automaton or a right-linear grammar, whose language is
+    # turned into an automaton.
+    if 'productions' in data:
+        from .finite_automata.grammar import Grammar
+        grammar = Grammar(data['non_terminals'], data['terminals'], data['productions'], data['start'])
+        return grammar.language_automaton()
+    from .finite_automata.automaton import FiniteAutomaton
+    return FiniteAutomaton(data['states'], data['alphabet'], data['transitions'], data['start'], data['accept'])
+
+
+def automaton_to_json(automaton):
+    return {'states': list(automaton.states), 'alphabet': list(automaton.alphabet),
+            'transitions': automaton.transition_function, 'start': automaton.start, 'accept': list(automaton.accept)}
+
+
+def dfa(options):
+    automaton = automaton_from_json(_load_json(options.file))
+    words = _words(options)
+    if options.cache is not None:
+        from .artifact_cache import ArtifactCache
+        table = ArtifactCache(options.cache or None).dfa_table(automaton, options.minimize)
+        if not words:
+            automaton = table.to_automaton()
+    else:
+        automaton = automaton.to_dfa(compact_names=options.compact)
+        if options.minimize:
+            automaton = automaton.minimize(compact_names=options.compact)
+        table = automaton.compile() if words else None
+    if words:
+        for word, accepted in zip(words, table.match_many(words)):
+            print(f'{word}\t{accepted}')
+    elif options.dot:
+        automaton.write_dot(options.dot)
+    else:
+        print(json.dumps(automaton_to_json(automaton), ensure_ascii=False, indent=2, default=str))
+
+
+def cnf(options):
+    data = _load_json(options.file)
+    from .chomsky_normal_form.cfg_to_cnf import Grammar
+    grammar = Grammar(data['non_terminals'], data['terminals'], data['productions'], data['start'])
+    if options.cache is not None:
+        from .artifact_cache import ArtifactCache
+        grammar = ArtifactCache(options.cache or None).cnf(grammar)
+    else:
+        grammar.convert_to_cnf()
+    words = _words(options)
+    if words:
+        from .chomsky_normal_form.cyk import CYKParser
+        parser = CYKParser(grammar)
+        for word in words:
+            print(f'{word}\t{parser.recognize(word)}')
+        return
+    productions = {lhs: list(values) for lhs, values in grammar.productions.items()}
+    print(json.dumps({'non_terminals': grammar.non_terminals, 'terminals': grammar.terminals,
+                      'productions': productions, 'start': grammar.start_symbol},
+                     ensure_ascii=False, indent=2))
+
+
+def regex(options):
+    from .regular_expressions import regex
+    words = _words(options)
+    if words:
+        # Matching is unbounded unless a limit is given.
+        matcher = regex.compile_regex(options.pattern, options.limit)
+        for word in words:
+            print(f'{word}\t{matcher.match(word)}')
+        return
+    limit = 5 if options.limit is None else options.limit
+    if options.count:
+        print(regex.count_sequences(options.pattern, limit, options.length))
+    elif options.sample:
+        for sequence in regex.sample_sequences(options.pattern, options.sample, limit, options.length, options.seed):
+            print(sequence)
+    else:
+        import itertools
+        sequences = regex.iter_sequences_from_regex(options.pattern, limit, options.length)
+        if options.length is not None:
+            sequences = (sequence for sequence in sequences if len(sequence) == options.length)
+        for sequence in itertools.islice(sequences, options.max):
+            print(sequence)
+
+
+def _add_words(command, what):
+    command.add_argument('-m', '--match', nargs='+', metavar='WORD', help=f'print whether each word {what}')
+    command.add_argument('-w', '--words', metavar='FILE', help='read more words to match, one per line (- for stdin)')
+
+
+def _add_cache(command):
+    command.add_argument('--cache', nargs='?', const='', metavar='DIR',
+                         help='load the result from an artifact cache (default directory: $LFA_CACHE_DIR or ~/.cache/lfa)')
+
+
+def arguments():
+    arguments = argparse.ArgumentParser(prog='lfa', description='Lexer, parser, automata, CNF and regex tools.')
+    commands = arguments.add_subparsers(dest='command', required=True, metavar='command')
+
+    command = commands.add_parser('lex', help='tokenize C++ source')
+    command.add_argument('file', nargs='?', help='source file (default: stdin)')
+    command.add_argument('--table', action='store_true', help='print a table (needs prettytable)')
+    command.add_argument('--count', action='store_true', help='only print the number of tokens')
+    command.add_argument('--dfa', action='store_true', help='use the generated longest match DFA scanner')
+    _add_cache(command)
+    command.set_defaults(run=lex)
+
+    command = commands.add_parser('parse', help='parse C++ source and print its AST')
+    command.add_argument('file', nargs='?', help='source file (default: stdin)')
+    command.add_argument('--dot', metavar='FILE', help='write the AST as Graphviz DOT instead')
+    command.set_defaults(run=parse)
+
+    command = commands.add_parser('dfa', help='determinize an automaton or regular grammar given as JSON')
+    command.add_argument('file', nargs='?', help='JSON definition (default: stdin)')
+    command.add_argument('--minimize', action='store_true', help='minimize the DFA')
+    command.add_argument('--compact', action='store_true', help='number the states instead of naming them by subset')
+    command.add_argument('--dot', metavar='FILE', help='write the DFA as Graphviz DOT instead')
+    _add_words(command, 'is accepted')
+    _add_cache(command)
+    command.set_defaults(run=dfa)
+
+    command = commands.add_parser('cnf', help='convert a context-free grammar given as JSON to Chomsky Normal Form')
+    command.add_argument('file', nargs='?', help='JSON definition (default: stdin)')
+    _add_words(command, 'is in the language (CYK)')
+    _add_cache(command)
+    command.set_defaults(run=cnf)
+
+    command = commands.add_parser('regex', help='generate, count, sample or match regex sequences')
+    command.add_argument('pattern')
+    command.add_argument('-l', '--limit', type=int,
+                         help='repetitions allowed for * and + (default 5 when generating, unbounded when matching)')
+    command.add_argument('-n', '--max', type=int, default=10, help='sequences to print (default 10)')
+    command.add_argument('--length', type=int, help='only sequences of this length')
+    command.add_argument('--count', action='store_true', help='print the number of sequences')
+    command.add_argument('--sample', type=int, metavar='K', help='print K uniformly sampled sequences')
+    command.add_argument('--seed', type=int, help='random seed for --sample')
+    _add_words(command, 'matches')
+    command.set_defaults(run=regex)
+    return arguments
+
+
+def main(argv=None):
+    options = arguments().parse_args(argv)
+    try:
+        options.run(options)
+    except BrokenPipeError:
+        return 0
+    except (ImportError, ValueError, SyntaxError, KeyError, OSError) as error:
+        print(f'lfa {options.command}: {type(error).__name__}: {error}', file=sys.stderr)
+        return 1
+    return 0
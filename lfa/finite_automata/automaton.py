@@ -0,0 +1,227 @@
+from collections import deque
+
+from .. import instrumentation
+
+
+EPSILON = 'ε'
+
+
+def _targets(next_states):
+    return [next_states] if isinstance(next_states, str) else next_states
+
+
+def _transitions(automaton):
+    return sum(len(_targets(next_states)) for transitions in automaton.transition_function.values()
+               for next_states in transitions.values())
+
+
+def _dot_quote(text):
+    return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class FiniteAutomaton:
+    # Assigning any of these drops the cached determinism check and matcher;
+    # code that edits them in place calls invalidate() instead.
+    _DEFINITION = frozenset(('states', 'alphabet', 'transition_function', 'start', 'accept'))
+
+    def __init__(self, states, alphabet, transition_function, start, accept):
+        self.states = states
+        self.alphabet = alphabet
+        self.transition_function = transition_function
+        self.start = start
+        self.accept = accept
+
+    def __setattr__(self, name, value):
+        if name in self._DEFINITION:
+            self.invalidate()
+        object.__setattr__(self, name, value)
+
+    def invalidate(self):
+        self.__dict__.pop('_deterministic', None)
+        self.__dict__.pop('_matcher', None)
+
+    def string_belong_to_language(self, word):
+        started = instrumentation.start()
+        if self.is_deterministic():
+            accepted = self._follow(word)
+        else:
+            accepted = self.matcher().match(word)
+        if started is not None:
+            instrumentation.record('FiniteAutomaton.string_belong_to_language', started, words=1, chars=len(word))
+        return accepted
+
+    def _follow(self, word):
+        current_state = self.start
+        for char in word:
+            transitions = self.transition_function.get(current_state, {})
+            if char in transitions and _targets(transitions[char]):
+                current_state = _targets(transitions[char])[0]
+            else:
+                return False
+        return current_state in self.accept
+
+    def compile(self, cache=None):
+        # With an artifact_cache.ArtifactCache the minimal DFA table is
+        # loaded from (or saved to) its directory.
+        if cache is not None:
+            return cache.dfa_table(self)
+        from .dfa_table import DFATable
+        return DFATable(self)
+
+    def simulate(self):
+        from .nfa_simulation import NFASimulator
+        return NFASimulator(self)
+
+    def matcher(self):
+        matcher = self.__dict__.get('_matcher')
+        if matcher is None:
+            matcher = self._matcher = self.compile() if self.is_deterministic() else self.simulate()
+        return matcher
+
+    def match_many(self, words):
+        started = instrumentation.start()
+        results = self.matcher().match_many(words)
+        if started is not None:
+            instrumentation.record('FiniteAutomaton.match_many', started, words=len(results))
+        return results
+
+    def to_regular_grammar(self):
+        from .grammar import Grammar
+        vn = [state for state in self.states if state != 'X']
+        vt = self.alphabet  
+        p = {state: [] for state in vn}  
+        s = self.start
+
+        for state, transitions in self.transition_function.items():
+            p[state] = []
+            for input_symbol, next_states in transitions.items():
+                for next_state in next_states:
+                    if next_state in self.accept:
+                        p[state].append(input_symbol + next_state)
+                        p[state].append(input_symbol)
+                    else:
+                        p[state].append(input_symbol + next_state)
+
+        return Grammar(vn, vt, p, s)
+
+    def is_deterministic(self):
+        deterministic = self.__dict__.get('_deterministic')
+        if deterministic is None:
+            deterministic = self._deterministic = all(
+                symbol != EPSILON and len(_targets(next_states)) <= 1
+                for transitions in self.transition_function.values()
+                for symbol, next_states in transitions.items())
+        return deterministic
+
+    def to_dfa(self, max_states=None, compact_names=False, members=None):
+        from .subset_construction import determinize
+        started = instrumentation.start()
+        dfa = determinize(self, max_states, compact_names, members)
+        if started is not None:
+            instrumentation.record('FiniteAutomaton.to_dfa', started, nfa_states=len(self.states),
+                                   states=len(dfa.states), transitions=_transitions(dfa))
+        return dfa
+
+    def minimize(self, complete=False, compact_names=False):
+        from .minimization import minimize
+        started = instrumentation.start()
+        minimal = minimize(self, complete, compact_names)
+        if started is not None:
+            instrumentation.record('FiniteAutomaton.minimize', started, input_states=len(self.states),
+                                   states=len(minimal.states), transitions=_transitions(minimal))
+        return minimal
+
+    def lazy_matcher(self, cache_size=4096, eviction='flush'):
+        from .lazy_dfa import LazyDFA
+        return LazyDFA(self, cache_size, eviction)
+
+    def intersection(self, other, max_states=None, compact_names=False):
+        from .product import intersection
+        return intersection(self, other, max_states, compact_names)
+
+    def union(self, other, max_states=None, compact_names=False):
+        from .product import union
+        return union(self, other, max_states, compact_names)
+
+    def difference(self, other, max_states=None, compact_names=False):
+        from .product import difference
+        return difference(self, other, max_states, compact_names)
+
+    def inclusion_counterexample(self, other):
+        from .product import inclusion_counterexample
+        return inclusion_counterexample(self, other)
+
+    def equivalence_counterexample(self, other):
+        from .product import equivalence_counterexample
+        return equivalence_counterexample(self, other)
+
+    def is_subset(self, other):
+        return self.inclusion_counterexample(other) is None
+
+    def is_equivalent(self, other):
+        from .product import hopcroft_karp
+        return hopcroft_karp(self, other)
+
+    def visualize(self, filename='finite_automaton'):
+        from graphviz import Digraph
+        dot = Digraph()
+
+        for state in self.states:
+            if state in self.accept:
+                dot.node(state, shape='doublecircle')
+            else:
+                dot.node(state, shape='circle')
+
+        dot.node('', shape='none')
+        dot.edge('', self.start)
+
+        for state, transitions in self.transition_function.items():
+            for symbol, next_states in transitions.items():
+                for next_state in next_states:
+                    dot.edge(state, next_state, label=symbol)
+        dot.render(filename, format='png', cleanup=True)
+
+    def neighbourhood(self, state=None, radius=None, max_states=None):
+        start = self.start if state is None else state
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if radius is not None and distances[current] >= radius:
+                continue
+            for next_states in self.transition_function.get(current, {}).values():
+                for next_state in _targets(next_states):
+                    if next_state not in distances:
+                        if max_states is not None and len(distances) >= max_states:
+                            return list(distances)
+                        distances[next_state] = distances[current] + 1
+                        queue.append(next_state)
+        return list(distances)
+
+    def write_dot(self, filename, around=None, radius=None, max_states=None):
+        if around is None and radius is None and max_states is None:
+            states = self.states
+        else:
+            states = self.neighbourhood(around, radius, max_states)
+        selected = set(states)
+        accept = set(self.accept)
+
+        with open(filename, 'w', encoding='utf-8') as dot:
+            dot.write('digraph {\n')
+            for state in states:
+                shape = 'doublecircle' if state in accept else 'circle'
+                dot.write(f'\t{_dot_quote(state)} [shape={shape}]\n')
+            if self.start in selected:
+                dot.write(f'\t"" [shape=none]\n\t"" -> {_dot_quote(self.start)}\n')
+            for state in states:
+                labels = {}
+                for symbol, next_states in self.transition_function.get(state, {}).items():
+                    for next_state in _targets(next_states):
+                        if next_state in selected:
+                            labels.setdefault(next_state, []).append(symbol)
+                for next_state, symbols in labels.items():
+                    dot.write(f'\t{_dot_quote(state)} -> {_dot_quote(next_state)} [label={_dot_quote(",".join(symbols))}]\n')
+            if len(states) < len(self.states):
+                dot.write(f'\t// showing {len(states)} of {len(self.states)} states\n')
+            dot.write('}\n')
+        return len(states)
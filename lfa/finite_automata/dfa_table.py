@@ -0,0 +1,115 @@
+from array import array
+
+
+DEAD = 0
+# Smaller batches are matched word by word, importing numpy would cost
+# more than it saves.
+NUMPY_BATCH = 64
+
+# numpy is optional and slow to import, it is loaded by the first batch
+# match; False once it turned out to be missing.
+numpy = None
+
+
+def _import_numpy():
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+    return numpy
+
+
+class DFATable:
+    def __init__(self, automaton):
+        if not automaton.is_deterministic():
+            raise ValueError("DFATable needs a deterministic automaton, call to_dfa() first")
+        from .automaton import _targets
+
+        states = list(dict.fromkeys(automaton.states))
+        known = set(states)
+        for state, transitions in automaton.transition_function.items():
+            for candidate in [state] + [target for next_states in transitions.values() for target in _targets(next_states)]:
+                if candidate not in known:
+                    known.add(candidate)
+                    states.append(candidate)
+        # State 0 is the dead state; the two extra columns are the padding
+        # symbol (stay in place) and any character outside the alphabet.
+        self.states = [None] + states
+        self.state_ids = {state: index for index, state in enumerate(self.states) if index}
+        self.alphabet = list(automaton.alphabet)
+        self.symbol_ids = {symbol: index for index, symbol in enumerate(self.alphabet)}
+        self.pad = len(self.alphabet)
+        self.unknown = self.pad + 1
+        self.width = self.pad + 2
+
+        width = self.width
+        self.table = array('i', [DEAD]) * (len(self.states) * width)
+        for state, index in self.state_ids.items():
+            self.table[index * width + self.pad] = index
+        for state, transitions in automaton.transition_function.items():
+            row = self.state_ids[state] * width
+            for symbol, next_states in transitions.items():
+                targets = _targets(next_states)
+                if symbol in self.symbol_ids and targets:
+                    self.table[row + self.symbol_ids[symbol]] = self.state_ids[targets[0]]
+
+        self.start = self.state_ids.get(automaton.start, DEAD)
+        self.accepting = bytearray(len(self.states))
+        for state in automaton.accept:
+            if state in self.state_ids:
+                self.accepting[self.state_ids[state]] = 1
+        self._symbol_lookup = None
+        self._numpy_table = None
+
+    def match(self, word):
+        table, width, symbol_ids = self.table, self.width, self.symbol_ids
+        state = self.start
+        for char in word:
+            symbol = symbol_ids.get(char)
+            if symbol is None:
+                return False
+            state = table[state * width + symbol]
+            if state == DEAD:
+                return False
+        return self.accepting[state] == 1
+
+    def _symbols(self, text):
+        if self._symbol_lookup is None:
+            codes = {ord(symbol): index for symbol, index in self.symbol_ids.items()}
+            self._symbol_lookup = numpy.full(max(max(codes, default=0) + 2, 256), self.unknown, dtype=numpy.uint8)
+            for code, index in codes.items():
+                self._symbol_lookup[code] = index
+            self._latin1_table = self._symbol_lookup[:256].tobytes()
+        try:
+            return numpy.frombuffer(text.encode('latin-1').translate(self._latin1_table), dtype=numpy.uint8)
+        except UnicodeEncodeError:
+            codes = numpy.frombuffer(text.encode('utf-32-le'), dtype=numpy.uint32)
+            return self._symbol_lookup[numpy.minimum(codes, len(self._symbol_lookup) - 1)]
+
+    def encode(self, words):
+        # Symbol ids as a (longest word, len(words)) matrix, one contiguous
+        # row per character position, padded with the stay-in-place symbol.
+        lengths = numpy.fromiter(map(len, words), dtype=numpy.intp, count=len(words))
+        length = int(lengths.max(initial=0))
+        symbols = self._symbols(''.join(words))
+        if len(symbols) == length * len(words):
+            matrix = symbols.reshape(len(words), length)
+        else:
+            matrix = numpy.full((len(words), length), self.pad, dtype=numpy.uint8)
+            matrix[numpy.arange(length) < lengths[:, None]] = symbols
+        return numpy.ascontiguousarray(matrix.T)
+
+    def match_many(self, words):
+        words = list(words)
+        if len(words) < NUMPY_BATCH or not _import_numpy() or self.width > 256 or not all(len(symbol) == 1 for symbol in self.alphabet):
+            return [self.match(word) for word in words]
+        if self._numpy_table is None:
+            self._numpy_table = numpy.frombuffer(self.table, dtype=numpy.int32).astype(numpy.intp)
+            self._numpy_accepting = numpy.frombuffer(bytes(self.accepting), dtype=numpy.uint8).astype(bool)
+        table, width = self._numpy_table, self.width
+        states = numpy.full(len(words), self.start, dtype=numpy.intp)
+        for symbols in self.encode(words):
+            states = table[states * width + symbols]
+        return self._numpy_accepting[states].tolist()
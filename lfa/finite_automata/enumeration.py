@@ -0,0 +1,150 @@
+import bisect
+import itertools
+import random
+import sys
+
+from .dfa_table import DEAD
+
+
+class LanguageEnumerator:
+    def __init__(self, automaton):
+        if not automaton.is_deterministic():
+            automaton = automaton.to_dfa(compact_names=True)
+        self.table = automaton.compile()
+        self.alphabet = self.table.alphabet
+        # counts[length][state]: number of words of that length accepted
+        # from state, grown on demand. The dead state always counts zero.
+        self.counts = [[int(accepting) for accepting in self.table.accepting]]
+        self.counts[0][DEAD] = 0
+        self.longest = self._longest_word()
+
+    def _extend(self, length):
+        table, width = self.table.table, self.table.width
+        symbols = range(len(self.alphabet))
+        states = range(len(self.table.states))
+        while len(self.counts) <= length:
+            previous = self.counts[-1]
+            self.counts.append([sum(previous[table[state * width + symbol]] for symbol in symbols) if state else 0
+                                for state in states])
+
+    def count(self, length):
+        self._extend(length)
+        return self.counts[length][self.table.start]
+
+    def _longest_word(self):
+        # Length of the longest accepted word, -1 for the empty language and
+        # None for an infinite one, which is a cycle through live states:
+        # states reachable from the start that can still reach acceptance.
+        table, width, accepting = self.table.table, self.table.width, self.table.accepting
+        symbols = range(len(self.alphabet))
+        successors = {}
+        stack = [self.table.start] if self.table.start != DEAD else []
+        while stack:
+            state = stack.pop()
+            if state not in successors:
+                successors[state] = {table[state * width + symbol] for symbol in symbols} - {DEAD}
+                stack.extend(successors[state])
+        predecessors = {}
+        for state, targets in successors.items():
+            for target in targets:
+                predecessors.setdefault(target, []).append(state)
+        live = {state for state in successors if accepting[state]}
+        stack = list(live)
+        while stack:
+            for source in predecessors.get(stack.pop(), ()):
+                if source not in live:
+                    live.add(source)
+                    stack.append(source)
+
+        edges = {state: [target for target in successors[state] if target in live] for state in live}
+        indegree = dict.fromkeys(live, 0)
+        for targets in edges.values():
+            for target in targets:
+                indegree[target] += 1
+        order = [state for state, degree in indegree.items() if not degree]
+        for state in order:
+            for target in edges[state]:
+                indegree[target] -= 1
+                if not indegree[target]:
+                    order.append(target)
+        if len(order) < len(live):
+            return None
+        longest = {}
+        for state in reversed(order):
+            longest[state] = max([longest[target] + 1 for target in edges[state]] + ([0] if accepting[state] else []))
+        return longest.get(self.table.start, -1)
+
+    def is_finite(self):
+        return self.longest is not None
+
+    def max_length(self):
+        return self.longest
+
+    def _next(self, state, symbol):
+        return self.table.table[state * self.table.width + symbol]
+
+    def words(self, length):
+        if not self.count(length):
+            return
+        counts, alphabet = self.counts, self.alphabet
+        stack = [(self.table.start, length, '')]
+        while stack:
+            state, remaining, prefix = stack.pop()
+            if not remaining:
+                yield prefix
+                continue
+            for symbol in reversed(range(len(alphabet))):
+                target = self._next(state, symbol)
+                if counts[remaining - 1][target]:
+                    stack.append((target, remaining - 1, prefix + alphabet[symbol]))
+
+    def lengths(self, max_length=None):
+        last = self.max_length()
+        if max_length is not None:
+            last = max_length if last is None else min(last, max_length)
+        return itertools.count() if last is None else range(last + 1)
+
+    def iter_words(self, max_length=None):
+        for length in self.lengths(max_length):
+            yield from self.words(length)
+
+    def unrank(self, rank, length):
+        self._extend(length)
+        state = self.table.start
+        word = []
+        for remaining in range(length, 0, -1):
+            for symbol in range(len(self.alphabet)):
+                target = self._next(state, symbol)
+                count = self.counts[remaining - 1][target]
+                if rank < count:
+                    state = target
+                    word.append(self.alphabet[symbol])
+                    break
+                rank -= count
+        return ''.join(word)
+
+    def sample(self, count, seed=None, max_length=None, min_length=0):
+        # count distinct words drawn uniformly from all words whose length
+        # is in [min_length, max_length], or all of them in enumeration
+        # order when there are no more than count.
+        if max_length is None:
+            max_length = self.max_length()
+            if max_length is None:
+                raise ValueError('Sampling an infinite language needs a max_length')
+        lengths = range(min_length, max_length + 1)
+        totals = list(itertools.accumulate(self.count(length) for length in lengths))
+        total = totals[-1] if totals else 0
+        if total <= count:
+            return [word for length in lengths for word in self.words(length)]
+        rng = random.Random(seed)
+        if total <= sys.maxsize:
+            ranks = rng.sample(range(total), count)
+        else:
+            ranks = {}
+            while len(ranks) < count:
+                ranks[rng.randrange(total)] = None
+        words = []
+        for rank in ranks:
+            position = bisect.bisect_right(totals, rank)
+            words.append(self.unrank(rank - (totals[position - 1] if position else 0), lengths[position]))
+        return words
@@ -0,0 +1,111 @@
+from .. import instrumentation
+
+
+class Grammar:
+    def __init__(self, vn, vt, p, s):
+        self.non_terminals = vn
+        self.terminals = vt
+        self.rules = p
+        self.start_symbol = s
+
+    def language_automaton(self):
+        from .automaton import EPSILON, FiniteAutomaton
+        # Right-linear rules A -> wB and A -> w, with w any run of terminals,
+        # spelled out one symbol per transition; unit and empty rules become
+        # epsilon moves.
+        final = 'X'
+        while final in self.non_terminals:
+            final += "'"
+        states = list(self.non_terminals) + [final]
+        transition_function = {}
+        for non_terminal, productions in self.rules.items():
+            for production in productions:
+                if production and production[-1] in self.non_terminals:
+                    terminals, target = production[:-1], production[-1]
+                else:
+                    terminals, target = production, final
+                if production == EPSILON:
+                    terminals = ''
+                if any(symbol in self.non_terminals for symbol in terminals):
+                    raise ValueError(f"Rule {non_terminal} -> {production} is not right-linear")
+                source = non_terminal
+                for position, symbol in enumerate(terminals[:-1]):
+                    state = f'{non_terminal}{len(states)}'
+                    states.append(state)
+                    transition_function.setdefault(source, {}).setdefault(symbol, []).append(state)
+                    source = state
+                symbol = terminals[-1] if terminals else EPSILON
+                transition_function.setdefault(source, {}).setdefault(symbol, []).append(target)
+        alphabet = list(dict.fromkeys(list(self.terminals) + [symbol for transitions in transition_function.values()
+                                                              for symbol in transitions if symbol != EPSILON]))
+        return FiniteAutomaton(states, alphabet + [EPSILON], transition_function, self.start_symbol, [final])
+
+    def enumerator(self):
+        from .enumeration import LanguageEnumerator
+        return LanguageEnumerator(self.language_automaton())
+
+    def iter_strings(self, max_length=None):
+        return self.enumerator().iter_words(max_length)
+
+    def count_strings(self, length):
+        return self.enumerator().count(length)
+
+    def generate_strings(self, count, seed=None, max_length=None, min_length=0):
+        # Returns fewer than count words only when the language (or its part
+        # between min_length and max_length) has fewer than count words in
+        # total. Infinite languages need a max_length.
+        started = instrumentation.start()
+        enumerator = self.enumerator()
+        words = enumerator.sample(count, seed, max_length, min_length)
+        if started is not None:
+            instrumentation.record('Grammar.generate_strings', started, words=len(words),
+                                   dfa_states=len(enumerator.table.states), lengths=len(enumerator.counts))
+        return words
+
+    def to_finite_automaton(self):
+        from .automaton import FiniteAutomaton
+        started = instrumentation.start()
+        states = self.non_terminals + ['X']
+        alphabet = self.terminals
+        transition_function = {'X': {}}
+        start = self.start_symbol
+        accept = ['X']
+
+        for non_terminal in self.non_terminals:
+            transition_function[non_terminal] = {}
+            for production in self.rules[non_terminal]:
+                if len(production) == 1:
+                    transition_function[non_terminal][production] = 'X'
+                elif len(production) == 2:
+                    transition_function[non_terminal][production[0]] = production[1]
+
+        if started is not None:
+            instrumentation.record('Grammar.to_finite_automaton', started, states=len(states),
+                                   transitions=sum(map(len, transition_function.values())))
+        return FiniteAutomaton(states, alphabet, transition_function, start, accept)
+
+    def classify(self):
+        is_regular = True
+        is_context_free = True
+        is_context_sensitive = True
+
+        for lhs, rhs_list in self.rules.items():
+            for rhs in rhs_list:
+                if not (len(rhs) == 1 and rhs in self.terminals) and not \
+                        (len(rhs) == 2 and ((rhs[0] in self.terminals and rhs[1] in self.non_terminals) or
+                                            (rhs[0] in self.non_terminals and rhs[1] in self.terminals))):
+                    is_regular = False
+                if lhs not in self.non_terminals:
+                    is_context_free = False
+                if len(rhs) < len(lhs):
+                    is_context_sensitive = False
+
+        if is_regular:
+            return "Type 3 (Regular)"
+        elif is_context_free:
+            return "Type 2 (Context-free)"
+        elif is_context_sensitive:
+            return "Type 1 (Context-sensitive)"
+        else:
+            return "Type 0 (Recursively enumerable)"
+
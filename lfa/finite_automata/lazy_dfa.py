@@ -0,0 +1,82 @@
+from .subset_construction import NFAIndex
+
+
+# Fields of a cached DFA state record.
+MASK, ACCEPTING, TRANSITIONS, ALIVE, USED = range(5)
+
+
+class LazyDFA:
+    def __init__(self, automaton, cache_size=4096, eviction='flush'):
+        if eviction not in ('flush', 'lru'):
+            raise ValueError("eviction must be 'flush' or 'lru'")
+        if cache_size < 2:
+            raise ValueError("cache_size must allow at least two states")
+        self.index = NFAIndex(automaton)
+        self.cache_size = cache_size
+        self.eviction = eviction
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.evictions = 0
+        self._states = {}
+        self._tick = 0
+
+    def _state(self, mask):
+        state = self._states.get(mask)
+        if state is None:
+            if len(self._states) >= self.cache_size:
+                self._make_room()
+            state = [mask, bool(mask & self.index.accept), [None] * len(self.index.alphabet), True, self._tick]
+            self._states[mask] = state
+        return state
+
+    def _make_room(self):
+        if self.eviction == 'flush':
+            victims = list(self._states.values())
+            self.flushes += 1
+        else:
+            # Drop the least recently used quarter in one go so the sort is
+            # paid for once per cache_size / 4 misses.
+            victims = sorted(self._states.values(), key=lambda state: state[USED])[:max(1, self.cache_size // 4)]
+            self.evictions += len(victims)
+        for state in victims:
+            state[ALIVE] = False
+            state[TRANSITIONS] = None
+            del self._states[state[MASK]]
+
+    def match(self, word):
+        symbol_ids = self.index.symbol_ids
+        step = self.index.step
+        track = self.eviction == 'lru'
+        state = self._state(self.index.start)
+        for char in word:
+            symbol = symbol_ids.get(char)
+            if symbol is None:
+                return False
+            following = state[TRANSITIONS][symbol]
+            if following is not None and following[ALIVE]:
+                self.hits += 1
+            else:
+                self.misses += 1
+                mask = step(state[MASK], symbol)
+                following = self._state(mask)
+                if not state[ALIVE]:
+                    # The cache was flushed while making room; start over
+                    # from a fresh copy of the current state.
+                    state = self._state(state[MASK])
+                    following = self._state(mask)
+                state[TRANSITIONS][symbol] = following
+            state = following
+            if track:
+                self._tick += 1
+                state[USED] = self._tick
+            if not state[MASK]:
+                return False
+        return state[ACCEPTING]
+
+    def match_many(self, words):
+        return [self.match(word) for word in words]
+
+    def stats(self):
+        return {'states': len(self._states), 'hits': self.hits, 'misses': self.misses,
+                'flushes': self.flushes, 'evictions': self.evictions}
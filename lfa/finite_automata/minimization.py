@@ -0,0 +1,185 @@
+import random
+import time
+from collections import deque
+
+from .automaton import FiniteAutomaton, _targets
+
+
+DEAD_STATE = 'dead'
+
+
+def _complete_dfa(automaton):
+    # Reachable part of a DFA as integer states, with a sink (the last
+    # state) added so that every state has a move on every symbol.
+    alphabet = list(automaton.alphabet)
+    names = [automaton.start]
+    ids = {automaton.start: 0}
+    rows = []
+    queue = deque([automaton.start])
+    while queue:
+        state = queue.popleft()
+        transitions = automaton.transition_function.get(state, {})
+        row = []
+        for symbol in alphabet:
+            targets = _targets(transitions.get(symbol, []))
+            if not targets:
+                row.append(-1)
+                continue
+            target = targets[0]
+            if target not in ids:
+                ids[target] = len(names)
+                names.append(target)
+                queue.append(target)
+            row.append(ids[target])
+        rows.append(row)
+
+    sink = len(names)
+    rows = [[sink if target < 0 else target for target in row] for row in rows]
+    rows.append([sink] * len(alphabet))
+    accept = set(automaton.accept)
+    accepting = [name in accept for name in names] + [False]
+    return names, alphabet, rows, accepting
+
+
+def hopcroft(rows, accepting, symbols):
+    states = range(len(rows))
+    inverse = [[[] for _ in states] for _ in range(symbols)]
+    for state, row in enumerate(rows):
+        for symbol, target in enumerate(row):
+            inverse[symbol][target].append(state)
+
+    finals = [state for state in states if accepting[state]]
+    others = [state for state in states if not accepting[state]]
+    blocks = [set(block) for block in (finals, others) if block]
+    block_of = [0] * len(rows)
+    for index, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = index
+    waiting = set(range(len(blocks))) if len(blocks) == 1 else {min(range(2), key=lambda index: len(blocks[index]))}
+
+    while waiting:
+        splitter = list(blocks[waiting.pop()])
+        for symbol in range(symbols):
+            predecessors = inverse[symbol]
+            touched = {}
+            for target in splitter:
+                for state in predecessors[target]:
+                    touched.setdefault(block_of[state], set()).add(state)
+            for index, inside in touched.items():
+                block = blocks[index]
+                if len(inside) == len(block):
+                    continue
+                block -= inside
+                new_index = len(blocks)
+                blocks.append(inside)
+                for state in inside:
+                    block_of[state] = new_index
+                if index in waiting or len(inside) <= len(block):
+                    waiting.add(new_index)
+                else:
+                    waiting.add(index)
+    return blocks, block_of
+
+
+def minimize(automaton, complete=False, compact_names=False):
+    if not automaton.is_deterministic():
+        automaton = automaton.to_dfa()
+    names, alphabet, rows, accepting = _complete_dfa(automaton)
+    sink = len(rows) - 1
+    blocks, block_of = hopcroft(rows, accepting, len(alphabet))
+
+    # A block is dead when it cannot reach an accepting state; it is kept
+    # as a single sink only when a total transition function is asked for.
+    live = {block_of[state] for state in range(len(rows)) if accepting[state]}
+    predecessors = {}
+    for state, row in enumerate(rows):
+        for target in row:
+            predecessors.setdefault(block_of[target], set()).add(block_of[state])
+    queue = deque(live)
+    while queue:
+        for block in predecessors.get(queue.popleft(), ()):
+            if block not in live:
+                live.add(block)
+                queue.append(block)
+
+    order = []
+    seen = set()
+    queue = deque([block_of[0]])
+    while queue:
+        block = queue.popleft()
+        if block in seen or (block not in live and not complete):
+            continue
+        seen.add(block)
+        order.append(block)
+        representative = min(blocks[block])
+        queue.extend(block_of[target] for target in rows[representative])
+
+    block_names = {}
+    for position, block in enumerate(order):
+        representative = min(blocks[block])
+        if compact_names:
+            block_names[block] = str(position)
+        elif block not in live:
+            block_names[block] = DEAD_STATE
+        else:
+            block_names[block] = names[representative] if representative != sink else DEAD_STATE
+
+    transition_function = {}
+    for block in order:
+        representative = min(blocks[block])
+        transitions = {}
+        for symbol, target in zip(alphabet, rows[representative]):
+            if block_of[target] in block_names:
+                transitions[symbol] = [block_names[block_of[target]]]
+        if transitions:
+            transition_function[block_names[block]] = transitions
+    states = [block_names[block] for block in order]
+    accept = [block_names[block] for block in order if accepting[min(blocks[block])]]
+    if not states:
+        states = [DEAD_STATE]
+    return FiniteAutomaton(states, alphabet, transition_function, states[0], accept)
+
+
+def random_nfa(size, alphabet=('a', 'b'), density=1.5, accepting=0.25, seed=None):
+    rng = random.Random(seed)
+    states = [f'q{index}' for index in range(size)]
+    transition_function = {}
+    for state in states:
+        transition_function[state] = {}
+        for symbol in alphabet:
+            count = min(size, int(rng.expovariate(1 / density)))
+            if count:
+                transition_function[state][symbol] = rng.sample(states, count)
+    accept = rng.sample(states, max(1, int(size * accepting)))
+    return FiniteAutomaton(states, list(alphabet), transition_function, states[0], accept)
+
+
+def benchmark_minimize(sizes=(50, 100, 200), seeds=range(3), words=20000, length=16):
+    results = []
+    for size in sizes:
+        for seed in seeds:
+            nfa = random_nfa(size, density=2.5, seed=seed)
+            try:
+                dfa = nfa.to_dfa(max_states=50000, compact_names=True)
+            except ValueError:
+                continue
+            start = time.perf_counter()
+            minimal = dfa.minimize()
+            minimize_time = time.perf_counter() - start
+
+            rng = random.Random(seed)
+            sample = [''.join(rng.choice(dfa.alphabet) for _ in range(length)) for _ in range(words)]
+            timings = []
+            for automaton in (dfa, minimal):
+                start = time.perf_counter()
+                table = automaton.compile()
+                matches = [table.match(word) for word in sample]
+                timings.append(time.perf_counter() - start)
+            results.append((size, seed, len(dfa.states), len(minimal.states), minimize_time, *timings))
+            print(f'NFA {size:>4}  DFA {len(dfa.states):>6}  minimal {len(minimal.states):>6}  '
+                  f'minimize {minimize_time:6.3f} s  compile+match {timings[0]:6.3f} s -> {timings[1]:6.3f} s')
+    return results
+
+
+if __name__ == '__main__':
+    benchmark_minimize()
@@ -0,0 +1,50 @@
+from .subset_construction import NFAIndex
+
+
+class NFASimulator:
+    def __init__(self, automaton):
+        index = self.index = NFAIndex(automaton)
+        # With at most eight states a whole state set is one byte and a step
+        # is a single table lookup.
+        self._small = None
+        if index.width == 1:
+            tables = [index.table(symbol, 0) for symbol in range(len(index.alphabet))]
+            if None not in tables:
+                self._small = tables
+
+    def match(self, word):
+        index = self.index
+        symbol_ids = index.symbol_ids
+        mask = index.start
+        if self._small is not None:
+            tables = self._small
+            for char in word:
+                symbol = symbol_ids.get(char)
+                if symbol is None:
+                    return False
+                mask = tables[symbol][mask]
+                if not mask:
+                    return False
+        else:
+            step = index.step
+            for char in word:
+                symbol = symbol_ids.get(char)
+                if symbol is None:
+                    return False
+                mask = step(mask, symbol)
+                if not mask:
+                    return False
+        return bool(mask & index.accept)
+
+    def match_many(self, words):
+        return [self.match(word) for word in words]
+
+    def active_states(self, word):
+        index = self.index
+        mask = index.start
+        for char in word:
+            symbol = index.symbol_ids.get(char)
+            if symbol is None or not mask:
+                return []
+            mask = index.step(mask, symbol)
+        return index.names(mask)
@@ -0,0 +1,160 @@
+from collections import deque
+
+from .automaton import EPSILON, FiniteAutomaton
+from .subset_construction import NFAIndex
+
+
+def _alphabet(left, right):
+    return list(dict.fromkeys(symbol for symbol in list(left.alphabet) + list(right.alphabet) if symbol != EPSILON))
+
+
+class _Side:
+    # One operand of a product, determinized on the fly: a state is the
+    # mask of NFA states it stands for and 0 is the dead state.
+    def __init__(self, automaton, alphabet):
+        self.index = NFAIndex(automaton)
+        self.symbols = [self.index.symbol_ids.get(symbol) for symbol in alphabet]
+
+    def step(self, mask, symbol):
+        symbol = self.symbols[symbol]
+        if symbol is None or not mask:
+            return 0
+        return self.index.step(mask, symbol)
+
+    def accepts(self, mask):
+        return bool(mask & self.index.accept)
+
+    def name(self, mask):
+        return '_'.join(sorted(self.index.names(mask))) or 'empty'
+
+
+def _operands(left, right):
+    alphabet = _alphabet(left, right)
+    return alphabet, _Side(left, alphabet), _Side(right, alphabet)
+
+
+def _pruned(accept):
+    # A side that is dead stays dead, so a pair is worth exploring only if
+    # accept can still become true with that side rejecting.
+    left_dead = accept(False, True) or accept(False, False)
+    right_dead = accept(True, False) or accept(False, False)
+    return lambda pair: not any(pair) or (not pair[0] and not left_dead) or (not pair[1] and not right_dead)
+
+
+def _search(left, right, accept):
+    # Breadth-first walk of the reachable product until a pair satisfies
+    # accept; the first one found is reached by a shortest word.
+    alphabet, first, second = _operands(left, right)
+    pruned = _pruned(accept)
+    start = (first.index.start, second.index.start)
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        pair = queue.popleft()
+        if accept(first.accepts(pair[0]), second.accepts(pair[1])):
+            word = []
+            while parents[pair] is not None:
+                pair, symbol = parents[pair]
+                word.append(alphabet[symbol])
+            return ''.join(reversed(word))
+        for symbol in range(len(alphabet)):
+            target = (first.step(pair[0], symbol), second.step(pair[1], symbol))
+            if target not in parents and not pruned(target):
+                parents[target] = (pair, symbol)
+                queue.append(target)
+    return None
+
+
+def product(left, right, accept, max_states=None, compact_names=False):
+    alphabet, first, second = _operands(left, right)
+    pruned = _pruned(accept)
+    start = (first.index.start, second.index.start)
+    pairs = [start]
+    ids = {start: 0}
+    transitions = []
+    position = 0
+    while position < len(pairs):
+        pair = pairs[position]
+        row = {}
+        for symbol in range(len(alphabet)):
+            target = (first.step(pair[0], symbol), second.step(pair[1], symbol))
+            if pruned(target):
+                continue
+            target_id = ids.get(target)
+            if target_id is None:
+                if max_states is not None and len(pairs) >= max_states:
+                    raise ValueError(f"Product exceeded the budget of {max_states} states")
+                target_id = ids[target] = len(pairs)
+                pairs.append(target)
+            row[alphabet[symbol]] = target_id
+        transitions.append(row)
+        position += 1
+
+    if compact_names:
+        names = [str(pair_id) for pair_id in range(len(pairs))]
+    else:
+        names = [f'{first.name(left_mask)}|{second.name(right_mask)}' for left_mask, right_mask in pairs]
+    transition_function = {names[source]: {symbol: [names[target]] for symbol, target in row.items()}
+                           for source, row in enumerate(transitions) if row}
+    accepting = [names[pair_id] for pair_id, (left_mask, right_mask) in enumerate(pairs)
+                 if accept(first.accepts(left_mask), second.accepts(right_mask))]
+    return FiniteAutomaton(names, alphabet, transition_function, names[0], accepting)
+
+
+def intersection(left, right, max_states=None, compact_names=False):
+    return product(left, right, lambda a, b: a and b, max_states, compact_names)
+
+
+def union(left, right, max_states=None, compact_names=False):
+    return product(left, right, lambda a, b: a or b, max_states, compact_names)
+
+
+def difference(left, right, max_states=None, compact_names=False):
+    return product(left, right, lambda a, b: a and not b, max_states, compact_names)
+
+
+def inclusion_counterexample(left, right):
+    return _search(left, right, lambda a, b: a and not b)
+
+
+def _find(parents, key):
+    root = key
+    while parents.setdefault(root, root) != root:
+        root = parents[root]
+    while parents[key] != root:
+        parents[key], key = root, parents[key]
+    return root
+
+
+def hopcroft_karp(left, right):
+    # Union-find over the states of both subset automata: pairs that are
+    # already known equivalent by transitivity are never expanded, so equal
+    # languages are confirmed after at most |left| + |right| merges.
+    alphabet, first, second = _operands(left, right)
+    parents = {}
+    start = ((0, first.index.start), (1, second.index.start))
+    if first.accepts(start[0][1]) != second.accepts(start[1][1]):
+        return False
+    parents[_find(parents, start[0])] = _find(parents, start[1])
+    queue = deque([start])
+    while queue:
+        left_key, right_key = queue.popleft()
+        for symbol in range(len(alphabet)):
+            left_target = (0, first.step(left_key[1], symbol))
+            right_target = (1, second.step(right_key[1], symbol))
+            left_root, right_root = _find(parents, left_target), _find(parents, right_target)
+            if left_root == right_root:
+                continue
+            if first.accepts(left_target[1]) != second.accepts(right_target[1]):
+                return False
+            parents[left_root] = right_root
+            queue.append((left_target, right_target))
+    return True
+
+
+def equivalence_counterexample(left, right):
+    # Hopcroft-Karp settles the common case of equal languages quickly; the
+    # shortest witness is only searched for once they are known to differ.
+    if hopcroft_karp(left, right):
+        return None
+    return _search(left, right, lambda a, b: a != b)
@@ -0,0 +1,147 @@
+from .automaton import EPSILON, FiniteAutomaton, _targets
+
+
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class NFAIndex:
+    TABLE_BYTES = 64 << 20
+
+    def __init__(self, automaton):
+        states = list(dict.fromkeys(automaton.states))
+        known = set(states)
+        for state, transitions in automaton.transition_function.items():
+            for candidate in [state] + [target for next_states in transitions.values() for target in _targets(next_states)]:
+                if candidate not in known:
+                    known.add(candidate)
+                    states.append(candidate)
+        if automaton.start not in known:
+            states.append(automaton.start)
+        self.states = states
+        self.state_ids = {state: index for index, state in enumerate(states)}
+        self.alphabet = [symbol for symbol in automaton.alphabet if symbol != EPSILON]
+        self.symbol_ids = {symbol: index for index, symbol in enumerate(self.alphabet)}
+
+        epsilon = [0] * len(states)
+        moves = [[0] * len(states) for _ in self.alphabet]
+        for state, transitions in automaton.transition_function.items():
+            source = self.state_ids[state]
+            for symbol, next_states in transitions.items():
+                mask = 0
+                for target in _targets(next_states):
+                    mask |= 1 << self.state_ids[target]
+                if symbol == EPSILON:
+                    epsilon[source] |= mask
+                elif symbol in self.symbol_ids:
+                    moves[self.symbol_ids[symbol]][source] |= mask
+
+        self.closures = [self._closure(1 << state, epsilon) for state in range(len(states))]
+        # Moves land on already closed sets, so a step is a plain OR. It is
+        # done a byte at a time: tables[symbol][chunk][byte] holds the union
+        # of the moves of the (up to) eight states that byte selects. All of
+        # them together grow with the square of the state count, so a table
+        # is only built the first time its chunk is stepped through, and
+        # once TABLE_BYTES worth exist the remaining chunks OR the moves of
+        # their member states instead.
+        self.moves = [[self.close(mask) for mask in row] for row in moves]
+        self.width = (len(states) + 7) // 8
+        self.tables = [[None] * self.width for _ in self.moves]
+        self._spare_tables = self.TABLE_BYTES // (256 * (32 + self.width))
+        self.start = self.closures[self.state_ids[automaton.start]]
+        self.accept = 0
+        for state in automaton.accept:
+            if state in self.state_ids:
+                self.accept |= 1 << self.state_ids[state]
+
+    def table(self, symbol, chunk):
+        table = self.tables[symbol][chunk]
+        if table is None:
+            if not self._spare_tables:
+                return None
+            self._spare_tables -= 1
+            row = self.moves[symbol]
+            table = [0] * 256
+            for byte in range(1, 256):
+                low = byte & -byte
+                state = chunk * 8 + low.bit_length() - 1
+                table[byte] = table[byte ^ low] | (row[state] if state < len(row) else 0)
+            self.tables[symbol][chunk] = table
+        return table
+
+    @staticmethod
+    def _closure(mask, epsilon):
+        pending = mask
+        while pending:
+            low = pending & -pending
+            pending ^= low
+            new = epsilon[low.bit_length() - 1] & ~mask
+            mask |= new
+            pending |= new
+        return mask
+
+    def close(self, mask):
+        closures = self.closures
+        result = mask
+        for state in iter_bits(mask):
+            result |= closures[state]
+        return result
+
+    def step(self, mask, symbol):
+        result = 0
+        tables = self.tables[symbol]
+        for chunk, byte in enumerate(mask.to_bytes(self.width, 'little')):
+            if byte:
+                table = tables[chunk] or self.table(symbol, chunk)
+                if table is not None:
+                    result |= table[byte]
+                    continue
+                row = self.moves[symbol]
+                while byte:
+                    low = byte & -byte
+                    result |= row[chunk * 8 + low.bit_length() - 1]
+                    byte ^= low
+        return result
+
+    def names(self, mask):
+        return [self.states[state] for state in iter_bits(mask)]
+
+
+def determinize(automaton, max_states=None, compact_names=False, members=None):
+    # members, when given a dict, receives the NFA states of each DFA state
+    # by name, whichever naming is used.
+    index = NFAIndex(automaton)
+    subsets = [index.start]
+    ids = {index.start: 0}
+    transitions = []
+    position = 0
+    while position < len(subsets):
+        mask = subsets[position]
+        row = {}
+        for symbol_id, symbol in enumerate(index.alphabet):
+            target = index.step(mask, symbol_id)
+            if not target:
+                continue
+            target_id = ids.get(target)
+            if target_id is None:
+                if max_states is not None and len(subsets) >= max_states:
+                    raise ValueError(f"Determinization exceeded the budget of {max_states} states")
+                target_id = ids[target] = len(subsets)
+                subsets.append(target)
+            row[symbol] = target_id
+        transitions.append(row)
+        position += 1
+
+    if compact_names:
+        names = [str(subset_id) for subset_id in range(len(subsets))]
+    else:
+        names = ['_'.join(sorted(index.names(mask))) or 'empty' for mask in subsets]
+    transition_function = {names[source]: {symbol: [names[target]] for symbol, target in row.items()}
+                           for source, row in enumerate(transitions) if row}
+    accept = [names[subset_id] for subset_id, mask in enumerate(subsets) if mask & index.accept]
+    if members is not None:
+        members.update((names[subset_id], index.names(mask)) for subset_id, mask in enumerate(subsets))
+    return FiniteAutomaton(names, index.alphabet, transition_function, names[0], accept)
@@ -0,0 +1,58 @@
+import os
+import re
+import tempfile
+import unittest
+
+from .automaton import FiniteAutomaton
+
+
+class TestFiniteAutomaton(unittest.TestCase):
+    def setUp(self):
+        self.automaton = FiniteAutomaton(['q0', 'q1'], ['a', 'b'], {'q0': {'a': ['q1']}, 'q1': {'b': ['q0']}},
+                                         'q0', ['q1'])
+
+    def test_matcher_is_cached(self):
+        self.assertTrue(self.automaton.string_belong_to_language('aba'))
+        self.assertIs(self.automaton.matcher(), self.automaton.matcher())
+
+    def test_assignment_invalidates(self):
+        matcher = self.automaton.matcher()
+        self.automaton.accept = ['q0']
+        self.assertIsNot(self.automaton.matcher(), matcher)
+        self.assertEqual(self.automaton.match_many(['ab', 'a']), [True, False])
+        self.assertTrue(self.automaton.string_belong_to_language('ab'))
+
+        self.automaton.transition_function = {'q0': {'a': ['q0', 'q1']}, 'q1': {'b': ['q0']}}
+        self.assertFalse(self.automaton.is_deterministic())
+        self.assertTrue(self.automaton.string_belong_to_language('aab'))
+
+    def test_in_place_edit_needs_invalidate(self):
+        self.assertTrue(self.automaton.is_deterministic())
+        self.automaton.transition_function['q0']['ε'] = ['q1']
+        self.automaton.invalidate()
+        self.assertFalse(self.automaton.is_deterministic())
+        self.assertTrue(self.automaton.string_belong_to_language('b'))
+
+    def test_write_dot_edges(self):
+        automaton = FiniteAutomaton(['q0', 'q"1', 'q2'], ['a', 'b'],
+                                    {'q0': {'a': ['q"1', 'q2'], 'b': ['q"1']}, 'q"1': {'b': 'q2'}}, 'q0', ['q2'])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'automaton.dot')
+            self.assertEqual(automaton.write_dot(path), 3)
+            with open(path, encoding='utf-8') as dot:
+                text = dot.read()
+            self.assertEqual(automaton.write_dot(path, around='q"1', radius=0), 1)
+            with open(path, encoding='utf-8') as dot:
+                partial = dot.read()
+        quoted = r'"((?:[^"\\]|\\.)*)"'
+        edges = {tuple(part.replace('\\"', '"') for part in edge)
+                 for edge in re.findall(quoted + ' -> ' + quoted + r' \[label="([^"]*)"\]', text)}
+        self.assertEqual(edges, {('q0', 'q"1', 'a,b'), ('q0', 'q2', 'a'), ('q"1', 'q2', 'b')})
+        self.assertIn('"q2" [shape=doublecircle]', text)
+        self.assertIn('"" -> "q0"', text)
+        self.assertNotIn('->', partial)
+        self.assertIn('// showing 1 of 3 states', partial)
+
+
+if __name__ == '__main__':
+    unittest.main()
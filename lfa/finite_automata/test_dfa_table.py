@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from . import dfa_table
+from .automaton import FiniteAutomaton
+from .dfa_table import DFATable, _import_numpy
+
+
+def _random_dfa(size, alphabet, rng):
+    states = [f's{index}' for index in range(size)]
+    transition_function = {state: {symbol: [rng.choice(states)] for symbol in alphabet if rng.random() < 0.8}
+                           for state in states}
+    return FiniteAutomaton(states, list(alphabet), transition_function, states[0], rng.sample(states, size // 3 + 1))
+
+
+class TestDFATable(unittest.TestCase):
+    def words(self, rng, alphabet, count=300):
+        # Unknown characters, including ones outside latin-1, and both
+        # ragged and equal lengths.
+        symbols = list(alphabet) + ['z', 'é', '€']
+        ragged = [''.join(rng.choice(symbols if rng.random() < 0.2 else alphabet) for _ in range(rng.randint(0, 12)))
+                  for _ in range(count)]
+        even = [''.join(rng.choice(alphabet) for _ in range(7)) for _ in range(count)]
+        return ragged, even
+
+    def check(self, use_numpy):
+        saved = dfa_table.numpy
+        if not use_numpy:
+            dfa_table.numpy = False
+        try:
+            rng = random.Random(11)
+            for size in (1, 5, 40):
+                for alphabet in ('ab', 'abcdé'):
+                    automaton = _random_dfa(size, alphabet, rng)
+                    table = DFATable(automaton)
+                    for words in self.words(rng, alphabet):
+                        expected = [automaton.string_belong_to_language(word) for word in words]
+                        self.assertEqual([table.match(word) for word in words], expected)
+                        self.assertEqual(table.match_many(words), expected)
+                    self.assertEqual(table._numpy_table is not None, use_numpy)
+        finally:
+            dfa_table.numpy = saved
+
+    def test_match_many_pure_python(self):
+        self.check(use_numpy=False)
+
+    def test_match_many_numpy(self):
+        # Checked here rather than in a decorator, so that importing this
+        # module still leaves numpy unloaded.
+        if not _import_numpy():
+            self.skipTest('numpy is not installed')
+        self.check(use_numpy=True)
+
+    def test_rejects_nondeterministic(self):
+        with self.assertRaises(ValueError):
+            DFATable(FiniteAutomaton(['q'], ['a'], {'q': {'a': ['q', 'q']}}, 'q', ['q']))
+
+
+if __name__ == '__main__':
+    unittest.main()
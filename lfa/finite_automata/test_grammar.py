@@ -0,0 +1,119 @@
+import random
+import unittest
+
+from .automaton import EPSILON
+from .grammar import Grammar
+
+
+def _reference_language(grammar, length):
+    # Every word of at most length symbols, by rewriting sentential forms
+    # prefix + A directly with the rules.
+    words = set()
+    seen = {('', grammar.start_symbol)}
+    pending = list(seen)
+    while pending:
+        prefix, non_terminal = pending.pop()
+        for production in grammar.rules.get(non_terminal, ()):
+            if production == EPSILON:
+                production = ''
+            if production and production[-1] in grammar.non_terminals:
+                form = (prefix + production[:-1], production[-1])
+                if len(form[0]) <= length and form not in seen:
+                    seen.add(form)
+                    pending.append(form)
+            elif len(prefix + production) <= length:
+                words.add(prefix + production)
+    order = {symbol: position for position, symbol in enumerate(grammar.terminals)}
+    return sorted(words, key=lambda word: (len(word), [order[symbol] for symbol in word]))
+
+
+def _random_right_linear(rng, non_terminals=('S', 'A', 'B'), terminals=('a', 'b')):
+    rules = {}
+    for non_terminal in non_terminals:
+        productions = []
+        for _ in range(rng.randint(1, 3)):
+            production = ''.join(rng.choice(terminals) for _ in range(rng.choice((0, 1, 1, 2))))
+            if rng.random() < 0.6:
+                production += rng.choice(non_terminals)
+            productions.append(production or 'ε')
+        rules[non_terminal] = productions
+    return Grammar(list(non_terminals), list(terminals), rules, 'S')
+
+
+class TestGrammarEnumeration(unittest.TestCase):
+    def test_random_grammars_match_derivations(self):
+        rng = random.Random(41)
+        for _ in range(60):
+            grammar = _random_right_linear(rng)
+            expected = _reference_language(grammar, 7)
+            enumerator = grammar.enumerator()
+            with self.subTest(rules=grammar.rules):
+                self.assertEqual(list(grammar.iter_strings(max_length=7)), expected)
+                for length in range(8):
+                    words = [word for word in expected if len(word) == length]
+                    self.assertEqual(grammar.count_strings(length), len(words))
+                    self.assertEqual([enumerator.unrank(rank, length) for rank in range(len(words))], words)
+
+    def test_generate_strings_samples_distinct_words(self):
+        rng = random.Random(42)
+        for _ in range(40):
+            grammar = _random_right_linear(rng)
+            expected = _reference_language(grammar, 6)
+            for count in (1, 5, 20, 1000):
+                words = grammar.generate_strings(count, seed=rng.random(), max_length=6, min_length=2)
+                in_range = [word for word in expected if len(word) >= 2]
+                self.assertEqual(len(words), len(set(words)))
+                self.assertEqual(len(words), min(count, len(in_range)))
+                self.assertLessEqual(set(words), set(in_range))
+
+    def test_generate_strings_is_uniform_over_lengths(self):
+        # 2 + 4 + 8 + 16 words of lengths 1 to 4; with one word per call a
+        # uniform draw gives each of them the same expected frequency.
+        grammar = Grammar(['S'], ['a', 'b'], {'S': ['aS', 'bS', 'a', 'b']}, 'S')
+        words = _reference_language(grammar, 4)
+        draws = 200 * len(words)
+        frequency = dict.fromkeys(words, 0)
+        for seed in range(draws):
+            frequency[grammar.generate_strings(1, seed=seed, max_length=4)[0]] += 1
+        expected = draws / len(words)
+        chi_square = sum((observed - expected) ** 2 / expected for observed in frequency.values())
+        # 29 degrees of freedom; the 0.999 quantile is 58.3.
+        self.assertLess(chi_square, 58.3)
+        samples = {tuple(sorted(grammar.generate_strings(5, seed=seed, max_length=4))) for seed in range(20)}
+        self.assertGreater(len(samples), 15)
+
+    def test_finite_and_infinite_languages(self):
+        finite = Grammar(['S', 'A'], ['a', 'b'], {'S': ['abA', 'b'], 'A': ['a', 'ε']}, 'S')
+        self.assertTrue(finite.enumerator().is_finite())
+        self.assertEqual(finite.enumerator().max_length(), 3)
+        self.assertEqual(list(finite.iter_strings()), ['b', 'ab', 'aba'])
+        self.assertEqual(finite.generate_strings(10), ['b', 'ab', 'aba'])
+        infinite = Grammar(['S'], ['a'], {'S': ['aS', 'a']}, 'S')
+        self.assertFalse(infinite.enumerator().is_finite())
+        self.assertEqual(infinite.generate_strings(3, seed=0, max_length=3), ['a', 'aa', 'aaa'])
+        self.assertEqual(len(infinite.generate_strings(3, seed=0, max_length=100)), 3)
+        with self.assertRaises(ValueError):
+            infinite.generate_strings(3)
+
+    def test_finiteness_matches_counts(self):
+        # A DFA with n states accepts an infinite language exactly when it
+        # accepts some word whose length is between n and 2n - 1.
+        rng = random.Random(43)
+        for _ in range(100):
+            grammar = _random_right_linear(rng)
+            enumerator = grammar.enumerator()
+            size = len(enumerator.table.states)
+            infinite = any(enumerator.count(length) for length in range(size, 2 * size))
+            with self.subTest(rules=grammar.rules):
+                self.assertEqual(enumerator.is_finite(), not infinite)
+                if not infinite:
+                    longest = max((length for length in range(size) if enumerator.count(length)), default=-1)
+                    self.assertEqual(enumerator.max_length(), longest)
+
+    def test_rejects_rules_that_are_not_right_linear(self):
+        with self.assertRaises(ValueError):
+            Grammar(['S', 'A'], ['a'], {'S': ['Aa'], 'A': ['a']}, 'S').language_automaton()
+
+
+if __name__ == '__main__':
+    unittest.main()
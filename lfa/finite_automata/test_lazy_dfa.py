@@ -0,0 +1,46 @@
+import itertools
+import random
+import unittest
+
+from .lazy_dfa import LazyDFA
+from .test_subset_construction import _random_epsilon_nfa, _reference_accepts
+
+
+class TestLazyDFA(unittest.TestCase):
+    def test_small_caches_match_set_simulation(self):
+        rng = random.Random(23)
+        words = [''.join(word) for size in range(7) for word in itertools.product('abz', repeat=size)]
+        for _ in range(20):
+            nfa = _random_epsilon_nfa(rng.randint(1, 25), rng)
+            expected = [_reference_accepts(nfa, word) for word in words]
+            for eviction in ('flush', 'lru'):
+                for cache_size in (2, 3, 8, 4096):
+                    lazy = LazyDFA(nfa, cache_size=cache_size, eviction=eviction)
+                    with self.subTest(eviction=eviction, cache_size=cache_size):
+                        self.assertEqual(lazy.match_many(words), expected)
+                        self.assertEqual(lazy.match_many(words), expected)
+                        stats = lazy.stats()
+                        self.assertLessEqual(stats['states'], cache_size)
+                        if eviction == 'flush':
+                            self.assertEqual(stats['evictions'], 0)
+                        else:
+                            self.assertEqual(stats['flushes'], 0)
+
+    def test_repeated_words_hit_the_cache(self):
+        nfa = _random_epsilon_nfa(10, random.Random(24))
+        lazy = LazyDFA(nfa)
+        lazy.match('abba')
+        misses = lazy.misses
+        lazy.match('abba')
+        self.assertEqual(lazy.misses, misses)
+
+    def test_invalid_arguments(self):
+        nfa = _random_epsilon_nfa(3, random.Random(25))
+        with self.assertRaises(ValueError):
+            LazyDFA(nfa, eviction='random')
+        with self.assertRaises(ValueError):
+            LazyDFA(nfa, cache_size=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
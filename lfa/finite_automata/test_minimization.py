@@ -0,0 +1,68 @@
+import itertools
+import random
+import unittest
+
+from .automaton import FiniteAutomaton
+from .minimization import DEAD_STATE, _complete_dfa, minimize, random_nfa
+from .test_subset_construction import _random_epsilon_nfa, _reference_accepts
+
+
+def _moore_classes(automaton):
+    # Number of reachable states of the completed DFA left after naive
+    # refinement: split by acceptance, then by the classes of the
+    # successors, until nothing changes.
+    names, alphabet, rows, accepting = _complete_dfa(automaton)
+    reachable = {0}
+    stack = [0]
+    while stack:
+        for target in rows[stack.pop()]:
+            if target not in reachable:
+                reachable.add(target)
+                stack.append(target)
+    classes = {state: accepting[state] for state in reachable}
+    while True:
+        signatures = {state: (classes[state],) + tuple(classes[target] for target in rows[state]) for state in reachable}
+        ids = {signature: index for index, signature in enumerate(dict.fromkeys(signatures.values()))}
+        refined = {state: ids[signatures[state]] for state in reachable}
+        if len(ids) == len(set(classes.values())):
+            return len(ids)
+        classes = refined
+
+
+class TestMinimize(unittest.TestCase):
+    def assertSameLanguage(self, original, minimal, length=7):
+        self.assertTrue(minimal.is_deterministic())
+        for size in range(length + 1):
+            for word in map(''.join, itertools.product('ab', repeat=size)):
+                self.assertEqual(minimal.string_belong_to_language(word), _reference_accepts(original, word), word)
+
+    def test_random_nfas_match_moore_refinement(self):
+        rng = random.Random(21)
+        for _ in range(40):
+            nfa = _random_epsilon_nfa(rng.randint(1, 12), rng)
+            dfa = nfa.to_dfa()
+            complete = minimize(dfa, complete=True)
+            self.assertSameLanguage(nfa, complete)
+            self.assertEqual(len(complete.states), _moore_classes(dfa))
+            self.assertTrue(all(len(complete.transition_function.get(state, {})) == 2 for state in complete.states))
+
+            partial = minimize(dfa, compact_names=True)
+            self.assertSameLanguage(nfa, partial)
+            self.assertIn(len(complete.states) - len(partial.states), (0, 1))
+            if partial.accept:
+                self.assertEqual(partial.states, [str(position) for position in range(len(partial.states))])
+
+    def test_minimal_automaton_is_a_fixed_point(self):
+        rng = random.Random(22)
+        for _ in range(20):
+            minimal = minimize(random_nfa(rng.randint(2, 15), seed=rng.random()), complete=True)
+            self.assertEqual(len(minimize(minimal, complete=True).states), len(minimal.states))
+
+    def test_empty_language(self):
+        automaton = FiniteAutomaton(['p', 'q'], ['a'], {'p': {'a': ['q']}}, 'p', [])
+        self.assertEqual(minimize(automaton).states, [DEAD_STATE])
+        self.assertEqual(minimize(automaton, complete=True).transition_function, {DEAD_STATE: {'a': [DEAD_STATE]}})
+
+
+if __name__ == '__main__':
+    unittest.main()
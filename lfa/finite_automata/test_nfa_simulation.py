@@ -0,0 +1,30 @@
+import itertools
+import random
+import unittest
+
+from .nfa_simulation import NFASimulator
+from .test_subset_construction import _random_epsilon_nfa, _reference_accepts
+
+
+class TestNFASimulator(unittest.TestCase):
+    def test_random_nfas_match_set_simulation(self):
+        rng = random.Random(15)
+        words = [''.join(word) for size in range(7) for word in itertools.product('abc', repeat=size)]
+        # Sizes on both sides of the single byte fast path.
+        for size in (1, 5, 8, 9, 30):
+            nfa = _random_epsilon_nfa(size, rng)
+            simulator = NFASimulator(nfa)
+            self.assertEqual(simulator.match_many(words), [_reference_accepts(nfa, word) for word in words])
+
+    def test_active_states(self):
+        rng = random.Random(16)
+        nfa = _random_epsilon_nfa(10, rng)
+        simulator = NFASimulator(nfa)
+        for word in ('', 'a', 'ab', 'bba'):
+            expected = {state for state in nfa.states if _reference_accepts(
+                type(nfa)(nfa.states, nfa.alphabet, nfa.transition_function, nfa.start, [state]), word)}
+            self.assertEqual(set(simulator.active_states(word)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
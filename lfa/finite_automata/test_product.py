@@ -0,0 +1,70 @@
+import itertools
+import random
+import unittest
+
+from .product import (
+    difference, equivalence_counterexample, hopcroft_karp, inclusion_counterexample, intersection, union,
+)
+from .test_subset_construction import _random_epsilon_nfa, _reference_accepts
+
+
+def _words(alphabet, length):
+    return [''.join(word) for size in range(length + 1) for word in itertools.product(alphabet, repeat=size)]
+
+
+class TestProduct(unittest.TestCase):
+    def pairs(self, seed, count=25):
+        rng = random.Random(seed)
+        for _ in range(count):
+            left = _random_epsilon_nfa(rng.randint(1, 8), rng)
+            right = _random_epsilon_nfa(rng.randint(1, 8), rng, rng.choice((('a', 'b'), ('b', 'c'))))
+            yield left, right
+
+    def test_operations_match_reference(self):
+        operations = [(intersection, lambda a, b: a and b), (union, lambda a, b: a or b),
+                      (difference, lambda a, b: a and not b)]
+        for left, right in self.pairs(31):
+            for operation, expected in operations:
+                for compact_names in (False, True):
+                    result = operation(left, right, compact_names=compact_names)
+                    self.assertTrue(result.is_deterministic())
+                    for word in _words('abc', 5):
+                        self.assertEqual(result.string_belong_to_language(word),
+                                         expected(_reference_accepts(left, word), _reference_accepts(right, word)),
+                                         (operation.__name__, word))
+
+    def test_counterexamples_are_shortest(self):
+        for left, right in self.pairs(32, count=60):
+            words = _words('abc', 6)
+            for found, differs in ((inclusion_counterexample(left, right), lambda a, b: a and not b),
+                                   (equivalence_counterexample(left, right), lambda a, b: a != b)):
+                witnesses = [word for word in words if differs(_reference_accepts(left, word), _reference_accepts(right, word))]
+                if found is None:
+                    self.assertEqual(witnesses, [])
+                else:
+                    self.assertTrue(differs(_reference_accepts(left, found), _reference_accepts(right, found)), found)
+                    if witnesses:
+                        self.assertEqual(len(found), len(witnesses[0]))
+            self.assertEqual(hopcroft_karp(left, right), equivalence_counterexample(left, right) is None)
+
+    def test_equivalent_constructions(self):
+        rng = random.Random(33)
+        for _ in range(20):
+            nfa = _random_epsilon_nfa(rng.randint(1, 10), rng)
+            dfa = nfa.to_dfa()
+            self.assertTrue(hopcroft_karp(nfa, dfa))
+            self.assertTrue(hopcroft_karp(dfa.minimize(), nfa))
+            self.assertIsNone(equivalence_counterexample(union(nfa, nfa), nfa))
+            self.assertTrue(nfa.is_subset(union(nfa, dfa)))
+
+    def test_max_states(self):
+        left, right = next(self.pairs(34))
+        states = len(union(left, right).states)
+        self.assertEqual(len(union(left, right, max_states=states).states), states)
+        if states > 1:
+            with self.assertRaises(ValueError):
+                union(left, right, max_states=states - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import itertools
+import random
+import unittest
+
+from .automaton import EPSILON, FiniteAutomaton, _targets
+from .subset_construction import NFAIndex, determinize, iter_bits
+
+
+def _reference_accepts(automaton, word):
+    def closure(states):
+        stack = list(states)
+        closed = set(states)
+        while stack:
+            for target in _targets(automaton.transition_function.get(stack.pop(), {}).get(EPSILON, [])):
+                if target not in closed:
+                    closed.add(target)
+                    stack.append(target)
+        return closed
+
+    current = closure({automaton.start})
+    for char in word:
+        current = closure({target for state in current
+                           for target in _targets(automaton.transition_function.get(state, {}).get(char, []))})
+    return bool(current & set(automaton.accept))
+
+
+def _random_epsilon_nfa(size, rng, alphabet=('a', 'b')):
+    states = [f'q{index}' for index in range(size)]
+    transition_function = {}
+    for state in states:
+        transition_function[state] = {}
+        for symbol in alphabet + (EPSILON,):
+            targets = rng.sample(states, min(size, rng.choice((0, 0, 1, 2))))
+            if targets:
+                transition_function[state][symbol] = targets
+    return FiniteAutomaton(states, list(alphabet), transition_function, states[0], rng.sample(states, min(size, 2)))
+
+
+class TestDeterminize(unittest.TestCase):
+    def assertSameLanguage(self, nfa, dfa, length=6):
+        self.assertTrue(dfa.is_deterministic())
+        for size in range(length + 1):
+            for word in map(''.join, itertools.product('ab', repeat=size)):
+                self.assertEqual(dfa.string_belong_to_language(word), _reference_accepts(nfa, word), word)
+
+    def test_random_nfas_match_set_simulation(self):
+        rng = random.Random(12)
+        for _ in range(30):
+            nfa = _random_epsilon_nfa(rng.randint(1, 20), rng)
+            self.assertSameLanguage(nfa, determinize(nfa))
+
+    def test_step_without_byte_tables(self):
+        rng = random.Random(13)
+        nfa = _random_epsilon_nfa(40, rng)
+        index = NFAIndex(nfa)
+        index._spare_tables = 1
+        for mask in (index.start, (1 << 40) - 1, rng.getrandbits(40)):
+            for symbol in range(len(index.alphabet)):
+                expected = 0
+                for state in iter_bits(mask):
+                    expected |= index.moves[symbol][state]
+                self.assertEqual(index.step(mask, symbol), expected)
+        self.assertEqual(sum(table is not None for tables in index.tables for table in tables), 1)
+
+    def test_max_states(self):
+        rng = random.Random(14)
+        nfa = _random_epsilon_nfa(12, rng)
+        states = len(determinize(nfa).states)
+        self.assertEqual(len(determinize(nfa, max_states=states).states), states)
+        if states > 1:
+            with self.assertRaises(ValueError):
+                determinize(nfa, max_states=states - 1)
+
+    def test_members(self):
+        rng = random.Random(15)
+        for _ in range(20):
+            nfa = _random_epsilon_nfa(rng.randint(1, 12), rng)
+            named, numbered = {}, {}
+            dfa = determinize(nfa, members=named)
+            compact = determinize(nfa, compact_names=True, members=numbered)
+            self.assertEqual(set(named), set(dfa.states))
+            for state, members in named.items():
+                self.assertEqual('_'.join(sorted(members)) or 'empty', state)
+            self.assertEqual([sorted(numbered[state]) for state in compact.states],
+                             [sorted(named[state]) for state in dfa.states])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import time
+
+
+# Recorders currently listening. Instrumented code calls start() once per
+# stage and only gathers its counters when that returned a timestamp, so
+# with nothing listening a stage costs one call and one list check.
+_recorders = []
+
+
+def enabled():
+    return bool(_recorders)
+
+
+def start():
+    return time.perf_counter() if _recorders else None
+
+
+def record(stage, started, **counters):
+    seconds = time.perf_counter() - started
+    for recorder in list(_recorders):
+        recorder.add(stage, seconds, counters)
+
+
+class Recorder:
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stages = {}
+
+    def start(self):
+        if self not in _recorders:
+            _recorders.append(self)
+        return self
+
+    def stop(self):
+        if self in _recorders:
+            _recorders.remove(self)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exception):
+        self.stop()
+
+    def reset(self):
+        self.stages = {}
+
+    def add(self, stage, seconds, counters):
+        entry = self.stages.get(stage)
+        if entry is None:
+            entry = self.stages[stage] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'counters': {}}
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+        entry['max_seconds'] = max(entry['max_seconds'], seconds)
+        # Counters named peak_* keep their maximum, the others are summed.
+        totals = entry['counters']
+        for name, value in counters.items():
+            if name.startswith('peak_'):
+                totals[name] = max(totals.get(name, value), value)
+            else:
+                totals[name] = totals.get(name, 0) + value
+        if self.callback is not None:
+            self.callback(stage, seconds, counters)
+
+    def report(self):
+        report = {}
+        for stage, entry in self.stages.items():
+            seconds = entry['seconds']
+            rates = {f'{name}_per_second': value / seconds for name, value in entry['counters'].items()
+                     if not name.startswith('peak_') and seconds > 0}
+            report[stage] = dict(entry, counters=dict(entry['counters']), rates=rates)
+        return report
+
+    def to_json(self, path=None):
+        text = json.dumps(self.report(), indent=2)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text + '\n')
+        return text
+
+    def format(self):
+        lines = []
+        report = self.report()
+        width = max(map(len, report), default=0)
+        for stage, entry in sorted(report.items(), key=lambda item: -item[1]['seconds']):
+            counters = ', '.join(f'{name}={value:,}' for name, value in entry['counters'].items())
+            lines.append(f"{stage:<{width}} {entry['calls']:>7} calls {entry['seconds']:10.4f} s  {counters}")
+        return '\n'.join(lines)
@@ -0,0 +1,182 @@
+import re
+import sys
+
+from .. import instrumentation
+
+
+TOKEN_TYPES = [
+    ('NUMBER', r'\b\d+(\.\d*)?([eE][+-]?\d+)?\b'),
+    ('KEYWORD', r'\b(auto|const|double|float|int|short|struct|break|continue|else|for|long|switch|void|case|default|char|do|if|return|static|while|namespace|using|bool|true|false|class|public|private|protected|this|throw|try|catch|cout|cin)\b'),
+    ('IDENTIFIER', r'[a-zA-Z_]\w*'),
+    ('LEFT_PAREN', r'\('),
+    ('RIGHT_PAREN', r'\)'),
+    ('LEFT_SQUARE', r'\['),
+    ('RIGHT_SQUARE', r'\]'),
+    ('LEFT_CURLY', r'\{'),
+    ('RIGHT_CURLY', r'\}'),
+    ('DOUBLE_EQUAL', r'=='),
+    ('LESS_EQUAL', r'<='),
+    ('GREATER_EQUAL', r'>='),
+    ('LESS_THAN', r'<'),
+    ('GREATER_THAN', r'>'),
+    ('EQUAL', r'='),
+    ('PLUS', r'\+'),
+    ('MINUS', r'-'),
+    ('ASTERISK', r'\*'),
+    ('SLASH', r'/'),
+    ('HASH', r'#'),
+    ('DOT', r'\.'),
+    ('COMMA', r','),
+    ('COLON', r':'),
+    ('SEMICOLON', r';'),
+    ('SINGLE_QUOTE', r'\''),
+    ('DOUBLE_QUOTE', r'"'),
+    ('COMMENT', r'\/\/.*|\/\*(.|\n)*?\*\/'),
+    ('PIPE', r'\|'),
+    ('END', r'\0'),
+    ('UNEXPECTED', r'.')
+]
+
+
+def compile_token_types(token_types):
+    # A leading \b is always true at the start of the sliced input the old
+    # scanner matched against, so drop it to keep the same behaviour when
+    # matching in place with a moving position.
+    alternatives = []
+    for token_type, pattern in token_types:
+        if pattern.startswith(r'\b'):
+            pattern = pattern[2:]
+        alternatives.append(f'(?P<{token_type}>{pattern})')
+    return re.compile('|'.join(alternatives))
+
+
+TOKEN_REGEX = compile_token_types(TOKEN_TYPES)
+WHITESPACE_REGEX = re.compile(r'\s*')
+
+# The generated scanner reads whitespace as a token of its own and drops
+# it; its longest match rule is what lets COMMENT through, the regex mode
+# always stops at the first listed rule that matches, SLASH. Two character
+# operators are listed before their one character prefixes, so both modes
+# read them as one token.
+SCANNER_RULES = [('WHITESPACE', r'\s+')] + TOKEN_TYPES
+_scanner = None
+
+
+def dfa_scanner(cache=None):
+    # Generated on first use, or loaded from an artifact_cache.ArtifactCache.
+    global _scanner
+    if cache is not None:
+        return cache.scanner(SCANNER_RULES, skip=['WHITESPACE'])
+    if _scanner is None:
+        from .scanner import Scanner
+        _scanner = Scanner.generate(SCANNER_RULES, skip=['WHITESPACE'])
+    return _scanner
+
+
+def tokenize(code, mode='regex'):
+    started = instrumentation.start()
+    if mode == 'dfa':
+        tokens = dfa_scanner().tokenize(code)
+    elif mode == 'regex':
+        tokens = _tokenize_regex(code)
+    else:
+        raise ValueError(f"Unknown mode {mode!r}, expected 'regex' or 'dfa'")
+    if started is not None:
+        stage = 'cpp_lexer.tokenize' if mode == 'regex' else 'cpp_lexer.tokenize.dfa'
+        instrumentation.record(stage, started, tokens=len(tokens), chars=len(code))
+    return tokens
+
+
+def _tokenize_regex(code):
+    tokens = []
+    match_token = TOKEN_REGEX.match
+    skip_whitespace = WHITESPACE_REGEX.match
+    pos = 0
+    end = len(code)
+    while True:
+        pos = skip_whitespace(code, pos).end()
+        if pos == end:
+            break
+        match = match_token(code, pos)
+        if match is None:
+            raise SyntaxError(f'Illegal character: {code[pos]}')
+        tokens.append((match.lastgroup, match.group()))
+        pos = match.end()
+    return tokens
+
+
+def generate_cpp_source(size):
+    function = """
+int compute_{n}(int a, int b) {{
+    // accumulate the products of a and b
+    int total = 0;
+    for (int i = 0; i < a; ++i) {{
+        total = total + i * b - {n} / 2;
+    }}
+    /* keep the result
+       in range */
+    if (total > 1000) {{ return total / 3.5e2; }}
+    return total;
+}}
+"""
+    parts = []
+    length = 0
+    n = 0
+    while length < size:
+        part = function.format(n=n)
+        parts.append(part)
+        length += len(part)
+        n += 1
+    return ''.join(parts)
+
+
+def benchmark_tokenize(sizes=(100_000, 1_000_000, 4_000_000), repeat=3, modes=('regex', 'dfa')):
+    import time
+    dfa_scanner()
+    results = []
+    for size in sizes:
+        code = generate_cpp_source(size)
+        for mode in modes:
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                tokens = tokenize(code, mode)
+                best = min(best, time.perf_counter() - start)
+            results.append((mode, len(code), len(tokens), best, len(tokens) / best))
+            print(f'{mode:<5} {len(code):>10} chars  {len(tokens):>9} tokens  {best:8.3f} s  '
+                  f'{len(tokens) / best:>12,.0f} tokens/s')
+    return results
+
+
+def token_table(tokens):
+    from prettytable import PrettyTable
+    pt = PrettyTable()
+    pt.field_names = ["Token Type", "Token Value"]
+
+    for token in tokens:
+        pt.add_row([token[0], token[1]])
+    return pt
+
+
+cpp_code = """
+#include <iostream>
+using namespace std;
+
+int main() {
+    for (int i = 0; i <= 10; ++i) {
+        for (int j = 0; j <= 10; ++j) {
+            cout << i << " * " << j << " = " << i * j << endl;
+        }
+        cout << "----------" << endl;
+    }
+    return 0;
+}
+"""
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--benchmark']:
+        benchmark_tokenize()
+        sys.exit()
+
+    tokens = tokenize(cpp_code)
+    print(token_table(tokens))
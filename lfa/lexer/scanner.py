@@ -0,0 +1,439 @@
+from array import array
+
+from ..finite_automata.automaton import EPSILON, FiniteAutomaton
+
+
+# Characters are scanned by class: every ASCII character that no pattern
+# tells apart from another shares a class with it. Non-ASCII characters
+# fall into one of four pseudo characters, after the groups re puts them
+# in for \d, \w and \s.
+ASCII = 128
+DIGIT, WORD, SPACE, OTHER = range(ASCII, ASCII + 4)
+UNIVERSE = frozenset(range(ASCII + 4))
+DEAD = 0
+
+
+def _char_set(test, pseudo=()):
+    return frozenset(code for code in range(ASCII) if test(chr(code))) | frozenset(pseudo)
+
+
+ESCAPE_SETS = {
+    'd': _char_set(str.isdigit, [DIGIT]),
+    'w': _char_set(lambda char: char.isalnum() or char == '_', [DIGIT, WORD]),
+    's': _char_set(str.isspace, [SPACE]),
+}
+for _name in 'dws':
+    ESCAPE_SETS[_name.upper()] = UNIVERSE - ESCAPE_SETS[_name]
+ESCAPE_CHARS = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v', '0': '\0'}
+ANY = UNIVERSE - {ord('\n')}
+
+
+def pseudo_char(char):
+    if char.isdecimal():
+        return DIGIT
+    if char.isalnum() or char == '_':
+        return WORD
+    if char.isspace():
+        return SPACE
+    return OTHER
+
+
+class PatternParser:
+    # The part of re syntax token rules use: literals and escapes, classes
+    # with ranges and negation, '.', groups, '|', the greedy and lazy
+    # forms of * + ? and \b, see _boundaries.
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.pos = 0
+
+    def error(self, message):
+        return ValueError(f'{message} at position {self.pos} of pattern {self.pattern!r}')
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def take(self):
+        char = self.peek()
+        if char is None:
+            raise self.error('Unexpected end')
+        self.pos += 1
+        return char
+
+    def parse(self):
+        node = self.alternation()
+        if self.peek() is not None:
+            raise self.error(f'Unexpected {self.peek()!r}')
+        return node
+
+    def alternation(self):
+        branches = [self.sequence()]
+        while self.peek() == '|':
+            self.pos += 1
+            branches.append(self.sequence())
+        return branches[0] if len(branches) == 1 else ('|', branches)
+
+    def sequence(self):
+        items = []
+        while self.peek() not in (None, '|', ')'):
+            item = self.atom()
+            while self.peek() in ('*', '+', '?'):
+                quantifier = self.take()
+                if self.peek() == '?':
+                    quantifier += self.take()
+                item = (quantifier, item)
+            if item is not None:
+                items.append(item)
+        return ('.', items)
+
+    def atom(self):
+        char = self.take()
+        if char == '(':
+            if self.pattern.startswith('?:', self.pos):
+                self.pos += 2
+            elif self.peek() == '?':
+                raise self.error('Unsupported group')
+            node = self.alternation()
+            if self.take() != ')':
+                raise self.error("Missing ')'")
+            return node
+        if char == '[':
+            return ('set', self.char_class())
+        if char == '.':
+            return ('set', ANY)
+        if char == '\\':
+            return self.escape()
+        if char in '*+?{}^$)':
+            raise self.error(f'Unsupported {char!r}')
+        return ('set', self.literal(char))
+
+    def literal(self, char):
+        if ord(char) >= ASCII:
+            raise self.error(f'Non-ASCII literal {char!r}')
+        return frozenset([ord(char)])
+
+    def escape(self):
+        char = self.take()
+        if char == 'b':
+            return ('boundary', None)
+        if char in ESCAPE_SETS:
+            return ('set', ESCAPE_SETS[char])
+        if char.isalnum() and char not in ESCAPE_CHARS:
+            raise self.error(f'Unsupported escape \\{char}')
+        return ('set', self.literal(ESCAPE_CHARS.get(char, char)))
+
+    def class_item(self):
+        char = self.take()
+        if char != '\\':
+            return self.literal(char), char
+        char = self.take()
+        if char in ESCAPE_SETS:
+            return ESCAPE_SETS[char], None
+        char = ESCAPE_CHARS.get(char, char)
+        return self.literal(char), char
+
+    def char_class(self):
+        negated = self.peek() == '^'
+        if negated:
+            self.pos += 1
+        members = set()
+        first = True
+        while first or self.peek() != ']':
+            first = False
+            items, low = self.class_item()
+            if low is not None and self.peek() == '-' and self.pattern[self.pos + 1:self.pos + 2] not in ('', ']'):
+                self.pos += 1
+                _, high = self.class_item()
+                if high is None or high < low:
+                    raise self.error('Bad range')
+                items = frozenset(range(ord(low), ord(high) + 1))
+            members |= items
+        self.pos += 1
+        return UNIVERSE - members if negated else frozenset(members)
+
+
+def character_classes(sets):
+    # Characters with the same membership in every set are interchangeable.
+    signatures = {}
+    classes = [0] * len(UNIVERSE)
+    for char in sorted(UNIVERSE):
+        signature = tuple(char in members for members in sets)
+        classes[char] = signatures.setdefault(signature, len(signatures))
+    return classes, len(signatures)
+
+
+def _sets(node, found):
+    kind, value = node
+    if kind == 'boundary':
+        return
+    if kind == 'set':
+        found.append(value)
+    elif kind in ('.', '|'):
+        for child in value:
+            _sets(child, found)
+    else:
+        _sets(value, found)
+
+
+class _Builder:
+    def __init__(self, prefix, classes):
+        self.prefix = prefix
+        self.classes = classes
+        self.transitions = {}
+        self.count = 0
+
+    def state(self):
+        name = f'{self.prefix}.{self.count}'
+        self.count += 1
+        self.transitions[name] = {}
+        return name
+
+    def edge(self, source, symbol, target):
+        self.transitions[source].setdefault(symbol, []).append(target)
+
+    def build(self, node):
+        # Thompson construction; returns the (first, last) states.
+        first = self.state()
+        kind, value = node
+        if kind == 'set':
+            last = self.state()
+            for symbol in sorted({self.classes[char] for char in value}):
+                self.edge(first, symbol, last)
+            return first, last
+        if kind == '.':
+            last = first
+            for child in value:
+                start, end = self.build(child)
+                self.edge(last, EPSILON, start)
+                last = end
+            return first, last
+        last = self.state()
+        if kind == '|':
+            for child in value:
+                start, end = self.build(child)
+                self.edge(first, EPSILON, start)
+                self.edge(end, EPSILON, last)
+            return first, last
+        # Lazy quantifiers build the same fragment, see _shortest_match.
+        start, end = self.build(value)
+        self.edge(first, EPSILON, start)
+        self.edge(end, EPSILON, last)
+        if kind[0] in ('*', '?'):
+            self.edge(first, EPSILON, last)
+        if kind[0] in ('*', '+'):
+            self.edge(end, EPSILON, start)
+        return first, last
+
+
+def _lazy(node):
+    if node[0] in ('set', 'boundary'):
+        return False
+    kind, value = node
+    if kind in ('.', '|'):
+        return any(_lazy(child) for child in value)
+    return len(kind) == 2 or _lazy(value)
+
+
+def _shortest_match(automaton, prefix):
+    # An alternative using a lazy quantifier ends at its first match:
+    # determinize it on its own and drop every move out of an accepting
+    # state. That is what re does for the usual delimited forms such as
+    # /\*(.|\n)*?\*/, where only a fixed suffix follows the lazy part.
+    dfa = automaton.to_dfa(compact_names=True)
+    accept = set(dfa.accept)
+    rename = {state: f'{prefix}.d{state}' for state in dfa.states}
+    transitions = {rename[state]: {} if state in accept else
+                   {symbol: [rename[target] for target in targets] for symbol, targets in moves.items()}
+                   for state, moves in dfa.transition_function.items()}
+    for state in dfa.states:
+        transitions.setdefault(rename[state], {})
+    return (list(transitions), transitions, rename[dfa.start], [rename[state] for state in dfa.accept])
+
+
+def _boundaries(branch, pattern):
+    # A leading \b is dropped, as the regex mode of cpp_lexer does: it
+    # holds wherever the previous token ended. A trailing one is returned
+    # as a flag, the scanner checks it against the characters around the
+    # end of the match. \b anywhere else is not supported.
+    items = list(branch[1]) if branch[0] == '.' else [branch]
+    if items and items[0][0] == 'boundary':
+        items.pop(0)
+    bounded = bool(items) and items[-1][0] == 'boundary'
+    if bounded:
+        items.pop()
+    if _has_boundary(('.', items)):
+        raise ValueError(f'\\b is only supported at the start or end of pattern {pattern!r}')
+    return ('.', items), bounded
+
+
+def _has_boundary(node):
+    kind, value = node
+    if kind == 'boundary':
+        return True
+    if kind in ('.', '|'):
+        return any(_has_boundary(child) for child in value)
+    return kind != 'set' and _has_boundary(value)
+
+
+def combined_automaton(rules):
+    # One NFA for every rule, with states named '<rule>.<alternative>.<n>';
+    # also returns (rule, bounded) for each accepting state, bounded when
+    # its alternative ends in \b. Top level alternatives are built one by
+    # one, which lets a lazy one stop at its first match while the others
+    # go on.
+    parsed = []
+    for _, pattern in rules:
+        tree = PatternParser(pattern).parse()
+        parsed.append([_boundaries(branch, pattern) for branch in (tree[1] if tree[0] == '|' else [tree])])
+    found = []
+    for branches in parsed:
+        for branch, _ in branches:
+            _sets(branch, found)
+    if any(bounded for branches in parsed for _, bounded in branches):
+        # The boundary check needs to tell word characters apart.
+        found.append(ESCAPE_SETS['w'])
+    classes, count = character_classes(found)
+
+    states = ['start']
+    transitions = {'start': {EPSILON: []}}
+    accept = {}
+    for rule, branches in enumerate(parsed):
+        for alternative, (branch, bounded) in enumerate(branches):
+            prefix = f'{rule}.{alternative}'
+            builder = _Builder(prefix, classes)
+            first, last = builder.build(branch)
+            branch_states, branch_transitions, branch_accept = list(builder.transitions), builder.transitions, [last]
+            if _lazy(branch):
+                automaton = FiniteAutomaton(branch_states, list(range(count)), branch_transitions, first, branch_accept)
+                branch_states, branch_transitions, first, branch_accept = _shortest_match(automaton, prefix)
+            states.extend(branch_states)
+            transitions.update(branch_transitions)
+            transitions['start'][EPSILON].append(first)
+            accept.update(dict.fromkeys(branch_accept, (rule, bounded)))
+    return FiniteAutomaton(states, list(range(count)), transitions, 'start', list(accept)), classes, accept
+
+
+class Scanner:
+    def __init__(self, names, classes, table, tokens, unbounded, skip=()):
+        # table[state * width + class] is the next state, 0 is the dead
+        # state and 1 the start; tokens[state] is the rule accepted in a
+        # state (-1 for none), unbounded[state] the one accepted when the
+        # match does not end on a word boundary: they differ where the
+        # first rule ends in \b. classes maps the 128 ASCII codes and the
+        # four non-ASCII pseudo characters to classes.
+        self.names = list(names)
+        self.classes = list(classes)
+        self.width = max(self.classes) + 1
+        self.table = table
+        self.tokens = tokens
+        self.unbounded = unbounded
+        self.skip = frozenset(skip)
+        translation = {code: chr(self.classes[code]) for code in range(ASCII)}
+        self._translation = _Translation(translation, self.classes)
+        # The scan loop works on row offsets (state * width) in plain lists.
+        width = self.width
+        self._rows = [state * width for state in table]
+        self._row_tokens = [-1] * len(table)
+        self._row_checks = {}
+        for state, token in enumerate(tokens):
+            if state * width < len(table):
+                self._row_tokens[state * width] = token
+                if unbounded[state] != token:
+                    self._row_checks[state * width] = unbounded[state]
+        self._word = [False] * width
+        for code in ESCAPE_SETS['w']:
+            self._word[self.classes[code]] = True
+
+    @classmethod
+    def generate(cls, rules, skip=()):
+        # rules are (name, pattern) pairs, earlier ones win ties between
+        # matches of the same length; tokens named in skip are dropped.
+        automaton, classes, accept = combined_automaton(rules)
+        members = {}
+        dfa = automaton.to_dfa(compact_names=True, members=members)
+        ids = {dfa.start: 1}
+        for state in dfa.states:
+            ids.setdefault(state, len(ids) + 1)
+        width = max(classes) + 1
+        table = array('i', [DEAD]) * ((len(ids) + 1) * width)
+        for state, moves in dfa.transition_function.items():
+            row = ids[state] * width
+            for symbol, targets in moves.items():
+                table[row + symbol] = ids[targets[0]]
+        tokens = array('i', [-1]) * (len(ids) + 1)
+        unbounded = array('i', [-1]) * (len(ids) + 1)
+        for state in dfa.accept:
+            found = [accept[member] for member in members[state] if member in accept]
+            tokens[ids[state]] = min(rule for rule, _ in found)
+            unbounded[ids[state]] = min((rule for rule, bounded in found if not bounded), default=-1)
+        return cls([name for name, _ in rules], classes, table, tokens, unbounded, skip)
+
+    @property
+    def states(self):
+        return len(self.tokens) - 1
+
+    def encode(self, text):
+        # One byte per character: its class.
+        return text.translate(self._translation).encode('latin-1')
+
+    def scan(self, text):
+        # Maximal munch: run the DFA as far as it goes and emit the last
+        # accepting position. Positions the DFA went past without meeting
+        # an accepting state are remembered with their states (Reps'
+        # tabulation), so no stretch of input is rescanned in the same state
+        # and the whole scan stays linear. Only positions at or after the
+        # current token can be met again, earlier ones are dropped. A rule
+        # ending in \b only accepts where the characters on either side of
+        # the end are not both word characters or both not.
+        symbols = self.encode(text)
+        rows, row_tokens, names, skip = self._rows, self._row_tokens, self.names, self.skip
+        checks, word = self._row_checks, self._word
+        start = self.width
+        failed = {}
+        length = len(symbols)
+        pos = 0
+        while pos < length:
+            state = start
+            index = pos
+            token, end, token_state = -1, pos, start
+            while index < length:
+                if failed and state in failed.get(index, ()):
+                    break
+                state = rows[state + symbols[index]]
+                if not state:
+                    break
+                index += 1
+                found = row_tokens[state]
+                if found >= 0:
+                    if checks and state in checks:
+                        if word[symbols[index - 1]] == (index < length and word[symbols[index]]):
+                            found = checks[state]
+                    if found >= 0:
+                        token, end, token_state = found, index, state
+            if end < index:
+                state = token_state
+                for position in range(end, index):
+                    failed.setdefault(position, set()).add(state)
+                    state = rows[state + symbols[position]]
+            if token < 0:
+                raise SyntaxError(f'Illegal character: {text[pos]}')
+            if names[token] not in skip:
+                yield names[token], text[pos:end]
+            if failed:
+                for position in range(pos, end):
+                    failed.pop(position, None)
+            pos = end
+
+    def tokenize(self, text):
+        return list(self.scan(text))
+
+
+class _Translation(dict):
+    # str.translate table: ASCII codes are filled in, other characters are
+    # classified on first sight.
+    def __init__(self, translation, classes):
+        super().__init__(translation)
+        self.classes = classes
+
+    def __missing__(self, code):
+        value = self[code] = chr(self.classes[pseudo_char(chr(code))])
+        return value
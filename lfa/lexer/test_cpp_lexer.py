@@ -0,0 +1,65 @@
+import re
+import random
+import unittest
+
+from .cpp_lexer import TOKEN_TYPES, cpp_code, generate_cpp_source, tokenize
+
+
+def _reference_tokenize(code):
+    # The original scanner: strip, then try every pattern in order against
+    # the rest of the input.
+    tokens = []
+    code = code.strip()
+    while code:
+        for token_type, pattern in TOKEN_TYPES:
+            match = re.match(pattern, code)
+            if match:
+                tokens.append((token_type, match.group(0)))
+                code = code[len(match.group(0)):].strip()
+                break
+        else:
+            raise SyntaxError(f'Illegal character: {code[0]}')
+    return tokens
+
+
+class TestTokenize(unittest.TestCase):
+    def test_matches_reference_on_samples(self):
+        for code in (cpp_code, generate_cpp_source(2000), '', '  \n\t '):
+            self.assertEqual(tokenize(code), _reference_tokenize(code))
+
+    def test_matches_reference_on_random_input(self):
+        rng = random.Random(1)
+        pieces = ['int', 'x', 'integer', '_a1', '12', '3.5', '1e5', '2.e-3', '==', '=', '<=', '<', '/', '//c\n',
+                  '/* k */', '/*', '*/', '"', "'", '#', '{', '}', '(', ')', ';', ' ', '\n', '\t', 'é', '\0', '@', '.']
+        for _ in range(500):
+            code = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(tokenize(code), _reference_tokenize(code), code)
+
+    def test_two_character_operators(self):
+        # Listed before their one character prefixes, so the first matching
+        # rule and the longest match agree.
+        expected = [('IDENTIFIER', 'a'), ('LESS_EQUAL', '<='), ('IDENTIFIER', 'b'), ('GREATER_EQUAL', '>='),
+                    ('IDENTIFIER', 'c'), ('DOUBLE_EQUAL', '=='), ('IDENTIFIER', 'd'), ('LESS_THAN', '<'),
+                    ('IDENTIFIER', 'e'), ('GREATER_THAN', '>'), ('IDENTIFIER', 'f'), ('EQUAL', '='), ('IDENTIFIER', 'g')]
+        for mode in ('regex', 'dfa'):
+            self.assertEqual(tokenize('a<=b>=c==d<e>f=g', mode), expected)
+            self.assertEqual(tokenize('a < = b', mode)[1:3], [('LESS_THAN', '<'), ('EQUAL', '=')])
+
+    def test_modes_agree_without_comments(self):
+        # Comments are the one place the first matching rule and the longest
+        # match differ; \b in NUMBER and KEYWORD is honoured by both.
+        rng = random.Random(2)
+        pieces = ['int', 'x', 'integer', '_a1', '12', '3.5', '1e5', '2.e-3', '12abc', '3.x', '==', '=', '<=', '<', '>=',
+                  '>', '{', '}', '(', ')', ';', '"', '#', ' ', '\n', 'é', '٣', '\0', '@', '.']
+        for _ in range(500):
+            code = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(tokenize(code, 'dfa'), tokenize(code), code)
+        self.assertEqual(tokenize('12abc', 'dfa'), [('UNEXPECTED', '1'), ('UNEXPECTED', '2'), ('IDENTIFIER', 'abc')])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            tokenize('x', mode='fast')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import itertools
+import random
+import re
+import unittest
+
+from .cpp_lexer import SCANNER_RULES, cpp_code, generate_cpp_source
+from .scanner import PatternParser, Scanner
+
+
+def _reference_scan(rules, text, skip=()):
+    # Every rule tried at every end position with re: the longest match
+    # wins, then the earliest rule. A leading \b is dropped as the regex
+    # mode does, a trailing one is checked on the characters around the
+    # end, and a rule with a lazy quantifier ends where re stops it.
+    compiled = []
+    for name, pattern in rules:
+        bounded = pattern.endswith(r'\b')
+        pattern = pattern[2 if pattern.startswith(r'\b') else 0:-2 if bounded else None]
+        compiled.append((name, re.compile(pattern), '*?' in pattern, bounded))
+
+    def word(position):
+        return 0 <= position < len(text) and re.match(r'\w', text[position]) is not None
+
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        best, best_end = None, pos
+        for name, pattern, lazy, bounded in compiled:
+            match = pattern.match(text, pos)
+            if match is None:
+                continue
+            if lazy:
+                ends = [match.end()]
+            else:
+                ends = [end for end in range(len(text), pos, -1) if pattern.fullmatch(text, pos, end)]
+            ends = [end for end in ends if not bounded or word(end - 1) != word(end)][:1]
+            if ends and ends[0] > best_end:
+                best, best_end = name, ends[0]
+        if best is None:
+            raise SyntaxError(f'Illegal character: {text[pos]}')
+        if best not in skip:
+            tokens.append((best, text[pos:best_end]))
+        pos = best_end
+    return tokens
+
+
+class TestScanner(unittest.TestCase):
+    RULES = [('A', 'a+'), ('AB', 'ab'), ('ABS', 'a(b|bb)*'), ('B', 'b'), ('NUMBER', r'\d+(\.\d*)?'),
+             ('INTEGER', r'\b\d+\b'), ('WORD', r'[a-z_]\w*'), ('SPACE', r'\s+'), ('QUOTE', r'"[^"\n]*"'),
+             ('ANY', '.')]
+
+    def assertScans(self, rules, text, skip=()):
+        scanner = Scanner.generate(rules, skip)
+        try:
+            expected = _reference_scan(rules, text, skip)
+        except SyntaxError:
+            with self.assertRaises(SyntaxError):
+                scanner.tokenize(text)
+        else:
+            self.assertEqual(scanner.tokenize(text), expected, (rules, text))
+
+    def test_random_rule_orders_match_reference(self):
+        rng = random.Random(71)
+        for _ in range(40):
+            rules = rng.sample(self.RULES, rng.randint(1, len(self.RULES)))
+            scanner = Scanner.generate(rules, skip=['SPACE'])
+            for _ in range(30):
+                text = ''.join(rng.choice(['a', 'b', 'ab', '1', '2.', '_', ' ', '\n', '"', 'é', '٣']) for _ in range(rng.randint(0, 12)))
+                try:
+                    expected = _reference_scan(rules, text, ['SPACE'])
+                except SyntaxError:
+                    with self.assertRaises(SyntaxError):
+                        scanner.tokenize(text)
+                    continue
+                self.assertEqual(scanner.tokenize(text), expected, (rules, text))
+
+    def test_every_short_word(self):
+        rules = [('A', 'a'), ('LONG', 'a*b'), ('B', 'b|ba'), ('C', 'c')]
+        for size in range(7):
+            for text in map(''.join, itertools.product('abc', repeat=size)):
+                self.assertScans(rules, text)
+
+    def test_backtracking_stays_correct(self):
+        # Each a could start an a*b match that fails at the end of the
+        # input, the case the failed (state, position) set is there for.
+        rules = [('A', 'a'), ('LONG', 'a*b')]
+        for text in ('a' * 300, 'a' * 150 + 'b' + 'a' * 150):
+            self.assertScans(rules, text)
+
+    def test_lazy_comment_stops_at_first_end(self):
+        rules = [('COMMENT', r'/\*(.|\n)*?\*/'), ('SLASH', '/'), ('STAR', r'\*'), ('WORD', r'\w+'), ('SPACE', r'\s+')]
+        self.assertScans(rules, '/* a */ b */ /*\n*/', skip=['SPACE'])
+        self.assertEqual(Scanner.generate(rules, ['SPACE']).tokenize('/**/*/'),
+                         [('COMMENT', '/**/'), ('STAR', '*'), ('SLASH', '/')])
+
+    def test_cpp_rules_match_reference(self):
+        rng = random.Random(72)
+        pieces = ['int', 'x', '_a1', '12', '3.5', '1e5', '2.e-3', '12abc', '==', '=', '<=', '<', '>=', '/', '//c\n',
+                  '/* k */', '/*', '*/', '"', '#', '{', '}', ';', ' ', '\n', 'é', '\0', '@', '.']
+        samples = [cpp_code, generate_cpp_source(500)]
+        samples += [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 20))) for _ in range(200)]
+        scanner = Scanner.generate(SCANNER_RULES, skip=['WHITESPACE'])
+        for text in samples:
+            self.assertEqual(scanner.tokenize(text), _reference_scan(SCANNER_RULES, text, ['WHITESPACE']), text)
+
+    def test_word_boundary(self):
+        # A trailing \b is checked where the match ends; with nothing else
+        # accepting there, a shorter match or another rule wins.
+        rules = [('NUMBER', r'\b\d+(\.\d*)?\b'), ('WORD', r'[a-z]\w*'), ('DOT', r'\.'), ('SPACE', ' '), ('ANY', '.')]
+        scanner = Scanner.generate(rules, ['SPACE'])
+        self.assertEqual(scanner.tokenize('12abc'), [('ANY', '1'), ('ANY', '2'), ('WORD', 'abc')])
+        self.assertEqual(scanner.tokenize('3.;3.x 4'),
+                         [('NUMBER', '3'), ('DOT', '.'), ('ANY', ';'), ('NUMBER', '3.'), ('WORD', 'x'), ('NUMBER', '4')])
+        for text in map(''.join, itertools.product(['1', '2.', 'a', '.', ' ', 'é', '٣'], repeat=4)):
+            self.assertScans(rules, text, ['SPACE'])
+
+    def test_unsupported_patterns(self):
+        for pattern in ('a{2}', '(?=a)', '^a', r'\p'):
+            with self.assertRaises(ValueError):
+                PatternParser(pattern).parse()
+        for pattern in (r'a\bb', r'(a\b)', r'\b*a'):
+            with self.assertRaises(ValueError):
+                Scanner.generate([('A', pattern)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+from array import array
+
+
+class ASTArena:
+    def __init__(self):
+        self.type_names = []
+        self.values = [None]
+        self._type_ids = {}
+        self._value_ids = {None: 0}
+        self.types = array('B')
+        self.value_ids = array('I')
+        self.parents = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.last_child = array('i')
+
+    def add(self, type, value=None, parent=-1):
+        node = len(self.types)
+        type_id = self._type_ids.get(type)
+        if type_id is None:
+            type_id = self._type_ids[type] = len(self.type_names)
+            self.type_names.append(type)
+        value_id = self._value_ids.get(value)
+        if value_id is None:
+            value_id = self._value_ids[value] = len(self.values)
+            self.values.append(value)
+
+        self.types.append(type_id)
+        self.value_ids.append(value_id)
+        self.parents.append(parent)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        self.last_child.append(-1)
+        if parent >= 0:
+            last = self.last_child[parent]
+            if last < 0:
+                self.first_child[parent] = node
+            else:
+                self.next_sibling[last] = node
+            self.last_child[parent] = node
+        return node
+
+    def add_child(self, parent, type, value=None):
+        return self.add(type, value, parent)
+
+    def type_of(self, node):
+        return self.type_names[self.types[node]]
+
+    def value_of(self, node):
+        return self.values[self.value_ids[node]]
+
+    def parent_of(self, node):
+        parent = self.parents[node]
+        return parent if parent >= 0 else None
+
+    def children(self, node):
+        child = self.first_child[node]
+        while child >= 0:
+            yield child
+            child = self.next_sibling[child]
+
+    def walk(self, root=0):
+        first_child, next_sibling, parents = self.first_child, self.next_sibling, self.parents
+        node = root
+        while True:
+            yield node, True
+            child = first_child[node]
+            if child >= 0:
+                node = child
+                continue
+            while True:
+                yield node, False
+                if node == root:
+                    return
+                sibling = next_sibling[node]
+                if sibling >= 0:
+                    node = sibling
+                    break
+                node = parents[node]
+
+    def preorder(self, root=0):
+        return (node for node, entering in self.walk(root) if entering)
+
+    def postorder(self, root=0):
+        return (node for node, entering in self.walk(root) if not entering)
+
+    def nbytes(self):
+        columns = (self.types, self.value_ids, self.parents, self.first_child, self.next_sibling, self.last_child)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __repr__(self):
+        return f"ASTArena({len(self)} nodes, {len(self.values) - 1} values)"
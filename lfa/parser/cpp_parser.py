@@ -0,0 +1,382 @@
+import re
+import os
+import enum
+import mmap
+import codecs
+import pathlib
+
+from .. import instrumentation
+from .ast_arena import ASTArena
+from .token_stream import TokenStream
+
+class TokenType(enum.Enum):
+    WHITESPACE = 1
+    COMMENT = 2
+    KEYWORD = 3
+    IDENTIFIER = 4
+    OPERATOR = 5
+    LITERAL = 6
+    PUNCTUATOR = 7
+
+TOKEN_TYPE_IDS = {token_type.name: type_id for type_id, token_type in enumerate(TokenType)}
+
+CHUNK_SIZE = 1 << 16
+# Longest distance a token pattern looks past the end of its own match
+# (the fraction part of a literal), so a match this close to the end of
+# the buffer may still grow once the next chunk arrives.
+LOOKAHEAD = 2
+
+
+def _buffer_reader(source):
+    view = memoryview(source).cast('B')
+    offset = 0
+
+    def read(size):
+        nonlocal offset
+        chunk = view[offset:offset + size]
+        offset += len(chunk)
+        return bytes(chunk)
+    return read
+
+
+def _chunk_reader(source, encoding):
+    if isinstance(source, str):
+        chunks = [source]
+        return lambda size: chunks.pop() if chunks else ''
+    read_raw = source.read if hasattr(source, 'read') else _buffer_reader(source)
+    decoder = codecs.getincrementaldecoder(encoding)()
+
+    def read(size):
+        while True:
+            raw = read_raw(size)
+            if isinstance(raw, str):
+                return raw
+            text = decoder.decode(raw, final=not raw)
+            if text or not raw:
+                return text
+    return read
+
+
+def _inside_block_comment(buffer, pos):
+    return buffer.startswith('/*', pos) and buffer.find('*/', pos + 2) == -1
+
+
+def lex_stream(source, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    if isinstance(source, os.PathLike):
+        with open(source, 'rb') as file:
+            yield from lex_stream(file, chunk_size, encoding)
+        return
+
+    started = instrumentation.start()
+    read = _chunk_reader(source, encoding)
+    match_token = TOKEN_REGEX.match
+    skip_whitespace = WHITESPACE_REGEX.match
+    buffer = ''
+    pos = 0
+    final = False
+    chunks = chars = peak_buffer = 0
+    while True:
+        pos = skip_whitespace(buffer, pos).end()
+        match = match_token(buffer, pos)
+        if not final and (match is None or match.end() + LOOKAHEAD > len(buffer)
+                          or _inside_block_comment(buffer, pos)):
+            chunk = read(max(chunk_size, len(buffer) - pos))
+            final = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            chunks += 1
+            chars += len(chunk)
+            peak_buffer = max(peak_buffer, len(buffer))
+            continue
+        if pos == len(buffer):
+            if started is not None:
+                instrumentation.record('cpp_parser.lex_stream', started, chunks=chunks, chars=chars,
+                                       peak_buffer=peak_buffer)
+            return
+        if match is None:
+            raise SyntaxError(f'Unknown C++ syntax: {buffer[pos:]}')
+        yield TokenType[match.lastgroup], match.group().strip()
+        pos = match.end()
+
+
+def lex_file(path, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    yield from lex_stream(pathlib.Path(path), chunk_size, encoding)
+
+
+def lex_mmap(path, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from lex_stream(buffer, chunk_size, encoding)
+
+
+def lexer(cpp):
+    started = instrumentation.start()
+    tokens = list(lex_stream(cpp))
+    if started is not None:
+        instrumentation.record('cpp_parser.lexer', started, tokens=len(tokens))
+    return tokens
+
+
+def _open_buffer(path):
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def token_span(match):
+    end = match.end()
+    if match.lastgroup == 'COMMENT':
+        end = match.start() + len(match.group().rstrip())
+    return TOKEN_TYPE_IDS[match.lastgroup], match.start(), end
+
+
+def _decode_unless_ascii(source, encoding):
+    # The bytes patterns only agree with the str ones on ASCII: there \s,
+    # \d and \w do not match non-ASCII characters, and \s also misses
+    # \x1c-\x1f. Anything else is decoded and lexed as text instead.
+    if NON_ASCII_BYTES_REGEX.search(source) is None:
+        return source
+    return str(source, encoding)
+
+
+def lex_compact(source, encoding='utf-8'):
+    if isinstance(source, os.PathLike):
+        buffer = _open_buffer(source)
+        source = _decode_unless_ascii(buffer, encoding)
+        if source is not buffer and isinstance(buffer, mmap.mmap):
+            buffer.close()
+    elif not isinstance(source, str):
+        source = _decode_unless_ascii(source, encoding)
+    if isinstance(source, str):
+        match_token, skip_whitespace = TOKEN_REGEX.match, WHITESPACE_REGEX.match
+    else:
+        match_token, skip_whitespace = TOKEN_BYTES_REGEX.match, WHITESPACE_BYTES_REGEX.match
+
+    started = instrumentation.start()
+    stream = TokenStream(source, TokenType, encoding)
+    append = stream.append
+    pos = 0
+    end = len(source)
+    while True:
+        pos = skip_whitespace(source, pos).end()
+        if pos == end:
+            break
+        match = match_token(source, pos)
+        if match is None:
+            rest = source[pos:]
+            if not isinstance(rest, str):
+                rest = str(rest, encoding, 'replace')
+            raise SyntaxError(f'Unknown C++ syntax: {rest}')
+        append(*token_span(match))
+        pos = match.end()
+    if started is not None:
+        instrumentation.record('cpp_parser.lex_compact', started, tokens=len(stream), chars=end)
+    return stream
+
+class ASTNode:
+    __slots__ = ('type', 'value', 'children')
+
+    def __init__(self, type, children=None, value=None):
+        self.type = type
+        self.value = value
+        self.children = children if children is not None else []
+
+    def add_child(self, type, value=None):
+        child = ASTNode(type, value=value)
+        self.children.append(child)
+        return child
+
+    def __repr__(self):
+        parts = []
+        for node, entering in walk(self):
+            if not entering:
+                first = len(parts) - len(node.children)
+                children = ', '.join(parts[first:])
+                del parts[first:]
+                parts.append(f"{node.type}({node.value}, [{children}])")
+        return parts[0]
+
+
+def walk(tree):
+    stack = [(tree, True)]
+    while stack:
+        node, entering = stack.pop()
+        yield node, entering
+        if entering:
+            stack.append((node, False))
+            stack.extend((child, True) for child in reversed(node.children))
+
+
+def preorder(tree):
+    return (node for node, entering in walk(tree) if entering)
+
+
+def postorder(tree):
+    return (node for node, entering in walk(tree) if not entering)
+
+
+class ASTVisitor:
+    def visit(self, tree):
+        if isinstance(tree, ASTArena):
+            events, type_of = tree.walk(), tree.type_of
+        else:
+            events, type_of = walk(tree), lambda node: node.type
+        for node, entering in events:
+            handler = getattr(self, ('enter_' if entering else 'leave_') + type_of(node), None)
+            if handler is not None:
+                handler(node)
+        return self
+
+
+def parse(tokens, arena=None):
+    started = instrumentation.start()
+    if arena is None:
+        root = ASTNode("Program")
+        add_child = ASTNode.add_child
+    else:
+        root = arena.add("Program")
+        add_child = arena.add_child
+    current_node = root
+    stack = []
+
+    tokens = iter(tokens)
+    previous = None
+    token = next(tokens, None)
+    while token is not None:
+        token_type, value = token
+        following = next(tokens, None)
+        if token_type == TokenType.KEYWORD and value in ["int", "char", "float", "double"]:
+            if following is not None and following[0] == TokenType.IDENTIFIER:
+                add_child(current_node, "Declaration", value + " " + following[1])
+                token, following = following, next(tokens, None)
+        elif value == '{':
+            stack.append(current_node)
+            current_node = add_child(current_node, "Block")
+        elif value == '}':
+            current_node = stack.pop()
+        elif value == '=':
+            if following is not None and following[0] == TokenType.LITERAL:
+                target = previous[1] if previous is not None else ''
+                add_child(current_node, "Assignment", target + " = " + following[1])
+                token, following = following, next(tokens, None)
+        previous, token = token, following
+
+    if started is not None:
+        nodes = len(arena) if arena is not None else sum(1 for _ in preorder(root))
+        instrumentation.record('cpp_parser.parse', started, nodes=nodes, peak_depth=_depth(root, arena))
+    return root
+
+
+def _depth(root, arena=None):
+    events = arena.walk(root) if arena is not None else walk(root)
+    depth = peak = 0
+    for node, entering in events:
+        depth += 1 if entering else -1
+        peak = max(peak, depth)
+    return peak
+
+
+def parse_arena(tokens):
+    arena = ASTArena()
+    parse(tokens, arena)
+    return arena
+
+
+def add_nodes_edges(tree, graph=None):
+    if isinstance(tree, ASTArena):
+        name = lambda node: f'n{node}'
+        label = lambda node: f'{tree.type_of(node)}({tree.value_of(node)})'
+        root = 0
+        edges = ((node, tree.parents[node]) for node in tree.preorder(root) if node != root)
+    else:
+        name = lambda node: str(id(node))
+        label = lambda node: f'{node.type}({node.value})'
+        root = tree
+        edges = _child_edges(tree)
+
+    if graph is None:
+        from graphviz import Digraph
+        graph = Digraph()
+        graph.node(name=name(root), label=label(root))
+
+    for child, parent in edges:
+        graph.node(name=name(child), label=label(child))
+        graph.edge(name(parent), name(child))
+
+    return graph
+
+
+def _child_edges(tree):
+    stack = [(child, tree) for child in reversed(tree.children)]
+    while stack:
+        node, parent = stack.pop()
+        yield node, parent
+        stack.extend((child, node) for child in reversed(node.children))
+
+
+def _dot_quote(text):
+    return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def write_ast_dot(tree, filename, root=0, max_nodes=None, max_depth=None):
+    if isinstance(tree, ASTArena):
+        name = lambda node: f'n{node}'
+        label = lambda node: f'{tree.type_of(node)}({tree.value_of(node)})'
+        children = lambda node: reversed(list(tree.children(node)))
+    else:
+        name = lambda node: str(id(node))
+        label = lambda node: f'{node.type}({node.value})'
+        children = lambda node: reversed(node.children)
+        root = tree
+
+    written = 0
+    with open(filename, 'w', encoding='utf-8') as dot:
+        dot.write('digraph {\n')
+        stack = [(root, None, 0)]
+        while stack:
+            if max_nodes is not None and written >= max_nodes:
+                dot.write(f'\t// truncated after {written} nodes\n')
+                break
+            node, parent, depth = stack.pop()
+            dot.write(f'\t{name(node)} [label={_dot_quote(label(node))}]\n')
+            if parent is not None:
+                dot.write(f'\t{name(parent)} -> {name(node)}\n')
+            written += 1
+            if max_depth is None or depth < max_depth:
+                stack.extend((child, node, depth + 1) for child in children(node))
+        dot.write('}\n')
+    return written
+
+
+TOKENS = [
+    (TokenType.WHITESPACE, r'\s+'),
+    (TokenType.COMMENT, r'//.*|/\*[^*]*\*+([^/*][^*]*\*+)*\/'),
+    (TokenType.KEYWORD, r'\b(int|char|float|double|return|if|else|while|for)\b'),
+    (TokenType.IDENTIFIER, r'\b[_a-zA-Z][_a-zA-Z0-9]*\b'),
+    (TokenType.LITERAL, r'\b\d+(\.\d+)?\b'),
+    (TokenType.OPERATOR, r'[+\-*/=<>!&|^]+'),
+    (TokenType.PUNCTUATOR, r'[{}();,]')
+]
+
+TOKEN_REGEX = re.compile('|'.join(f'(?P<{token_type.name}>{regex})' for token_type, regex in TOKENS))
+WHITESPACE_REGEX = re.compile(r'\s*')
+TOKEN_BYTES_REGEX = re.compile(TOKEN_REGEX.pattern.encode())
+WHITESPACE_BYTES_REGEX = re.compile(rb'\s*')
+NON_ASCII_BYTES_REGEX = re.compile(rb'[\x1c-\x1f\x80-\xff]')
+
+cpp_code = """
+int main() {
+    int x = 10;
+    int y;
+    y = 20;
+    return 0;
+}"""
+
+if __name__ == '__main__':
+    tokens = lexer(cpp_code)
+    ast = parse(tokens)
+    graph = add_nodes_edges(ast)
+    graph.render('cpp_ast', format='png', view=True)
@@ -0,0 +1,469 @@
+import itertools
+from array import array
+
+from .cpp_parser import (
+    LOOKAHEAD, TOKEN_REGEX, WHITESPACE_REGEX, TokenType, _inside_block_comment, lex_compact, parse, token_span,
+)
+from .token_stream import TokenStream
+
+
+# Characters of text read at a time while relexing; doubled whenever a
+# token does not fit.
+WINDOW = 256
+TOKEN_TYPES = list(TokenType)
+OPEN = (TokenType.PUNCTUATOR, '{')
+CLOSE = (TokenType.PUNCTUATOR, '}')
+
+
+class _GapText:
+    # The text as a gap buffer at the last edit: characters before the gap
+    # in order, those after it reversed, so an edit only moves the
+    # characters between it and the previous one.
+    def __init__(self, text):
+        self.head = list(text)
+        self.tail = []
+
+    def __len__(self):
+        return len(self.head) + len(self.tail)
+
+    def __str__(self):
+        return self.read(0, len(self))
+
+    def _move(self, offset):
+        head, tail = self.head, self.tail
+        if offset < len(head):
+            tail.extend(reversed(head[offset:]))
+            del head[offset:]
+        elif offset > len(head):
+            count = offset - len(head)
+            head.extend(reversed(tail[-count:]))
+            del tail[-count:]
+
+    def replace(self, offset, deleted, inserted):
+        self._move(offset)
+        if deleted:
+            del self.tail[-deleted:]
+        self.head.extend(inserted)
+
+    def read(self, start, stop):
+        head, tail = self.head, self.tail
+        start, stop = max(start, 0), min(stop, len(self))
+        split, size = len(head), len(tail)
+        if stop <= split:
+            return ''.join(head[start:stop])
+        after = ''.join(reversed(tail[size - (stop - split):size - max(start - split, 0)]))
+        return ''.join(head[start:]) + after if start < split else after
+
+    def find(self, sub, start):
+        size = WINDOW
+        while True:
+            found = self.read(start, start + size).find(sub)
+            if found != -1:
+                return start + found
+            if start + size >= len(self):
+                return -1
+            size *= 2
+
+
+class _GapTokens:
+    # Token columns as a gap buffer at the last edit. Tokens before the gap
+    # keep their offsets; tokens after it are stored reversed with offsets
+    # counted back from the end of the text. Brace partners and /* openers
+    # refer to token i as i + 1 before the gap and as i - n after it, n the
+    # token count. None of these change when tokens are replaced at the gap,
+    # so an edit only touches the tokens it relexes and those the gap moves
+    # over.
+    def __init__(self, stream, text):
+        self.text = text
+        self.length = len(text)
+        self.types = array('B', stream.types)
+        self.starts = array('q', stream.starts)
+        self.ends = array('q', stream.ends)
+        self.partners = array('q', bytes(8 * len(stream)))
+        self.nodes = [None] * len(stream)
+        self.tail_types, self.tail_starts, self.tail_ends = array('B'), array('q'), array('q')
+        self.tail_partners, self.tail_nodes, self.tail_openers = array('q'), [], []
+        self.openers = [index + 1 for index in range(len(stream)) if self._opens_comment(index)]
+
+    def __len__(self):
+        return len(self.types) + len(self.tail_types)
+
+    @property
+    def gap(self):
+        return len(self.types)
+
+    def _slot(self, index):
+        return len(self) - 1 - index
+
+    def _index(self, ref):
+        return ref - 1 if ref > 0 else len(self) + ref
+
+    def _ref(self, index):
+        return index + 1 if index < self.gap else index - len(self)
+
+    def type(self, index):
+        if index < self.gap:
+            return TOKEN_TYPES[self.types[index]]
+        return TOKEN_TYPES[self.tail_types[self._slot(index)]]
+
+    def start(self, index):
+        if index < self.gap:
+            return self.starts[index]
+        return self.length - self.tail_starts[self._slot(index)]
+
+    def end(self, index):
+        if index < self.gap:
+            return self.ends[index]
+        return self.length - self.tail_ends[self._slot(index)]
+
+    def value(self, index):
+        return self.text.read(self.start(index), self.end(index))
+
+    def token(self, index):
+        return self.type(index), self.value(index)
+
+    def partner(self, index):
+        ref = self.partners[index] if index < self.gap else self.tail_partners[self._slot(index)]
+        return self._index(ref) if ref else None
+
+    def _set_partner(self, index, ref):
+        if index < self.gap:
+            self.partners[index] = ref
+        else:
+            self.tail_partners[self._slot(index)] = ref
+
+    def pair(self, opening, closing):
+        self._set_partner(opening, self._ref(closing))
+        self._set_partner(closing, self._ref(opening))
+
+    def unpair(self, index):
+        partner = self.partner(index)
+        if partner is not None:
+            self._set_partner(partner, 0)
+            self._set_partner(index, 0)
+
+    def node(self, index):
+        return self.nodes[index] if index < self.gap else self.tail_nodes[self._slot(index)]
+
+    def set_node(self, index, node):
+        if index < self.gap:
+            self.nodes[index] = node
+        else:
+            self.tail_nodes[self._slot(index)] = node
+
+    def _opens_comment(self, index):
+        # An operator starting with /* had no */ anywhere after it, or it
+        # would have lexed as a comment.
+        start = self.start(index)
+        return self.type(index) == TokenType.OPERATOR and self.text.read(start, start + 2) == '/*'
+
+    def move_left(self):
+        index = self.gap - 1
+        partner = self.partners.pop()
+        self.tail_types.append(self.types.pop())
+        self.tail_starts.append(self.length - self.starts.pop())
+        self.tail_ends.append(self.length - self.ends.pop())
+        self.tail_partners.append(partner)
+        self.tail_nodes.append(self.nodes.pop())
+        if self.openers and self.openers[-1] == index + 1:
+            self.tail_openers.append(self.openers.pop() - 1 - len(self))
+        if partner:
+            self._set_partner(self._index(partner), index - len(self))
+
+    def move_right(self):
+        index = self.gap
+        partner = self.tail_partners.pop()
+        self.types.append(self.tail_types.pop())
+        self.starts.append(self.length - self.tail_starts.pop())
+        self.ends.append(self.length - self.tail_ends.pop())
+        self.partners.append(partner)
+        self.nodes.append(self.tail_nodes.pop())
+        if self.tail_openers and self.tail_openers[-1] == index - len(self):
+            self.openers.append(self.tail_openers.pop() + len(self) + 1)
+        if partner:
+            self._set_partner(self._index(partner), index + 1)
+
+    def seek(self, offset):
+        # Moves the gap to just after the last token ending at or before
+        # offset.
+        while self.types and self.ends[-1] > offset:
+            self.move_left()
+        while self.tail_types and self.length - self.tail_ends[-1] <= offset:
+            self.move_right()
+
+    def remove(self):
+        # Drops the token right after the gap.
+        index = self.gap
+        self.unpair(index)
+        if self.tail_openers and self.tail_openers[-1] == index - len(self):
+            self.tail_openers.pop()
+        for column in (self.tail_types, self.tail_starts, self.tail_ends, self.tail_partners, self.tail_nodes):
+            column.pop()
+
+    def append(self, type_id, start, end):
+        # Tokens after the gap are referred to from the end, so they keep
+        # their references when the count grows here.
+        self.types.append(type_id)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.partners.append(0)
+        self.nodes.append(None)
+        if self._opens_comment(self.gap - 1):
+            self.openers.append(self.gap)
+
+    def stream(self, token_types, encoding):
+        stream = TokenStream(str(self.text), token_types, encoding)
+        stream.types = self.types + self.tail_types[::-1]
+        typecode = stream.starts.typecode
+        stream.starts = array(typecode, itertools.chain(self.starts, (self.length - start for start in reversed(self.tail_starts))))
+        stream.ends = array(typecode, itertools.chain(self.ends, (self.length - end for end in reversed(self.tail_ends))))
+        return stream
+
+
+def _brace(tokens, index):
+    if tokens.type(index) == TokenType.PUNCTUATOR:
+        value = tokens.value(index)
+        if value in ('{', '}'):
+            return value
+    return None
+
+
+def _blocks(tree):
+    blocks = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node.type == "Block":
+            blocks.append(node)
+        stack.extend(reversed(node.children))
+    return blocks
+
+
+def _unmatched(braces):
+    # Closing and opening braces left over once braces pair up among
+    # themselves.
+    closes = opens = 0
+    for brace in braces:
+        if brace == '{':
+            opens += 1
+        elif opens:
+            opens -= 1
+        else:
+            closes += 1
+    return closes, opens
+
+
+def _line_comment_end(text, tokens, index):
+    start = tokens.start(index)
+    if tokens.type(index) != TokenType.COMMENT or text.read(start, start + 2) != '//':
+        return tokens.end(index)
+    end = text.find('\n', start)
+    return len(text) if end == -1 else end
+
+
+def _relex(text, tokens, offset, deleted, inserted):
+    # Tokens ending at least LOOKAHEAD characters before the edit never
+    # looked at the edited text, with two exceptions. A // comment reads to
+    # the end of its line, past the trailing spaces its span leaves out.
+    # An edit that closes a block comment turns the first /* operator
+    # into one, so lexing restarts there.
+    restart = offset - LOOKAHEAD
+    tokens.seek(restart)
+    if tokens.gap and _line_comment_end(text, tokens, tokens.gap - 1) > restart:
+        tokens.move_left()
+    around = text.read(offset - 1, offset) + inserted + text.read(offset + deleted, offset + deleted + 1)
+    if '*/' in around and tokens.openers:
+        opener = tokens.openers[0] - 1
+        while tokens.gap > opener:
+            tokens.move_left()
+    first = tokens.gap
+    if first < len(tokens):
+        pos = min(tokens.start(first), offset)
+    else:
+        pos = tokens.end(first - 1) if first else 0
+
+    # Old tokens starting past the edit, with an unchanged character in
+    # front of them for the leading \b patterns, are candidates to resync on.
+    # Old tokens are only dropped once the new ones lexed, so a SyntaxError
+    # leaves the document as it was.
+    def old_brace(index, shift):
+        start = tokens.start(index) + shift
+        return text.read(start, start + 1) if tokens.type(index) == TokenType.PUNCTUATOR else ''
+
+    stale = first
+    braces = []
+    while stale < len(tokens) and tokens.start(stale) < offset + deleted + 1:
+        braces.append(old_brace(stale, 0))
+        stale += 1
+    removed_text = text.read(offset, offset + deleted)
+    text.replace(offset, deleted, inserted)
+    end = len(text)
+    shift = end - tokens.length
+
+    match_token = TOKEN_REGEX.match
+    skip_whitespace = WHITESPACE_REGEX.match
+    lexed = []
+    size = WINDOW
+    base = max(pos - 1, 0)
+    window = text.read(base, base + size)
+    while True:
+        local = skip_whitespace(window, pos - base).end()
+        pos = base + local
+        more = base + len(window) < end
+        if more and local == len(window):
+            base, size = max(pos - 1, 0), size if pos - 1 > base else 2 * size
+            window = text.read(base, base + size)
+            continue
+        while stale < len(tokens) and tokens.start(stale) + shift < pos:
+            braces.append(old_brace(stale, shift))
+            stale += 1
+        if pos == end or stale < len(tokens) and tokens.start(stale) + shift == pos:
+            break
+        match = match_token(window, local)
+        if more and (match is None or match.end() + LOOKAHEAD > len(window)
+                     or _inside_block_comment(window, local)):
+            base, size = max(pos - 1, 0), size if pos - 1 > base else 2 * size
+            window = text.read(base, base + size)
+            continue
+        if match is None:
+            text.replace(offset, len(inserted), removed_text)
+            raise SyntaxError(f'Unknown C++ syntax: {window[local:]}')
+        type_id, token_start, token_end = token_span(match)
+        lexed.append((type_id, base + token_start, base + token_end))
+        pos = base + match.end()
+
+    for _ in range(first, stale):
+        tokens.remove()
+    tokens.length = end
+    for token in lexed:
+        tokens.append(*token)
+    return first, stale, tokens.gap, ''.join(value for value in braces if value in ('{', '}'))
+
+
+def relex(source, tokens, offset, deleted, inserted):
+    text = _GapText(source)
+    columns = _GapTokens(tokens, text)
+    first, old_stop, new_stop, _ = _relex(text, columns, offset, deleted, inserted)
+    return str(text), columns.stream(tokens.token_types, tokens.encoding), (first, old_stop, new_stop)
+
+
+class IncrementalDocument:
+    def __init__(self, source):
+        stream = lex_compact(source)
+        self.token_types, self.encoding = stream.token_types, stream.encoding
+        self.text = _GapText(source)
+        self.columns = _GapTokens(stream, self.text)
+        self.relexed = 0
+        self._reparse(None)
+
+    @property
+    def source(self):
+        return str(self.text)
+
+    @property
+    def tokens(self):
+        return self.columns.stream(self.token_types, self.encoding)
+
+    @property
+    def blocks(self):
+        return _blocks(self.ast)
+
+    def _tokens(self, start, stop, opened):
+        # The tokens of start:stop for parse. A block whose braces are still
+        # paired is unchanged and passed on as an empty {}, to get its old
+        # children back afterwards; other braces are paired here. opened
+        # gets (index, old block or None) for every { passed on, in order.
+        columns = self.columns
+        stack = []
+        index = start
+        while index < stop:
+            token = columns.token(index)
+            if token == OPEN:
+                partner = columns.partner(index)
+                opened.append((index, None if partner is None else columns.node(index)))
+                if partner is not None:
+                    yield OPEN
+                    yield CLOSE
+                    index = partner + 1
+                    continue
+                stack.append(index)
+            elif token == CLOSE and stack:
+                columns.pair(stack.pop(), index)
+            yield token
+            index += 1
+
+    def _enclosing(self, index, count=None):
+        # Up to count unpaired or outward paired { before index, innermost
+        # first, walking only the blocks around it.
+        columns = self.columns
+        found = []
+        index -= 1
+        while index >= 0 and (count is None or len(found) < count):
+            brace = _brace(columns, index)
+            if brace == '}':
+                partner = columns.partner(index)
+                if partner is None:
+                    break
+                index = partner
+            elif brace == '{':
+                found.append(index)
+            index -= 1
+        return found
+
+    def _closing(self, index, count=None):
+        columns = self.columns
+        found = []
+        while index < len(columns) and (count is None or len(found) < count):
+            brace = _brace(columns, index)
+            if brace == '{':
+                partner = columns.partner(index)
+                if partner is None:
+                    break
+                index = partner
+            elif brace == '}':
+                found.append(index)
+            index += 1
+        return found
+
+    def _reparse(self, opening):
+        columns = self.columns
+        opened = []
+        if opening is None:
+            block = self.ast = parse(self._tokens(0, len(columns), opened))
+            fresh = _blocks(block)
+        else:
+            block = columns.node(opening)
+            tokens = self._tokens(opening + 1, columns.partner(opening), opened)
+            fresh = _blocks(parse(itertools.chain([OPEN], tokens, [CLOSE])))
+            block.children = fresh.pop(0).children
+        for node, (index, old) in zip(fresh, opened):
+            if old is not None:
+                node.children = old.children
+            columns.set_node(index, node)
+        self.reparsed = block
+        return self.ast
+
+    def edit(self, offset, deleted, inserted):
+        columns = self.columns
+        first, old_stop, new_stop, removed = _relex(self.text, columns, offset, deleted, inserted)
+        self.relexed = new_stop - first
+
+        # The braces taken out and put in each pair up among themselves but
+        # for a few closing and opening ones, which paired with the blocks
+        # around the edit. Those blocks are paired afresh, and the next one
+        # out, which keeps its braces, is reparsed; with a different balance
+        # every block around the edit changes, so the whole program is.
+        closes, opens = _unmatched(removed)
+        added = ''.join(_brace(columns, index) or '' for index in range(first, new_stop))
+        new_closes, new_opens = _unmatched(added)
+        if new_opens - new_closes == opens - closes:
+            enclosing = self._enclosing(first, max(closes, new_closes) + 1)
+            closing = self._closing(new_stop, max(opens, new_opens) + 1)
+            if (len(enclosing) == max(closes, new_closes) + 1 and len(closing) == max(opens, new_opens) + 1
+                    and columns.partner(enclosing[-1]) == closing[-1]):
+                for index in enclosing[:-1] + closing[:-1]:
+                    columns.unpair(index)
+                return self._reparse(enclosing[-1])
+        for index in self._enclosing(first) + self._closing(new_stop):
+            columns.unpair(index)
+        return self._reparse(None)
@@ -0,0 +1,37 @@
+import random
+import unittest
+
+from .cpp_parser import cpp_code, lexer, parse, parse_arena, preorder, walk
+from .test_cpp_parser import _random_cpp
+
+
+class TestASTArena(unittest.TestCase):
+    def test_matches_node_tree(self):
+        rng = random.Random(6)
+        sources = [cpp_code, '{' * 50 + 'int x;' + '}' * 50]
+        sources += ['int f() {' + _random_cpp(rng).replace('{', '').replace('}', '') + '}' for _ in range(100)]
+        for source in sources:
+            try:
+                tokens = lexer(source)
+            except SyntaxError:
+                continue
+            tree, arena = parse(tokens), parse_arena(tokens)
+            self.assertEqual([(node.type, node.value) for node in preorder(tree)],
+                             [(arena.type_of(node), arena.value_of(node)) for node in arena.preorder()])
+            self.assertEqual([(node.type, entering) for node, entering in walk(tree)],
+                             [(arena.type_of(node), entering) for node, entering in arena.walk()])
+            for node in arena.preorder():
+                for child in arena.children(node):
+                    self.assertEqual(arena.parent_of(child), node)
+
+    def test_deep_nesting_without_recursion(self):
+        depth = 20000
+        tokens = lexer('{' * depth + 'int x;' + '}' * depth)
+        arena = parse_arena(tokens)
+        self.assertEqual(len(arena), depth + 2)
+        self.assertEqual(list(arena.postorder())[0], depth + 1)
+        self.assertIn('Declaration(int x, [])', repr(parse(tokens)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+from .batch import SOURCE_EXTENSIONS, batch_parse, summarize
+from .cpp_parser import cpp_code, lex_compact, parse
+
+
+class TestBatchParse(unittest.TestCase):
+    def test_pool_matches_sequential_parse(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sources = {f'f{number}.cpp': cpp_code * (number + 1) for number in range(5)}
+            sources['broken.cc'] = 'int x = 1; $'
+            sources['notes.txt'] = 'not C++'
+            sources['unicode.h'] = 'int x = 1٣;\n'
+            for name, source in sources.items():
+                with open(os.path.join(directory, name), 'w', encoding='utf-8') as file:
+                    file.write(source)
+            sequential = batch_parse(directory, workers=1)
+            self.assertEqual(batch_parse(directory, workers=2, chunk_size=2), sequential)
+            self.assertEqual([os.path.basename(result['path']) for result in sequential],
+                             sorted(name for name in sources if name.endswith(SOURCE_EXTENSIONS)))
+            for result in sequential:
+                source = sources[os.path.basename(result['path'])]
+                if result['path'].endswith('broken.cc'):
+                    self.assertTrue(result['error'].startswith('SyntaxError'))
+                    continue
+                tokens = lex_compact(source)
+                self.assertIsNone(result['error'])
+                self.assertEqual(result['tokens'], len(tokens))
+                self.assertEqual(result['ast'], summarize(parse(tokens)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import io
+import re
+import os
+import random
+import tempfile
+import unittest
+
+from .cpp_parser import (
+    TOKENS, TokenType, cpp_code, lex_file, lex_mmap, lex_stream, lexer, parse, parse_arena, preorder, write_ast_dot,
+)
+
+
+def _reference_lexer(cpp):
+    # The original lexer: every pattern tried in order on the rest of the
+    # input, which is sliced off after each token. Unlike the original it
+    # accepts trailing whitespace.
+    tokens = []
+    while cpp.strip():
+        cpp = cpp.lstrip()
+        for token_type, token_regex in TOKENS:
+            match = re.match(token_regex, cpp)
+            if match:
+                if token_type != TokenType.WHITESPACE:
+                    tokens.append((token_type, match.group(0).strip()))
+                cpp = cpp[match.end():]
+                break
+        else:
+            raise SyntaxError(f'Unknown C++ syntax: {cpp}')
+    return tokens
+
+
+def _random_cpp(rng, pieces=('int', 'x', 'y1', '10', '2.5', '=', '+', '<=', '/', '*', '{', '}', '(', ')', ';',
+                             ' ', '\n', '// c \n', '/* k\n */', '/*', '*/', 'é')):
+    return ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+
+
+class TestLexStream(unittest.TestCase):
+    def expected(self, source):
+        try:
+            return _reference_lexer(source)
+        except SyntaxError:
+            return SyntaxError
+
+    def lexed(self, tokens):
+        try:
+            return list(tokens)
+        except SyntaxError:
+            return SyntaxError
+
+    def test_string_matches_reference(self):
+        rng = random.Random(2)
+        for source in [cpp_code] + [_random_cpp(rng) for _ in range(300)]:
+            self.assertEqual(self.lexed(lex_stream(source)), self.expected(source), source)
+
+    def test_small_chunks_match_whole_input(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            source = _random_cpp(rng)
+            expected = self.expected(source)
+            for chunk_size in (1, 2, 3, 7):
+                data = source.encode('utf-8')
+                self.assertEqual(self.lexed(lex_stream(io.BytesIO(data), chunk_size)), expected, (source, chunk_size))
+                self.assertEqual(self.lexed(lex_stream(io.StringIO(source), chunk_size)), expected, (source, chunk_size))
+
+    def test_files_and_mmap(self):
+        rng = random.Random(4)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sample.cpp')
+            for source in (cpp_code, '', 'int é = 1; /* ' + 'x' * 200 + ' */ y = 2;', _random_cpp(rng)):
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(source)
+                expected = self.expected(source)
+                self.assertEqual(self.lexed(lex_file(path, chunk_size=5)), expected)
+                self.assertEqual(self.lexed(lex_mmap(path, chunk_size=5)), expected)
+
+
+class TestWriteASTDot(unittest.TestCase):
+    def dot_tree(self, path):
+        with open(path, encoding='utf-8') as dot:
+            text = dot.read()
+        labels = dict(re.findall(r'\t(\w+) \[label="(.*)"\]', text))
+        edges = re.findall(r'\t(\w+) -> (\w+)', text)
+        return labels, edges
+
+    def test_tree_and_arena(self):
+        tokens = lexer(cpp_code)
+        tree = parse(tokens)
+        expected = [f'{node.type}({node.value})' for node in preorder(tree)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ast.dot')
+            for source in (tree, parse_arena(tokens)):
+                self.assertEqual(write_ast_dot(source, path), len(expected))
+                labels, edges = self.dot_tree(path)
+                self.assertEqual(list(labels.values()), expected)
+                self.assertEqual(len(edges), len(expected) - 1)
+                self.assertTrue(all(parent in labels and child in labels for parent, child in edges))
+
+            self.assertEqual(write_ast_dot(tree, path, max_nodes=3), 3)
+            self.assertEqual(len(self.dot_tree(path)[0]), 3)
+            self.assertEqual(write_ast_dot(tree, path, max_depth=1), 1 + len(tree.children))
+
+
+if __name__ == '__main__':
+    unittest.main()
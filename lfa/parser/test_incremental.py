@@ -0,0 +1,117 @@
+import random
+import time
+import unittest
+
+from .cpp_parser import lex_compact, parse
+from .incremental import IncrementalDocument, relex
+
+
+PIECES = ['a', 'b', 'x1', 'int ', '1', '2.5', ' ', '  ', '\n', '=', '+', '*', '/', '/*', '*/', '//', ';', '(', ')', '{', '}']
+
+
+def _lexes(source):
+    try:
+        return lex_compact(source)
+    except SyntaxError:
+        return None
+
+
+class TestRelex(unittest.TestCase):
+    def assertSameTokens(self, stream, expected):
+        self.assertEqual((stream.types, stream.starts, stream.ends), (expected.types, expected.starts, expected.ends))
+
+    def test_trailing_spaces_after_line_comment(self):
+        source = 'int main() {\n    x = 1; // note  \n}\n'
+        offset = source.index('note  ') + len('note  ')
+        new_source, stream, _ = relex(source, lex_compact(source), offset, 0, 'int y')
+        self.assertSameTokens(stream, lex_compact(new_source))
+
+        document = IncrementalDocument(source)
+        document.edit(offset, 0, 'int y')
+        self.assertEqual(repr(document.ast), repr(parse(lex_compact(document.source))))
+
+    def test_closing_comment_inside_operator(self):
+        source = '\ny  {  (a*/ = /*/*int {'
+        new_source, stream, _ = relex(source, lex_compact(source), 20, 0, '*/{')
+        self.assertSameTokens(stream, lex_compact(new_source))
+
+    def test_random_edits_match_full_lex(self):
+        rng = random.Random(5)
+        checked = 0
+        while checked < 3000:
+            source = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 25)))
+            tokens = _lexes(source)
+            if tokens is None:
+                continue
+            offset = rng.randint(0, len(source))
+            deleted = rng.randint(0, min(3, len(source) - offset))
+            inserted = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 3)))
+            expected = _lexes(source[:offset] + inserted + source[offset + deleted:])
+            if expected is None:
+                continue
+            new_source, stream, _ = relex(source, tokens, offset, deleted, inserted)
+            with self.subTest(source=source, offset=offset, deleted=deleted, inserted=inserted):
+                self.assertSameTokens(stream, expected)
+            checked += 1
+
+    def test_random_edits_match_full_parse(self):
+        rng = random.Random(6)
+        lines = ['  x = 1;\n', '  int y;\n', '  { z = 2; }\n', '  // c  \n', '  /* k */\n', '  {\n  int q;\n  }\n']
+        for _ in range(300):
+            body = ''.join(rng.choice(lines) for _ in range(rng.randint(1, 8)))
+            document = IncrementalDocument('int f() {\n' + body + '}\nint g;\n')
+            for _ in range(5):
+                source = document.source
+                offset = rng.randint(0, len(source))
+                deleted = rng.randint(0, min(3, len(source) - offset))
+                inserted = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 3)))
+                expected = _lexes(source[:offset] + inserted + source[offset + deleted:])
+                if expected is None:
+                    break
+                try:
+                    tree = parse(expected)
+                except IndexError:
+                    break
+                document.edit(offset, deleted, inserted)
+                with self.subTest(source=source, offset=offset, deleted=deleted, inserted=inserted):
+                    self.assertEqual(repr(document.ast), repr(tree))
+
+    def test_edit_reparses_innermost_block(self):
+        source = 'int f() {\n' + '  x = 1;\n' * 1000 + '  { y = 2; }\n}\n'
+        document = IncrementalDocument(source)
+        offset = source.index('y = 2') + len('y = 2')
+        document.edit(offset, 0, '0')
+        self.assertIs(document.reparsed, document.blocks[1])
+        self.assertEqual(repr(document.ast), repr(parse(lex_compact(document.source))))
+
+    def test_failed_edit_leaves_document_unchanged(self):
+        source = 'int f() {\n  x = 1;\n}\n'
+        document = IncrementalDocument(source)
+        tree = repr(document.ast)
+        with self.assertRaises(SyntaxError):
+            document.edit(source.index('x'), 1, '$')
+        self.assertEqual(document.source, source)
+        self.assertSameTokens(document.tokens, lex_compact(source))
+        self.assertEqual(repr(document.ast), tree)
+
+    def test_edit_cost_does_not_grow_with_file_size(self):
+        def cost(functions):
+            source = ''.join(f'int f{k}() {{\n  x = 1;\n  int y;\n}}\n' for k in range(functions))
+            document = IncrementalDocument(source)
+            offset = source.index(f'int f{functions // 2}(') + len(f'int f{functions // 2}() {{\n  x = 1')
+            edits = [(offset, 0, '2'), (offset, 1, ''), (offset + 1, 0, ' { z; }'), (offset + 1, 7, '')]
+            best = float('inf')
+            for _ in range(5):
+                start = time.perf_counter()
+                for edit in edits * 10:
+                    document.edit(*edit)
+                best = min(best, time.perf_counter() - start)
+            self.assertEqual(document.source, source)
+            return best
+
+        small, large = cost(400), cost(8000)
+        self.assertLess(large, 3 * small)
+
+
+if __name__ == '__main__':
+    unittest.main()
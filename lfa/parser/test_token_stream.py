@@ -0,0 +1,57 @@
+import os
+import random
+import pathlib
+import tempfile
+import unittest
+
+from .cpp_parser import cpp_code, lex_compact, lexer
+from .test_cpp_parser import _random_cpp
+
+
+class TestTokenStream(unittest.TestCase):
+    def test_matches_lexer(self):
+        rng = random.Random(3)
+        for source in [cpp_code] + [_random_cpp(rng) for _ in range(200)]:
+            try:
+                expected = lexer(source)
+            except SyntaxError:
+                continue
+            self.assertEqual(list(lex_compact(source)), expected, source)
+            self.assertEqual(list(lex_compact(source.encode('utf-8'))), expected, source)
+
+    def test_path_slices_and_spans(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sample.cpp')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(cpp_code)
+            stream = lex_compact(pathlib.Path(path))
+            expected = lexer(cpp_code)
+            self.assertEqual(list(stream), expected)
+            self.assertEqual(list(stream[2:5]), expected[2:5])
+            self.assertEqual(stream[-1], expected[-1])
+            self.assertIsInstance(stream.span(0), memoryview)
+            self.assertEqual(bytes(stream.span(0)), expected[0][1].encode())
+            self.assertEqual(stream.nbytes(), len(stream) * (1 + 2 * stream.starts.itemsize))
+            del stream
+            with lex_compact(pathlib.Path(path)) as stream:
+                self.assertEqual(list(stream), expected)
+            self.assertTrue(stream.source.closed)
+
+    def test_non_ascii_matches_lexer(self):
+        # \s, \d and \w reach past ASCII in the str patterns only.
+        sources = ['x = 1٣;', 'int\u3000y;', 'a\x1cb;', '// ünïcode\nint z;', 'y = 2.5٣ + b;']
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sample.cpp')
+            for source in sources:
+                expected = lexer(source)
+                self.assertEqual(list(lex_compact(source.encode('utf-8'))), expected, source)
+                with open(path, 'w', encoding='utf-8', newline='') as file:
+                    file.write(source)
+                with lex_compact(pathlib.Path(path)) as stream:
+                    self.assertEqual(list(stream), expected, source)
+        with self.assertRaises(SyntaxError):
+            lex_compact('int xé = 1;'.encode('utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+from array import array
+
+
+class TokenStream:
+    def __init__(self, source, token_types, encoding='utf-8'):
+        self.source = source
+        self.token_types = list(token_types)
+        self.encoding = encoding
+        offset_code = 'I' if len(source) < 1 << 32 else 'Q'
+        self.types = array('B')
+        self.starts = array(offset_code)
+        self.ends = array(offset_code)
+
+    def append(self, type_id, start, end):
+        self.types.append(type_id)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def type(self, index):
+        return self.token_types[self.types[index]]
+
+    def span(self, index):
+        start, end = self.starts[index], self.ends[index]
+        if isinstance(self.source, str):
+            return self.source[start:end]
+        return memoryview(self.source)[start:end]
+
+    def value(self, index):
+        start, end = self.starts[index], self.ends[index]
+        if isinstance(self.source, str):
+            return self.source[start:end]
+        return str(memoryview(self.source)[start:end], self.encoding)
+
+    def close(self):
+        # Streams lexed from a path own the mmap under them.
+        if hasattr(self.source, 'close'):
+            self.source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (self.types, self.starts, self.ends))
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            stream = TokenStream(self.source, self.token_types, self.encoding)
+            stream.types = self.types[index]
+            stream.starts = self.starts[index]
+            stream.ends = self.ends[index]
+            return stream
+        if index < 0:
+            index += len(self)
+        return self.type(index), self.value(index)
+
+    def __iter__(self):
+        token_types = self.token_types
+        value = self.value
+        for index, type_id in enumerate(self.types):
+            yield token_types[type_id], value(index)
+
+    def __repr__(self):
+        return f"TokenStream({len(self)} tokens, {self.nbytes()} bytes)"
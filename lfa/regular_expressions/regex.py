@@ -0,0 +1,474 @@
+import random
+import functools
+import itertools
+
+
+def parse_regex(regex):
+    items = []
+    i = 0
+    while i < len(regex):
+        if regex[i] == '(':
+            j = i
+            while regex[j] != ')':
+                j += 1
+            alternatives = regex[i + 1:j].split('|')
+            i = j + 1
+        else:
+            alternatives = [regex[i]]
+            i += 1
+        quantifier = None
+        power = None
+        if i < len(regex) and regex[i] in '*+?>':
+            quantifier = regex[i]
+            i += 1
+            if quantifier == '>':
+                x = regex[i:].find('<')
+                if x == -1:
+                    raise ValueError("No matching '<' for power expression.")
+                power = int(regex[i:i + x])
+                i += x + 1
+        items.append((alternatives, quantifier, power))
+    return items
+
+
+def _repetitions(quantifier, limit):
+    if quantifier == '*':
+        return range(limit + 1)
+    if quantifier == '+':
+        return range(1, limit + 1)
+    return None
+
+
+def item_choices(item, limit=5, budget=None):
+    alternatives, quantifier, power = item
+    repetitions = _repetitions(quantifier, limit)
+    if repetitions is None:
+        if quantifier == '?':
+            choices = [''] + alternatives
+        elif quantifier == '>':
+            choices = (alternative * power for alternative in alternatives)
+        else:
+            choices = alternatives
+        for choice in choices:
+            if budget is None or len(choice) <= budget:
+                yield choice
+        return
+
+    shortest = min(len(alternative) for alternative in alternatives)
+    for n in repetitions:
+        if budget is not None and n * shortest > budget:
+            return
+        for product in itertools.product(alternatives, repeat=n):
+            choice = ''.join(product)
+            if budget is None or len(choice) <= budget:
+                yield choice
+
+
+def _min_length(item):
+    alternatives, quantifier, power = item
+    shortest = min(len(alternative) for alternative in alternatives)
+    if quantifier in ('*', '?'):
+        return 0
+    if quantifier == '>':
+        return shortest * power
+    return shortest
+
+
+def iter_sequences_from_regex(regex, limit=5, max_length=None):
+    items = parse_regex(regex)
+    remaining = [0] * (len(items) + 1)
+    for index in range(len(items) - 1, -1, -1):
+        remaining[index] = remaining[index + 1] + _min_length(items[index])
+
+    def extend(index, prefix):
+        if index == len(items):
+            yield prefix
+            return
+        budget = None if max_length is None else max_length - len(prefix) - remaining[index + 1]
+        for choice in item_choices(items[index], limit, budget):
+            yield from extend(index + 1, prefix + choice)
+
+    if max_length is None or remaining[0] <= max_length:
+        yield from extend(0, '')
+
+
+def generate_sequences_from_regex(regex, limit=5):
+    return list(iter_sequences_from_regex(regex, limit))
+
+
+def _fixed_choices(item):
+    alternatives, quantifier, power = item
+    if quantifier == '?':
+        return [''] + alternatives
+    if quantifier == '>':
+        return [alternative * power for alternative in alternatives]
+    return alternatives
+
+
+def item_count(item, limit=5):
+    repetitions = _repetitions(item[1], limit)
+    if repetitions is None:
+        return len(_fixed_choices(item))
+    return sum(len(item[0]) ** n for n in repetitions)
+
+
+def item_choice(item, index, limit=5):
+    alternatives, quantifier, power = item
+    repetitions = _repetitions(quantifier, limit)
+    if repetitions is None:
+        return _fixed_choices(item)[index]
+    m = len(alternatives)
+    for n in repetitions:
+        if index < m ** n:
+            break
+        index -= m ** n
+    digits = []
+    for _ in range(n):
+        index, digit = divmod(index, m)
+        digits.append(alternatives[digit])
+    return ''.join(reversed(digits))
+
+
+def count_sequences(regex, limit=5, length=None):
+    if length is not None:
+        counts = count_sequences_by_length(regex, limit)
+        return counts[length] if length < len(counts) else 0
+    total = 1
+    for item in parse_regex(regex):
+        total *= item_count(item, limit)
+    return total
+
+
+def _convolve(left, right):
+    result = [0] * (len(left) + len(right) - 1)
+    for i, a in enumerate(left):
+        if a:
+            for j, b in enumerate(right):
+                if b:
+                    result[i + j] += a * b
+    return result
+
+
+def _histogram(strings):
+    counts = [0] * (max(map(len, strings)) + 1)
+    for string in strings:
+        counts[len(string)] += 1
+    return counts
+
+
+def _repetition_lengths(item, limit):
+    # Entry n counts the n-fold products of the alternatives by total length.
+    histogram = _histogram(item[0])
+    lengths = [[1]]
+    for _ in range(limit):
+        lengths.append(_convolve(lengths[-1], histogram))
+    return lengths
+
+
+def _item_lengths(item, limit):
+    repetitions = _repetitions(item[1], limit)
+    if repetitions is None:
+        return _histogram(_fixed_choices(item))
+    lengths = _repetition_lengths(item, limit)
+    total = [0] * len(lengths[repetitions[-1]]) if repetitions else [0]
+    for n in repetitions:
+        for size, count in enumerate(lengths[n]):
+            total[size] += count
+    return total
+
+
+def count_sequences_by_length(regex, limit=5):
+    counts = [1]
+    for item in parse_regex(regex):
+        counts = _convolve(counts, _item_lengths(item, limit))
+    return counts
+
+
+def unrank_sequence(regex, index, limit=5):
+    items = parse_regex(regex)
+    counts = [item_count(item, limit) for item in items]
+    total = 1
+    for count in counts:
+        total *= count
+    if not 0 <= index < total:
+        raise IndexError(f'sequence index {index} out of range for {total} sequences')
+    parts = []
+    for item, count in zip(reversed(items), reversed(counts)):
+        index, digit = divmod(index, count)
+        parts.append(item_choice(item, digit, limit))
+    return ''.join(reversed(parts))
+
+
+def rank_sequence(regex, sequence, limit=5):
+    items = parse_regex(regex)
+    size = len(sequence)
+    positions = range(size + 1)
+
+    # feasible[k][p]: items[k:] can produce sequence[p:]. For starred items
+    # finish[n][p] additionally fixes the number of repetitions left to n.
+    feasible = [None] * len(items) + [[position == size for position in positions]]
+    finishes = [None] * len(items)
+    for k in range(len(items) - 1, -1, -1):
+        after = feasible[k + 1]
+        repetitions = _repetitions(items[k][1], limit)
+        if repetitions is None:
+            feasible[k] = [any(sequence.startswith(choice, position) and after[position + len(choice)]
+                               for choice in _fixed_choices(items[k])) for position in positions]
+            continue
+        finish = [after]
+        for _ in range(limit):
+            previous = finish[-1]
+            finish.append([any(sequence.startswith(alternative, position) and previous[position + len(alternative)]
+                               for alternative in items[k][0]) for position in positions])
+        finishes[k] = finish
+        feasible[k] = [any(finish[n][position] for n in repetitions) for position in positions]
+    if not feasible[0][0]:
+        raise ValueError(f'{sequence!r} is not generated by {regex!r} with limit={limit}')
+
+    rank = 0
+    position = 0
+    for k, item in enumerate(items):
+        alternatives, quantifier, power = item
+        finish = finishes[k]
+        if finish is None:
+            after = feasible[k + 1]
+            for index, choice in enumerate(_fixed_choices(item)):
+                if sequence.startswith(choice, position) and after[position + len(choice)]:
+                    break
+            position += len(choice)
+        else:
+            repetitions = _repetitions(quantifier, limit)
+            m = len(alternatives)
+            n = next(n for n in repetitions if finish[n][position])
+            index = sum(m ** j for j in repetitions if j < n)
+            digits = 0
+            for remaining in range(n - 1, -1, -1):
+                for digit, alternative in enumerate(alternatives):
+                    if sequence.startswith(alternative, position) and finish[remaining][position + len(alternative)]:
+                        break
+                digits = digits * m + digit
+                position += len(alternative)
+            index += digits
+        rank = rank * item_count(item, limit) + index
+    return rank
+
+
+def _weighted_choice(rng, weights):
+    target = rng.randrange(sum(weights))
+    for index, weight in enumerate(weights):
+        if target < weight:
+            return index
+        target -= weight
+
+
+def _sample_item(item, size, limit, rng):
+    alternatives, quantifier, power = item
+    repetitions = _repetitions(quantifier, limit)
+    if repetitions is None:
+        choices = [choice for choice in _fixed_choices(item) if len(choice) == size]
+        return choices[rng.randrange(len(choices))]
+    lengths = _repetition_lengths(item, limit)
+    at = lambda counts, length: counts[length] if 0 <= length < len(counts) else 0
+    n = repetitions[_weighted_choice(rng, [at(lengths[n], size) for n in repetitions])]
+    parts = []
+    for remaining in range(n - 1, -1, -1):
+        weights = [at(lengths[remaining], size - len(alternative)) for alternative in alternatives]
+        alternative = alternatives[_weighted_choice(rng, weights)]
+        parts.append(alternative)
+        size -= len(alternative)
+    return ''.join(parts)
+
+
+def sample_sequences(regex, k=1, limit=5, length=None, seed=None):
+    rng = random.Random(seed)
+    if length is None:
+        total = count_sequences(regex, limit)
+        return [unrank_sequence(regex, rng.randrange(total), limit) for _ in range(k)]
+
+    items = parse_regex(regex)
+    item_lengths = [_item_lengths(item, limit) for item in items]
+    # suffixes[i][L]: ways for items[i:] to produce a string of length L.
+    suffixes = [[1]]
+    for lengths in reversed(item_lengths):
+        suffixes.append(_convolve(lengths, suffixes[-1]))
+    suffixes.reverse()
+    at = lambda counts, size: counts[size] if 0 <= size < len(counts) else 0
+    if at(suffixes[0], length) == 0:
+        raise ValueError(f'{regex!r} generates no sequence of length {length} with limit={limit}')
+
+    samples = []
+    for _ in range(k):
+        parts = []
+        remaining = length
+        for index, item in enumerate(items):
+            lengths = item_lengths[index]
+            size = _weighted_choice(rng, [count * at(suffixes[index + 1], remaining - size)
+                                          for size, count in enumerate(lengths)])
+            parts.append(_sample_item(item, size, limit, rng))
+            remaining -= size
+        samples.append(''.join(parts))
+    return samples
+
+
+EPSILON = 'ε'
+
+
+class _ThompsonBuilder:
+    def __init__(self):
+        self.transitions = {}
+
+    def state(self):
+        name = f'q{len(self.transitions)}'
+        self.transitions[name] = {}
+        return name
+
+    def edge(self, source, symbol, target):
+        self.transitions[source].setdefault(symbol, []).append(target)
+
+    def literal(self, text):
+        start = current = self.state()
+        for char in text:
+            following = self.state()
+            self.edge(current, char, following)
+            current = following
+        return start, current
+
+    def union(self, texts):
+        start, end = self.state(), self.state()
+        for text in texts:
+            first, last = self.literal(text)
+            self.edge(start, EPSILON, first)
+            self.edge(last, EPSILON, end)
+        return start, end
+
+    def repeat(self, texts, minimum, limit):
+        start, end = self.state(), self.state()
+        if limit is None:
+            current = start
+            for _ in range(minimum):
+                first, last = self.union(texts)
+                self.edge(current, EPSILON, first)
+                current = last
+            first, last = self.union(texts)
+            self.edge(current, EPSILON, first)
+            self.edge(last, EPSILON, first)
+            self.edge(current, EPSILON, end)
+            self.edge(last, EPSILON, end)
+            return start, end
+        current = start
+        for count in range(limit):
+            if count >= minimum:
+                self.edge(current, EPSILON, end)
+            first, last = self.union(texts)
+            self.edge(current, EPSILON, first)
+            current = last
+        if limit >= minimum:
+            self.edge(current, EPSILON, end)
+        return start, end
+
+    def item(self, item, limit):
+        alternatives, quantifier, power = item
+        if quantifier == '*':
+            return self.repeat(alternatives, 0, limit)
+        if quantifier == '+':
+            return self.repeat(alternatives, 1, limit)
+        if quantifier == '>':
+            return self.union([alternative * power for alternative in alternatives])
+        return self.union(_fixed_choices(item))
+
+
+def regex_to_nfa(regex, limit=None):
+    from ..finite_automata.automaton import FiniteAutomaton
+
+    items = parse_regex(regex)
+    builder = _ThompsonBuilder()
+    start = end = builder.state()
+    for item in items:
+        first, last = builder.item(item, limit)
+        builder.edge(end, EPSILON, first)
+        end = last
+
+    alphabet = sorted({char for alternatives, _, _ in items for alternative in alternatives for char in alternative})
+    transitions = builder.transitions
+    return FiniteAutomaton(list(transitions), alphabet, transitions, start, [end])
+
+
+class RegexMatcher:
+    def __init__(self, regex, limit=None):
+        self.regex = regex
+        self.limit = limit
+        self.dfa = regex_to_nfa(regex, limit).to_dfa()
+        self.transitions = {state: {symbol: targets[0] for symbol, targets in moves.items()}
+                            for state, moves in self.dfa.transition_function.items()}
+        self.accept = set(self.dfa.accept)
+
+    def match(self, string):
+        state = self.dfa.start
+        transitions = self.transitions
+        for char in string:
+            state = transitions.get(state, {}).get(char)
+            if state is None:
+                return False
+        return state in self.accept
+
+    def filter(self, strings):
+        return [string for string in strings if self.match(string)]
+
+
+@functools.lru_cache(maxsize=256)
+def compile_regex(regex, limit=None):
+    return RegexMatcher(regex, limit)
+
+
+def regex_matches(regex, string, limit=None):
+    return compile_regex(regex, limit).match(string)
+
+
+def describe_regex_processing(regex):
+    description = []
+    i = 0
+    while i < len(regex):
+        if regex[i] == '(':
+            j = i
+            while regex[j] != ')':
+                j += 1
+            group = regex[i + 1:j]
+            description.append(f"\nProcess group '{group}'")
+            i = j + 1
+            if i < len(regex) and regex[i] in '*+?':
+                quantifier = regex[i]
+                description.append(f"with quantifier '{quantifier}'")
+                i += 1
+            elif i < len(regex) and regex[i] == '>':
+                end_power = i + regex[i:].find('<')
+                if end_power == -1 or i == len(regex) - 1:
+                    raise ValueError("No matching '<' for power expression.")
+                power = regex[i+1:end_power]
+                description.append(f"with power quantifier repeating previous group/char {power} times")
+                i = end_power + 1
+        elif regex[i] in '*+?':
+            description.append(f"\nProcess character '{regex[i-1]}' with quantifier '{regex[i]}'")
+            i += 1
+        elif regex[i] == '>':
+            end_power = i + regex[i:].find('<')
+            if end_power == -1 or i == len(regex) - 1:
+                raise ValueError("No matching '<' for power expression.")
+            power = regex[i+1:end_power]
+            description.append(f"with power quantifier repeating previous char {power} times")
+            i = end_power + 1
+        else:
+            description.append(f"\nInclude character '{regex[i]}'")
+            i += 1
+    return ' '.join(description)
+
+
+
+if __name__ == '__main__':
+    regex = "(a|b)(c|d)E+G?"
+    #regex = "(P|Q|R|S)T(U|V|W|X)*Z+"
+    #regex = "1(0|1)*2(3|4)>5<36"
+    sequences = list(itertools.islice(iter_sequences_from_regex(regex), 10))
+    description = describe_regex_processing(regex)
+
+    print("\nFirst 10 sequences:", sequences, "\n")
+    print("Regex description:", description, "\n")
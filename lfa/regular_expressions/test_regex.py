@@ -0,0 +1,178 @@
+import re
+import unittest
+import itertools
+
+from .regex import (
+    RegexMatcher, count_sequences, count_sequences_by_length, generate_sequences_from_regex, iter_sequences_from_regex,
+    parse_regex, rank_sequence, regex_matches, sample_sequences, unrank_sequence,
+)
+
+
+# Each sample regex expanded by hand into its items, (alternatives,
+# quantifier, power), and into an equivalent Python pattern, so neither
+# oracle below goes through parse_regex.
+SAMPLE_ITEMS = {
+    '(a|b)(c|d)E+G?': [(['a', 'b'], None, None), (['c', 'd'], None, None), (['E'], '+', None), (['G'], '?', None)],
+    '1(0|1)*2(3|4)>5<36': [(['1'], None, None), (['0', '1'], '*', None), (['2'], None, None), (['3', '4'], '>', 5),
+                           (['3'], None, None), (['6'], None, None)],
+    '(ab|a)*b?': [(['ab', 'a'], '*', None), (['b'], '?', None)],
+    'x>3<(y|yy)+': [(['x'], '>', 3), (['y', 'yy'], '+', None)],
+    '(a|b)>2<c*': [(['a', 'b'], '>', 2), (['c'], '*', None)],
+    'M?N>2<(O|P)>3<Q*R+': [(['M'], '?', None), (['N'], '>', 2), (['O', 'P'], '>', 3), (['Q'], '*', None),
+                           (['R'], '+', None)],
+    '(a|b)>12<c>10<': [(['a', 'b'], '>', 12), (['c'], '>', 10)],
+    '(y|z)>11<w*': [(['y', 'z'], '>', 11), (['w'], '*', None)],
+}
+SAMPLE_PATTERNS = {
+    '(a|b)(c|d)E+G?': '(a|b)(c|d)E+G?',
+    '1(0|1)*2(3|4)>5<36': '1(0|1)*2(33333|44444)36',
+    '(ab|a)*b?': '(ab|a)*b?',
+    'x>3<(y|yy)+': 'xxx(y|yy)+',
+    '(a|b)>2<c*': '(aa|bb)c*',
+    'M?N>2<(O|P)>3<Q*R+': 'M?NN(OOO|PPP)Q*R+',
+    '(a|b)>12<c>10<': '(aaaaaaaaaaaa|bbbbbbbbbbbb)cccccccccc',
+    '(y|z)>11<w*': '(yyyyyyyyyyy|zzzzzzzzzzz)w*',
+}
+SAMPLE_REGEXES = list(SAMPLE_ITEMS)
+
+
+def _reference_sequences(regex, limit=5):
+    # Every item expanded to the full list of its choices, then the whole
+    # cartesian product built in memory, as the original generator did.
+    sequences = ['']
+    for alternatives, quantifier, power in SAMPLE_ITEMS[regex]:
+        if quantifier in ('*', '+'):
+            choices = [''.join(product) for n in range(0 if quantifier == '*' else 1, limit + 1)
+                       for product in itertools.product(alternatives, repeat=n)]
+        elif quantifier == '?':
+            choices = [''] + alternatives
+        elif quantifier == '>':
+            choices = [alternative * power for alternative in alternatives]
+        else:
+            choices = alternatives
+        sequences = [sequence + choice for sequence in sequences for choice in choices]
+    return sequences
+
+
+def _python_pattern(regex, limit=None):
+    # With a limit, * and + allow at most limit repetitions, as generation does.
+    pattern = SAMPLE_PATTERNS[regex]
+    if limit is not None:
+        pattern = pattern.replace('*', '{0,%d}' % limit).replace('+', '{1,%d}' % limit)
+    return re.compile(pattern)
+
+
+def _words(regex, length):
+    symbols = sorted(set(SAMPLE_PATTERNS[regex]) - set('()|*+?'))
+    return [''.join(word) for size in range(length + 1) for word in itertools.product(symbols, repeat=size)]
+
+
+class TestSequenceGeneration(unittest.TestCase):
+    def test_parse_regex(self):
+        for regex, items in SAMPLE_ITEMS.items():
+            self.assertEqual(parse_regex(regex), items)
+
+    def test_matches_python_patterns(self):
+        # The distinct sequences of at most 6 symbols are exactly the words
+        # of that length the equivalent Python pattern matches.
+        for regex in SAMPLE_REGEXES:
+            for limit in (1, 3):
+                pattern = _python_pattern(regex, limit)
+                expected = {word for word in _words(regex, 6) if pattern.fullmatch(word)}
+                generated = set(iter_sequences_from_regex(regex, limit, max_length=6))
+                self.assertEqual(generated, expected, (regex, limit))
+        self.assertEqual(generate_sequences_from_regex('(a|b)>12<c>10<'), ['a' * 12 + 'c' * 10, 'b' * 12 + 'c' * 10])
+
+    def test_matches_reference(self):
+        for regex in SAMPLE_REGEXES:
+            for limit in (0, 1, 3):
+                self.assertEqual(generate_sequences_from_regex(regex, limit), _reference_sequences(regex, limit))
+
+    def test_max_length(self):
+        for regex in SAMPLE_REGEXES:
+            expected = _reference_sequences(regex, 3)
+            for max_length in range(0, 12, 3):
+                self.assertEqual(list(iter_sequences_from_regex(regex, 3, max_length)),
+                                 [sequence for sequence in expected if len(sequence) <= max_length])
+
+    def test_lazy(self):
+        sequences = iter_sequences_from_regex('(a|b|c|d)*', limit=40)
+        self.assertEqual(list(itertools.islice(sequences, 3)), ['', 'a', 'b'])
+
+
+class TestSequenceCounting(unittest.TestCase):
+    def test_counts(self):
+        for regex in SAMPLE_REGEXES:
+            for limit in (0, 2, 3):
+                expected = _reference_sequences(regex, limit)
+                self.assertEqual(count_sequences(regex, limit), len(expected))
+                by_length = count_sequences_by_length(regex, limit)
+                for length in range(max(map(len, expected), default=0) + 2):
+                    count = sum(len(sequence) == length for sequence in expected)
+                    self.assertEqual(by_length[length] if length < len(by_length) else 0, count)
+                    self.assertEqual(count_sequences(regex, limit, length), count)
+
+    def test_rank_and_unrank(self):
+        for regex in SAMPLE_REGEXES:
+            expected = _reference_sequences(regex, 2)
+            for index, sequence in enumerate(expected):
+                self.assertEqual(unrank_sequence(regex, index, 2), sequence)
+                # Ambiguous regexes list a string more than once; rank finds
+                # one of its indices.
+                self.assertEqual(expected[rank_sequence(regex, sequence, 2)], sequence)
+            with self.assertRaises(IndexError):
+                unrank_sequence(regex, len(expected), 2)
+            with self.assertRaises(ValueError):
+                rank_sequence(regex, '#', 2)
+
+    def test_huge_language(self):
+        regex = '(a|b|c)*(d|e)+'
+        total = count_sequences(regex, limit=60)
+        self.assertEqual(total, sum(3 ** n for n in range(61)) * sum(2 ** n for n in range(1, 61)))
+        for index in (0, 12345, total // 3, total - 1):
+            self.assertEqual(rank_sequence(regex, unrank_sequence(regex, index, 60), 60), index)
+
+    def test_samples(self):
+        for regex in SAMPLE_REGEXES:
+            expected = set(_reference_sequences(regex, 3))
+            self.assertTrue(set(sample_sequences(regex, 50, 3, seed=1)) <= expected)
+            length = sorted(map(len, expected))[len(expected) // 2]
+            samples = sample_sequences(regex, 50, 3, length=length, seed=2)
+            self.assertTrue(all(sample in expected and len(sample) == length for sample in samples))
+
+    def test_samples_are_uniform(self):
+        # (a|b)*c? with limit 2 lists 14 distinct sequences, 6 of them of
+        # length 2; each should come up equally often. The bounds are the
+        # 0.999 chi-square quantiles for 13 and 5 degrees of freedom.
+        regex = '(a|b)*c?'
+        for length, bound in ((None, 34.53), (2, 20.52)):
+            expected = [sequence for sequence in generate_sequences_from_regex(regex, 2)
+                        if length is None or len(sequence) == length]
+            draws = 300 * len(expected)
+            frequency = dict.fromkeys(expected, 0)
+            for sample in sample_sequences(regex, draws, 2, length=length, seed=5):
+                frequency[sample] += 1
+            mean = draws / len(expected)
+            chi_square = sum((observed - mean) ** 2 / mean for observed in frequency.values())
+            self.assertEqual(len(frequency), len(expected))
+            self.assertLess(chi_square, bound, length)
+
+
+class TestRegexMatcher(unittest.TestCase):
+    def test_limited_matches_generated_sequences(self):
+        for regex in SAMPLE_REGEXES:
+            expected = set(_reference_sequences(regex, 2))
+            matcher = RegexMatcher(regex, limit=2)
+            words = _words(regex, min(max(map(len, expected)) + 1, 7))
+            self.assertEqual(matcher.filter(words), [word for word in words if word in expected])
+
+    def test_unlimited_matches_re(self):
+        for regex in SAMPLE_REGEXES:
+            pattern = _python_pattern(regex)
+            for word in _words(regex, 6):
+                self.assertEqual(regex_matches(regex, word), bool(pattern.fullmatch(word)), (regex, word))
+        self.assertFalse(regex_matches('(a|b)*', 'abz'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import random
+import tempfile
+import unittest
+
+from .artifact_cache import ArtifactCache, HEADER
+from .chomsky_normal_form.cfg_to_cnf import Grammar
+from .finite_automata.minimization import random_nfa
+from .lexer.cpp_lexer import SCANNER_RULES
+from .lexer.scanner import Scanner
+
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def reopen(self):
+        # A fresh cache on the same directory, so artifacts come from disk.
+        return ArtifactCache(self.directory.name)
+
+    def test_dfa_table_round_trip(self):
+        rng = random.Random(23)
+        words = [''.join(rng.choice('abc') for _ in range(rng.randint(0, 12))) for _ in range(300)]
+        for seed in range(5):
+            nfa = random_nfa(12, alphabet=('a', 'b'), seed=seed)
+            expected = nfa.simulate().match_many(words)
+            built = ArtifactCache(self.directory.name).dfa_table(nfa)
+            cache = self.reopen()
+            loaded = cache.dfa_table(nfa)
+            self.assertEqual(cache.hits, 1)
+            self.assertEqual(built.match_many(words), expected)
+            self.assertEqual(loaded.match_many(words), expected)
+            self.assertEqual([loaded.match(word) for word in words], expected)
+            self.assertTrue(loaded.to_automaton().is_equivalent(nfa))
+
+    def test_cnf_round_trip(self):
+        grammar = Grammar(['S', 'A', 'B'], ['a', 'b'], {'S': ['AB', 'aSb', 'ε'], 'A': ['a', 'B'], 'B': ['b']}, 'S')
+        expected = Grammar(list(grammar.non_terminals), list(grammar.terminals), grammar.productions, 'S')
+        expected.convert_to_cnf()
+        ArtifactCache(self.directory.name).cnf(grammar)
+        loaded = self.reopen().cnf(grammar)
+        self.assertEqual(loaded.productions, expected.productions)
+        self.assertEqual(loaded.non_terminals, expected.non_terminals)
+        self.assertEqual(loaded.start_symbol, expected.start_symbol)
+        self.assertEqual(grammar.productions['S'], ['AB', 'aSb', 'ε'])
+
+    def test_rule_order_is_part_of_the_key(self):
+        cache = ArtifactCache(self.directory.name)
+        for productions in ({'S': ['aAb', 'AS'], 'A': ['a', 'b']}, {'S': ['AS', 'aAb'], 'A': ['a', 'b']}):
+            grammar = Grammar(['S', 'A'], ['a', 'b'], productions, 'S')
+            expected = Grammar(['S', 'A'], ['a', 'b'], productions, 'S')
+            expected.convert_to_cnf()
+            self.assertEqual(cache.cnf(grammar).productions, expected.productions)
+        self.assertEqual(cache.misses, 2)
+
+    def test_scanner_round_trip(self):
+        source = 'int main() {\n    // note\n    x = 1.5e3 >= y; /* k */ return x;\n}\n'
+        expected = Scanner.generate(SCANNER_RULES, skip=['WHITESPACE']).tokenize(source)
+        ArtifactCache(self.directory.name).scanner(SCANNER_RULES, skip=['WHITESPACE'])
+        self.assertEqual(self.reopen().scanner(SCANNER_RULES, skip=['WHITESPACE']).tokenize(source), expected)
+
+    def test_corrupt_file_is_rebuilt(self):
+        nfa = random_nfa(6, seed=1)
+        cache = ArtifactCache(self.directory.name)
+        cache.dfa_table(nfa)
+        (_, _, path), = cache.entries()
+        with open(path, 'r+b') as file:
+            file.truncate(HEADER.size - 1)
+        cache = self.reopen()
+        self.assertEqual(cache.dfa_table(nfa).match('ab'), nfa.simulate().match('ab'))
+        self.assertEqual(cache.misses, 1)
+
+    def test_eviction_keeps_the_newest(self):
+        cache = ArtifactCache(self.directory.name, max_bytes=1)
+        for seed in range(3):
+            cache.dfa_table(random_nfa(6, seed=seed))
+        self.assertEqual(len(cache.entries()), 1)
+        self.assertEqual(cache.evictions, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from .benchmarks import CASES, compare, cpp_source, random_cfg, random_regex, run
+from .lexer.cpp_lexer import tokenize
+from .lexer.test_cpp_lexer import _reference_tokenize
+from .parser.cpp_parser import lexer, parse
+from .regular_expressions.regex import count_sequences, parse_regex
+
+
+class TestBenchmarks(unittest.TestCase):
+    def run_cases(self, cases):
+        saved = dict(CASES)
+        CASES.clear()
+        CASES.update(cases)
+        try:
+            return run(quick=True, repeat=1, report=None)
+        finally:
+            CASES.clear()
+            CASES.update(saved)
+
+    def test_workloads_are_valid_inputs(self):
+        code = cpp_source(2, seed=3)
+        self.assertGreaterEqual(len(code), 2048)
+        self.assertEqual(tokenize(code), _reference_tokenize(code))
+        parse(lexer(code))
+        grammar = random_cfg(200, seed=3)
+        grammar.convert_to_cnf()
+        pattern = random_regex(8, seed=3)
+        self.assertEqual(len(parse_regex(pattern)), 8)
+        self.assertGreater(count_sequences(pattern, limit=2), 0)
+
+    def test_only_optional_dependencies_are_skipped(self):
+        def missing(name):
+            def setup(size):
+                raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+            return setup
+
+        results = self.run_cases({'numpy case': (missing('numpy.linalg'), 'items', (1,)),
+                                  'measured': (lambda size: lambda: [0] * size, 'items', (5, 10))})
+        self.assertIn('error', results['cases']['numpy case'][0])
+        self.assertEqual([point['items'] for point in results['cases']['measured']], [5])
+        with self.assertRaises(ModuleNotFoundError):
+            self.run_cases({'broken': (missing('lfa.missing'), 'items', (1,))})
+
+    def test_compare_flags_slower_and_larger_points(self):
+        def results(*points):
+            return {'cases': {'case': [dict(zip(('size', 'seconds', 'peak_bytes'), point)) for point in points]}}
+
+        baseline = results((1, 1.0, 1 << 20), (2, 0.001, 1 << 10), (3, 1.0, 1 << 20))
+        current = results((1, 1.5, 1 << 21), (2, 0.002, 1 << 11), (3, 1.1, 1 << 20), (4, 9.0, 1 << 30))
+        regressions = compare(current, baseline)
+        self.assertEqual([(regression['size'], regression['metric']) for regression in regressions],
+                         [(1, 'seconds'), (1, 'peak_bytes')])
+        self.assertEqual(regressions[0]['ratio'], 1.5)
+        self.assertEqual(compare(current, baseline, tolerance=0.9), regressions[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
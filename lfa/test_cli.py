@@ -0,0 +1,119 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from . import cli
+from .chomsky_normal_form.test_cfg_to_cnf import _reference_derives, _words
+from .finite_automata.test_subset_construction import _random_epsilon_nfa, _reference_accepts
+from .lexer.cpp_lexer import cpp_code, tokenize
+from .lexer.test_cpp_lexer import _reference_tokenize
+from .regular_expressions.test_regex import _python_pattern, _reference_sequences
+
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content if isinstance(content, str) else json.dumps(content))
+        return path
+
+    def run_main(self, *argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(cli.main(list(argv)), 0)
+        return output.getvalue()
+
+    def matches(self, output):
+        return {word: accepted == 'True' for word, accepted in (line.split('\t') for line in output.splitlines())}
+
+    def test_lex(self):
+        path = self.write('main.cpp', cpp_code)
+        expected = _reference_tokenize(cpp_code)
+        self.assertEqual(self.run_main('lex', path).splitlines(), [f'{token_type}\t{value}' for token_type, value in expected])
+        self.assertEqual(self.run_main('lex', '--count', path), f'{len(expected)}\n')
+        # The generated scanner, built directly or loaded from the cache.
+        lines = [f'{token_type}\t{value}' for token_type, value in tokenize(cpp_code, 'dfa')]
+        self.assertEqual(self.run_main('lex', '--dfa', path).splitlines(), lines)
+        self.assertEqual(self.run_main('lex', '--cache', self.directory, path).splitlines(), lines)
+
+    def test_dfa_matches_set_simulation(self):
+        import random
+        nfa = _random_epsilon_nfa(8, random.Random(61))
+        path = self.write('nfa.json', cli.automaton_to_json(nfa))
+        words = ['', 'a', 'b', 'ab', 'ba', 'aab', 'abba', 'bbbb', 'c']
+        expected = {word: _reference_accepts(nfa, word) for word in words}
+        for options in ([], ['--minimize'], ['--compact', '--minimize'], ['--cache', self.directory]):
+            with self.subTest(options=options):
+                self.assertEqual(self.matches(self.run_main('dfa', path, *options, '-m', *words)), expected)
+        data = json.loads(self.run_main('dfa', path, '--minimize'))
+        minimal = cli.automaton_from_json(data)
+        self.assertTrue(minimal.is_deterministic())
+        self.assertEqual({word: minimal.string_belong_to_language(word) for word in words}, expected)
+
+    def test_dfa_from_grammar(self):
+        grammar = {'non_terminals': ['S', 'A'], 'terminals': ['a', 'b'], 'productions': {'S': ['aA', 'b'], 'A': ['bS']},
+                   'start': 'S'}
+        path = self.write('grammar.json', grammar)
+        words_path = self.write('words.txt', 'b\nabb\nab\nababb\n')
+        self.assertEqual(self.matches(self.run_main('dfa', path, '-w', words_path)),
+                         {'b': True, 'abb': True, 'ab': False, 'ababb': True})
+
+    def test_cnf_matches_reference(self):
+        grammar = {'non_terminals': ['S', 'A', 'B'], 'terminals': ['a', 'b'],
+                   'productions': {'S': ['AB', 'aSb', 'ε'], 'A': ['a', 'ε'], 'B': ['bB', 'b']}, 'start': 'S'}
+        path = self.write('grammar.json', grammar)
+        words = _words('ab', 4)[1:]
+        expected = {word: _reference_derives(grammar['productions'], {'S', 'A', 'B'}, 'S', word) for word in words}
+        for options in ([], ['--cache', self.directory]):
+            self.assertEqual(self.matches(self.run_main('cnf', path, *options, '-m', *words)), expected)
+        converted = json.loads(self.run_main('cnf', path))
+        self.assertTrue(all(len(production) in (1, 2) or production == 'ε'
+                            for values in converted['productions'].values() for production in values))
+
+    def test_regex(self):
+        pattern = '(a|b)>2<c*'
+        expected = _reference_sequences(pattern, limit=2)
+        self.assertEqual(self.run_main('regex', pattern, '-l', '2', '-n', '100').splitlines(), expected[:100])
+        self.assertEqual(self.run_main('regex', pattern, '-l', '2', '--count'), f'{len(expected)}\n')
+        self.assertEqual(self.run_main('regex', pattern, '-l', '2', '--length', '3').splitlines(),
+                         [sequence for sequence in expected if len(sequence) == 3])
+        samples = self.run_main('regex', pattern, '--sample', '3', '--seed', '1', '-l', '2').splitlines()
+        self.assertEqual(len(samples), 3)
+        self.assertLessEqual(set(samples), set(expected))
+        words = ['aa', 'bbc', 'ab', 'aacccccccc', '']
+        python = _python_pattern(pattern)
+        self.assertEqual(self.matches(self.run_main('regex', pattern, '-m', *words)),
+                         {word: python.fullmatch(word) is not None for word in words})
+
+    def test_errors_are_reported(self):
+        path = self.write('broken.json', '{')
+        with self.assertRaises(SystemExit):
+            cli.main(['dfa', path])
+        error = io.StringIO()
+        with contextlib.redirect_stderr(error):
+            self.assertEqual(cli.main(['dfa', self.write('missing.json', {'states': []})]), 1)
+        self.assertIn('KeyError', error.getvalue())
+
+    def test_optional_dependencies_stay_unloaded(self):
+        path = self.write('nfa.json', {'states': ['p'], 'alphabet': ['a'], 'transitions': {'p': {'a': ['p']}},
+                                       'start': 'p', 'accept': ['p']})
+        script = ('import sys\nfrom lfa.cli import main\n'
+                  f'main(["dfa", {path!r}, "-m", "aa"])\n'
+                  'print(sorted(name for name in ("graphviz", "numpy", "prettytable") if name in sys.modules))')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.splitlines(), ['aa\tTrue', '[]'])
+
+
+if __name__ == '__main__':
+    unittest.main()
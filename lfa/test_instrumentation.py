@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+
+from .finite_automata.automaton import FiniteAutomaton
+from .instrumentation import Recorder, _recorders, enabled, start
+from .parser.cpp_parser import lex_compact
+
+
+class TestRecorder(unittest.TestCase):
+    def test_report_matches_callbacks(self):
+        automaton = FiniteAutomaton(['p', 'q'], ['a', 'b'], {'p': {'a': ['q']}, 'q': {'b': ['p']}}, 'p', ['p'])
+        events = []
+        words = ['', 'ab', 'abab', 'aa']
+        with Recorder(lambda *event: events.append(event)) as recorder:
+            self.assertTrue(enabled())
+            for word in words:
+                automaton.string_belong_to_language(word)
+            lex_compact('int x = 1;')
+            lex_compact('x++;')
+        self.assertFalse(enabled())
+        automaton.string_belong_to_language('ab')
+
+        expected = {}
+        for stage, seconds, counters in events:
+            entry = expected.setdefault(stage, {'calls': 0, 'seconds': 0.0, 'counters': {}})
+            entry['calls'] += 1
+            entry['seconds'] += seconds
+            for name, value in counters.items():
+                entry['counters'][name] = entry['counters'].get(name, 0) + value
+        report = recorder.report()
+        self.assertEqual(set(report), set(expected))
+        for stage, entry in expected.items():
+            self.assertEqual(report[stage]['calls'], entry['calls'])
+            self.assertAlmostEqual(report[stage]['seconds'], entry['seconds'])
+            self.assertEqual(report[stage]['counters'], entry['counters'])
+        stage = report['FiniteAutomaton.string_belong_to_language']
+        self.assertEqual(stage['calls'], len(words))
+        self.assertEqual(stage['counters'], {'words': len(words), 'chars': sum(map(len, words))})
+        self.assertEqual(report['cpp_parser.lex_compact']['counters']['chars'], len('int x = 1;') + len('x++;'))
+
+    def test_peak_counters_keep_maximum(self):
+        recorder = Recorder()
+        for seconds, depth, nodes in ((0.5, 3, 10), (0.25, 7, 5), (0.25, 2, 1)):
+            recorder.add('parse', seconds, {'peak_depth': depth, 'nodes': nodes})
+        entry = recorder.report()['parse']
+        self.assertEqual(entry['counters'], {'peak_depth': 7, 'nodes': 16})
+        self.assertEqual(entry['max_seconds'], 0.5)
+        self.assertEqual(entry['rates'], {'nodes_per_second': 16.0})
+
+    def test_to_json_and_format(self):
+        recorder = Recorder()
+        recorder.add('stage', 0.5, {'items': 1000})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.json')
+            text = recorder.to_json(path)
+            with open(path, encoding='utf-8') as file:
+                self.assertEqual(json.loads(file.read()), json.loads(text))
+        self.assertEqual(json.loads(text)['stage']['rates'], {'items_per_second': 2000.0})
+        self.assertIn('items=1,000', recorder.format())
+        recorder.reset()
+        self.assertEqual(recorder.format(), '')
+
+    def test_nothing_listening(self):
+        self.assertIsNone(start())
+        recorder = Recorder().start()
+        recorder.start()
+        try:
+            self.assertEqual(_recorders.count(recorder), 1)
+            self.assertIsNotNone(start())
+        finally:
+            recorder.stop()
+        self.assertIsNone(start())
+
+
+if __name__ == '__main__':
+    unittest.main()